@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the ijson backends parsing recipes.json.
+
+Times the cold streaming paths of a non-resident repository with every backend
+available in this environment: decoding the whole recipes, decoding only the
+keys of a projected query, and a full tag query. Each measurement reports the
+best of several runs.
+
+Install the yajl library (e.g. libyajl2) to make the yajl2_cffi and yajl2
+backends available; yajl2_c ships compiled in the ijson wheels.
+
+Usage:
+    uv run python -m benchmarks.bench_json_backends [path/to/recipes.json] [runs]
+"""
+
+import os
+import sys
+import time
+from lib.recipe_json_backend import available_json_backends, set_json_backend
+from lib.recipe_repository import RecipeRepository
+
+
+def best_time(func, runs: int) -> float:
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    path = sys.argv[1] if len(sys.argv) > 1 else "resource/db/recipes.json"
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    repo = RecipeRepository(path)
+    cases = [
+        ("all keys", lambda: sum(1 for _ in repo._stream_recipes())),
+        ("id, name", lambda: sum(1 for _ in repo._stream_recipes(frozenset(("id", "name"))))),
+        ("tag query", lambda: repo.get_recipes_by_tag("spring", fields=["id", "name"])),
+    ]
+
+    backends = available_json_backends()
+    print(f"recipes.json: {os.path.getsize(path)} bytes, available backends: {', '.join(backends)}")
+    print(f"{'backend':<12}" + "".join(f" {name + ' ms':>14}" for name, _ in cases))
+    for backend in backends:
+        set_json_backend(backend)
+        times = [best_time(func, runs) for _, func in cases]
+        print(f"{backend:<12}" + "".join(f" {seconds * 1000:>14.1f}" for seconds in times))
+
+    set_json_backend()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: bytes per recipe held by a resident repository, with recipes
+kept as the plain dicts produced by ijson versus the compact records of a snapshot.
+
+Memory is measured with tracemalloc as the allocations still alive once the
+records are loaded; indexes are not built.
+
+Usage:
+    uv run python -m benchmarks.bench_memory [path/to/recipes.json]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from lib.recipe_snapshot import RecipeSnapshot, dataset_fingerprint, iter_recipes
+from lib.recipe_snapshot_file import decode_snapshot, encode_snapshot
+
+
+def measure(load) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        records = load()
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return size, len(records)
+
+
+def main() -> int:
+    path = sys.argv[1] if len(sys.argv) > 1 else "resource/db/recipes.json"
+    fingerprint = dataset_fingerprint(path)
+
+    def load_dicts():
+        with open(path, 'rb') as f:
+            return list(iter_recipes(f))
+
+    def load_compact():
+        with open(path, 'rb') as f:
+            return RecipeSnapshot(iter_recipes(f), fingerprint).records
+
+    with open(path, 'rb') as f:
+        snapshot = RecipeSnapshot(iter_recipes(f), fingerprint, "0" * 64)
+    data = encode_snapshot(snapshot, fingerprint[0][1])
+
+    def load_snapshot_file():
+        return decode_snapshot(data, fingerprint).records
+
+    results = [
+        ("dict records", measure(load_dicts)),
+        ("compact records", measure(load_compact)),
+        ("compact records (.snap)", measure(load_snapshot_file)),
+    ]
+
+    baseline = results[0][1][0]
+    print(f"{'layout':<26}{'recipes':>9}{'total KiB':>12}{'bytes/recipe':>14}{'ratio':>8}")
+    for label, (size, count) in results:
+        per_recipe = size / count if count else 0
+        print(f"{label:<26}{count:>9}{size / 1024:>12.0f}{per_recipe:>14.0f}{size / baseline:>8.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark of recipe name search: trigram index vs. full scan.
+
+Builds a synthetic dataset of CamelCase recipe names and times substring
+queries against the TrigramIndex and against the linear scan used by the
+streaming path.
+
+Usage:
+    uv run python -m benchmarks.bench_name_search [number_of_recipes]
+"""
+
+import random
+import sys
+import time
+from lib.recipe_indexes import TrigramIndex
+
+WORDS = [
+    "Add", "Remove", "Migrate", "Upgrade", "Replace", "Prefer", "Use", "Change", "Find", "Simplify",
+    "Java", "Spring", "Boot", "Junit", "Jupiter", "Mockito", "Guava", "Jackson", "Hibernate", "Quarkus",
+    "Objects", "Equals", "Primitive", "List", "Map", "Optional", "Stream", "Collection", "Annotation",
+    "Dependency", "Plugin", "Property", "Version", "Method", "Field", "Type", "Import", "Logger", "Test"
+]
+
+QUERIES = ["PreferJavaUtilObjectsEquals", "objectsequals", "mockito", "springboot", "ab", "x", "zzzqqq"]
+
+
+def synthetic_names(count: int, seed: int = 42) -> list:
+    """Generate CamelCase names of 3 to 6 words, made unique with a numeric suffix."""
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(WORDS) for _ in range(rng.randint(3, 6))) + str(i)
+        for i in range(count)
+    ]
+
+
+def time_per_query(func, query: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(query)
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> int:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    names = [name.lower() for name in synthetic_names(count)]
+
+    start = time.perf_counter()
+    index = TrigramIndex(names)
+    print(f"{count} names, index built in {time.perf_counter() - start:.2f}s "
+          f"({len(index.postings)} trigrams)")
+
+    def scan(query):
+        return [position for position, name in enumerate(names) if query in name]
+
+    print(f"{'query':<30} {'matches':>8} {'index ms':>10} {'scan ms':>10}")
+    for query in QUERIES:
+        query = query.lower()
+        matches = index.search(query)
+        assert matches == scan(query)
+        index_time = time_per_query(index.search, query, 20)
+        scan_time = time_per_query(scan, query, 3)
+        print(f"{query:<30} {len(matches):>8} {index_time * 1000:>10.3f} {scan_time * 1000:>10.3f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
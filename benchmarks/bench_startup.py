@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: time to the first answer of a resident repository, loading
+the dataset from recipes.json versus from the recipes.json.snap binary snapshot.
+
+Each measurement runs in a fresh interpreter, like a `uvx openrewrite-db-mcp`
+cold start, and reports the best of several runs.
+
+Usage:
+    uv run python -m benchmarks.bench_startup [path/to/recipes.json] [runs]
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+FIRST_ANSWER = """
+import time
+start = time.perf_counter()
+from lib.recipe_repository import RecipeRepository
+imported = time.perf_counter()
+repo = RecipeRepository({path!r}, resident=True)
+repo._load_snapshot = {loader}
+repo.get_categories_with_subcategories()
+answered = time.perf_counter()
+repo.get_recipes_by_name('equals')
+repo.get_recipe_by_id('missing')
+indexed = time.perf_counter()
+print(imported - start, answered - imported, indexed - imported)
+"""
+
+# Parse recipes.json without writing a snapshot file, to time the JSON path alone
+JSON_LOADER = ("lambda fingerprint: __import__('lib.recipe_snapshot', fromlist=['RecipeSnapshot'])"
+               ".RecipeSnapshot(repo._stream_recipes(), fingerprint)")
+SNAPSHOT_LOADER = "repo._load_snapshot"
+
+
+def run(path: str, loader: str, runs: int) -> list:
+    code = FIRST_ANSWER.format(path=path, loader=loader)
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=os.getcwd()).stdout
+        samples.append([float(value) for value in output.split()])
+    return [min(column) for column in zip(*samples)]
+
+
+def main() -> int:
+    source = sys.argv[1] if len(sys.argv) > 1 else "resource/db/recipes.json"
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "recipes.json")
+        shutil.copy(source, path)
+        shutil.copy(source + ".sha256", path + ".sha256")
+
+        from lib.recipe_snapshot_file import generate_snapshot_file, snapshot_file_path
+        if not generate_snapshot_file(path):
+            print("Could not generate the snapshot: recipes.json does not match its .sha256 file")
+            return 1
+        print(f"recipes.json: {os.path.getsize(path)} bytes, "
+              f"recipes.json.snap: {os.path.getsize(snapshot_file_path(path))} bytes")
+
+        print(f"{'path':<10} {'import ms':>10} {'first answer ms':>16} {'all indexes ms':>15}")
+        for name, loader in (("json", JSON_LOADER), ("snapshot", SNAPSHOT_LOADER)):
+            imported, answered, indexed = run(path, loader, runs)
+            print(f"{name:<10} {imported * 1000:>10.1f} {answered * 1000:>16.1f} {indexed * 1000:>15.1f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,7 +7,8 @@ from HTML documentation and generate structured JSON databases.
 
 from .recipe_extractor import RecipeExtractor
 from .recipe_repository import RecipeRepository
+from .sqlite_recipe_repository import SqliteRecipeRepository
 from .mcp_service import RecipeMcpService
 
 __version__ = "1.0.0"
-__all__ = ["RecipeExtractor", "RecipeRepository", "RecipeMcpService"]
+__all__ = ["RecipeExtractor", "RecipeRepository", "SqliteRecipeRepository", "RecipeMcpService"]
@@ -1,5 +1,7 @@
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Union
 from lib.recipe_repository import RecipeRepository
+from lib.recipe_pages import RecipePage, is_paginated
+from lib.recipe_query_cache import QueryCache, query_key
 
 # Fixed URLs for recipes database update
 JSON_URL = "https://raw.githubusercontent.com/bozoh/openrewrite-db-mcp/refs/heads/master/resource/db/recipes.json"
@@ -13,21 +15,91 @@ class RecipeMcpService:
     Handles input validation and error handling for MCP tool calls.
     """
 
-    def __init__(self, recipe_repository: RecipeRepository):
+    def __init__(self, recipe_repository: RecipeRepository, cache: Optional[QueryCache] = None):
         """
         Initialize the service with a RecipeRepository instance.
 
         Args:
             recipe_repository: The repository to delegate operations to
+            cache: Cache of query results, keyed by the dataset version so a database
+                update invalidates it; queries always hit the repository when None
         """
         self._repository = recipe_repository
+        self._cache = cache
 
-    def get_recipe_by_id(self, recipe_id: str) -> Dict[str, Any]:
+    def _query(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """
+        Call a query method of the repository, through the result cache when enabled.
+
+        Results are keyed by the same dataset version as the cursors, so a cached
+        page never hands out a cursor the repository would reject.
+        """
+        query = getattr(self._repository, method)
+        if self._cache is None:
+            return query(*args, **kwargs)
+
+        key = query_key(method, args, kwargs, self._repository.dataset_version())
+        return self._cache.get_or_compute(key, lambda: query(*args, **kwargs))
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Get the counters of the query result cache.
+
+        Returns:
+            Dict with hits, misses, evictions, expirations, hit_rate, entries, bytes
+            and the cache limits, or {} when caching is disabled
+        """
+        return self._cache.stats() if self._cache is not None else {}
+
+    @staticmethod
+    def _query_args(limit: Optional[int] = None, offset: int = 0, cursor: Optional[str] = None,
+                    fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Get the pagination and projection keyword arguments to pass to the repository.
+
+        Fields may also be given as a comma-separated string; an empty selection
+        returns every field.
+
+        Returns:
+            Dict holding only the arguments that were given, so an unpaginated call
+            gets a plain list from the repository
+        """
+        args: Dict[str, Any] = {}
+        if is_paginated(limit, offset, cursor):
+            args.update(limit=limit, offset=offset, cursor=cursor.strip() if isinstance(cursor, str) else cursor)
+        if isinstance(fields, str):
+            fields = fields.split(',')
+        if isinstance(fields, (list, tuple)):
+            fields = [field.strip() if isinstance(field, str) else field for field in fields]
+            fields = [field for field in fields if field != ""]
+        if fields:
+            args['fields'] = fields
+        return args
+
+    @staticmethod
+    def _no_results(limit: Optional[int], offset: int, cursor: Optional[str],
+                    error: Optional[str] = None) -> Union[List[Dict[str, Any]], RecipePage]:
+        """
+        Get the empty result of a recipe query.
+
+        Returns:
+            Empty list, or an empty page (with the error message, if any) when the call is paginated
+        """
+        if not is_paginated(limit, offset, cursor):
+            return []
+
+        page = {'recipes': [], 'total': 0, 'next_cursor': None}
+        if error:
+            page['error'] = error
+        return page
+
+    def get_recipe_by_id(self, recipe_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Get a single recipe by its ID.
 
         Args:
             recipe_id: The recipe ID to search for
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
 
         Returns:
             Recipe dictionary if found, empty dict if not found or invalid input
@@ -36,83 +108,276 @@ class RecipeMcpService:
             return {}
 
         try:
-            return self._repository.get_recipe_by_id(recipe_id.strip())
+            return self._query('get_recipe_by_id', recipe_id.strip(), **self._query_args(fields=fields))
         except Exception:
             return {}
 
-    def get_recipes_by_name(self, name_query: str) -> List[Dict[str, Any]]:
+    def get_recipes_by_ids(self, recipe_ids: List[str], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Get several recipes by their IDs at once.
+
+        Args:
+            recipe_ids: Recipe IDs to look up, as a list or a comma-separated string
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
+
+        Returns:
+            Dict with 'recipes', the recipes found in the order of their IDs, and
+            'missing', the IDs matching no recipe; both empty for invalid input, with
+            an 'error' key when the arguments were rejected
+        """
+        if isinstance(recipe_ids, str):
+            recipe_ids = recipe_ids.split(',')
+        if not isinstance(recipe_ids, (list, tuple)):
+            return {'recipes': [], 'missing': []}
+
+        recipe_ids = [recipe_id.strip() for recipe_id in recipe_ids if isinstance(recipe_id, str) and recipe_id.strip()]
+        if not recipe_ids:
+            return {'recipes': [], 'missing': []}
+
+        try:
+            return self._query('get_recipes_by_ids', recipe_ids, **self._query_args(fields=fields))
+        except ValueError as e:
+            return {'recipes': [], 'missing': [], 'error': str(e)}
+        except Exception:
+            return {'recipes': [], 'missing': []}
+
+    def get_recipes_by_name(self, name_query: str, limit: Optional[int] = None, offset: int = 0,
+                            cursor: Optional[str] = None, fields: Optional[List[str]] = None,
+                            max_distance: Optional[int] = None) -> Union[List[Dict[str, Any]], RecipePage]:
         """
         Get recipes by partial name match (case-insensitive).
 
         Args:
-            name_query: The partial name to search for
+            name_query: The partial name to search for, or the whole name with max_distance
+            limit: Maximum number of recipes to return
+            offset: Number of matching recipes to skip
+            cursor: next_cursor of the previous page, instead of offset
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
+            max_distance: Maximum edit distance between the query and a name for a
+                typo-tolerant lookup, closest names first; None for substring matching
 
         Returns:
-            List of recipe dictionaries with names containing the query
+            List of recipe dictionaries with names containing the query (or close to it),
+            or a page dict with 'recipes', 'total' and 'next_cursor' keys when limit,
+            offset or cursor is given
         """
         if not name_query or not isinstance(name_query, str) or name_query.strip() == "":
-            return []
+            return self._no_results(limit, offset, cursor)
+
+        args = self._query_args(limit, offset, cursor, fields)
+        if max_distance is not None:
+            args['max_distance'] = max_distance
 
         try:
-            return self._repository.get_recipes_by_name(name_query.strip())
+            return self._query('get_recipes_by_name', name_query.strip(), **args)
+        except ValueError as e:
+            return self._no_results(limit, offset, cursor, str(e))
         except Exception:
-            return []
+            return self._no_results(limit, offset, cursor)
 
-    def get_recipes_by_tag(self, tag: str) -> List[Dict[str, Any]]:
+    def get_recipes_by_tag(self, tag: str, limit: Optional[int] = None, offset: int = 0,
+                           cursor: Optional[str] = None,
+                           fields: Optional[List[str]] = None) -> Union[List[Dict[str, Any]], RecipePage]:
         """
         Get recipes that contain a specific tag.
 
         Args:
             tag: The tag to search for
+            limit: Maximum number of recipes to return
+            offset: Number of matching recipes to skip
+            cursor: next_cursor of the previous page, instead of offset
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
 
         Returns:
-            List of recipe dictionaries containing the tag
+            List of recipe dictionaries containing the tag, or a page dict with
+            'recipes', 'total' and 'next_cursor' keys when limit, offset or cursor is given
         """
         if not tag or not isinstance(tag, str) or tag.strip() == "":
-            return []
+            return self._no_results(limit, offset, cursor)
 
         try:
-            return self._repository.get_recipes_by_tag(tag.strip())
+            return self._query('get_recipes_by_tag', tag.strip(), **self._query_args(limit, offset, cursor, fields))
+        except ValueError as e:
+            return self._no_results(limit, offset, cursor, str(e))
+        except Exception:
+            return self._no_results(limit, offset, cursor)
+
+    def get_all_tags(self) -> List[Dict[str, Any]]:
+        """
+        Get all unique tags with the number of recipes carrying each one.
+
+        Returns:
+            List of dicts with 'tag' and 'count' keys, sorted alphabetically by tag
+        """
+        try:
+            return self._query('get_all_tags')
         except Exception:
             return []
 
-    def get_recipes_by_category(self, category: str, subcategory: Optional[str] = None) -> List[Dict[str, Any]]:
+    def get_recipes_by_category(self, category: str, subcategory: Optional[str] = None,
+                                limit: Optional[int] = None, offset: int = 0,
+                                cursor: Optional[str] = None,
+                                fields: Optional[List[str]] = None) -> Union[List[Dict[str, Any]], RecipePage]:
         """
         Get recipes by category and optional subcategory.
 
         Args:
             category: The category name to filter by
             subcategory: Optional subcategory name to further filter
+            limit: Maximum number of recipes to return
+            offset: Number of matching recipes to skip
+            cursor: next_cursor of the previous page, instead of offset
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
 
         Returns:
-            List of recipe dictionaries matching the criteria
+            List of recipe dictionaries matching the criteria, or a page dict with
+            'recipes', 'total' and 'next_cursor' keys when limit, offset or cursor is given
         """
         if not category or not isinstance(category, str) or category.strip() == "":
-            return []
+            return self._no_results(limit, offset, cursor)
 
         try:
-            return self._repository.get_recipes_by_category(category.strip(), subcategory.strip() if subcategory and isinstance(subcategory, str) and subcategory.strip() else None)
+            return self._query('get_recipes_by_category', category.strip(), subcategory.strip() if subcategory and isinstance(subcategory, str) and subcategory.strip() else None, **self._query_args(limit, offset, cursor, fields))
+        except ValueError as e:
+            return self._no_results(limit, offset, cursor, str(e))
         except Exception:
-            return []
+            return self._no_results(limit, offset, cursor)
 
-    def get_recipes_by_dependency(self, dependency: str) -> List[Dict[str, Any]]:
+    def get_recipes_by_dependency(self, dependency: str, limit: Optional[int] = None, offset: int = 0,
+                                  cursor: Optional[str] = None,
+                                  fields: Optional[List[str]] = None) -> Union[List[Dict[str, Any]], RecipePage]:
         """
         Get recipes by dependency (partial match, case-insensitive).
 
         Args:
             dependency: The dependency string to search for
+            limit: Maximum number of recipes to return
+            offset: Number of matching recipes to skip
+            cursor: next_cursor of the previous page, instead of offset
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
 
         Returns:
-            List of recipe dictionaries with matching dependencies
+            List of recipe dictionaries with matching dependencies, or a page dict with
+            'recipes', 'total' and 'next_cursor' keys when limit, offset or cursor is given
         """
         if not dependency or not isinstance(dependency, str) or dependency.strip() == "":
+            return self._no_results(limit, offset, cursor)
+
+        try:
+            return self._query('get_recipes_by_dependency', dependency.strip(), **self._query_args(limit, offset, cursor, fields))
+        except ValueError as e:
+            return self._no_results(limit, offset, cursor, str(e))
+        except Exception:
+            return self._no_results(limit, offset, cursor)
+
+    def find_recipes(self, category: Optional[str] = None, subcategory: Optional[str] = None,
+                     tag: Optional[str] = None, dependency: Optional[str] = None, name: Optional[str] = None,
+                     exclude_category: Optional[str] = None, exclude_subcategory: Optional[str] = None,
+                     exclude_tag: Optional[str] = None, exclude_dependency: Optional[str] = None,
+                     exclude_name: Optional[str] = None, limit: Optional[int] = None, offset: int = 0,
+                     cursor: Optional[str] = None,
+                     fields: Optional[List[str]] = None) -> Union[List[Dict[str, Any]], RecipePage]:
+        """
+        Get the recipes matching every given filter.
+
+        Args:
+            category: Category the recipes belong to
+            subcategory: Sub-category the recipes belong to, in any category
+            tag: Tag the recipes carry
+            dependency: Substring of the recipe dependency
+            name: Substring of the recipe name
+            exclude_category: Category the recipes must not belong to
+            exclude_subcategory: Sub-category the recipes must not belong to
+            exclude_tag: Tag the recipes must not carry
+            exclude_dependency: Substring the recipe dependency must not contain
+            exclude_name: Substring the recipe name must not contain
+            limit: Maximum number of recipes to return
+            offset: Number of matching recipes to skip
+            cursor: next_cursor of the previous page, instead of offset
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
+
+        Returns:
+            List of recipe dictionaries matching the filters, or a page dict with
+            'recipes', 'total' and 'next_cursor' keys when limit, offset or cursor is given
+        """
+        filters = {
+            'category': category, 'subcategory': subcategory, 'tag': tag, 'dependency': dependency, 'name': name,
+            'exclude_category': exclude_category, 'exclude_subcategory': exclude_subcategory,
+            'exclude_tag': exclude_tag, 'exclude_dependency': exclude_dependency, 'exclude_name': exclude_name
+        }
+        # Blank filters are left out like missing ones
+        filters = {key: value.strip() if isinstance(value, str) else value for key, value in filters.items()}
+        filters = {key: value for key, value in filters.items() if value is not None and value != ""}
+
+        try:
+            return self._query('find_recipes', **filters, **self._query_args(limit, offset, cursor, fields))
+        except ValueError as e:
+            return self._no_results(limit, offset, cursor, str(e))
+        except Exception:
+            return self._no_results(limit, offset, cursor)
+
+    def search_recipes(self, query: str, limit: int = 10, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Search recipes by free text over their name, description and package.
+
+        Args:
+            query: Free text to search for
+            limit: Maximum number of recipes to return
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
+
+        Returns:
+            List of recipe dictionaries, most relevant first
+        """
+        if not query or not isinstance(query, str) or query.strip() == "":
             return []
 
         try:
-            return self._repository.get_recipes_by_dependency(dependency.strip())
+            return self._query('search_recipes', query.strip(), limit, **self._query_args(fields=fields))
         except Exception:
             return []
 
+    def complete(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Complete a prefix with the recipe names and packages starting with it.
+
+        Args:
+            prefix: Start of a recipe name or fully qualified package
+            limit: Maximum number of completions to return
+
+        Returns:
+            List of completions in alphabetical order, each with 'value', 'field' and 'recipes' keys
+        """
+        if not prefix or not isinstance(prefix, str) or prefix.strip() == "":
+            return []
+
+        try:
+            # Trailing spaces are kept, they are part of what is being typed
+            return self._query('complete', prefix.lstrip(), limit)
+        except Exception:
+            return []
+
+    def run_queries(self, queries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Run a batch of queries at once.
+
+        Args:
+            queries: Query dicts, each naming a method with 'method' and giving its
+                arguments, e.g. {'method': 'get_recipes_by_tag', 'tag': 'spring'}
+
+        Returns:
+            Dict with 'results', the result of each query in query order; empty for
+            invalid input, with an 'error' key when the queries were rejected
+        """
+        if not isinstance(queries, (list, tuple)) or not queries:
+            return {'results': []}
+
+        try:
+            return {'results': self._query('run_queries', list(queries))}
+        except ValueError as e:
+            return {'results': [], 'error': str(e)}
+        except Exception:
+            return {'results': []}
+
     def get_all_categories(self) -> List[str]:
         """
         Get all unique categories from the recipes.
@@ -121,7 +386,7 @@ class RecipeMcpService:
             List of unique category names, sorted alphabetically
         """
         try:
-            return self._repository.get_all_categories()
+            return self._query('get_all_categories')
         except Exception:
             return []
 
@@ -139,7 +404,7 @@ class RecipeMcpService:
             return []
 
         try:
-            return self._repository.get_subcategories_by_category(category.strip())
+            return self._query('get_subcategories_by_category', category.strip())
         except Exception:
             return []
 
@@ -151,7 +416,19 @@ class RecipeMcpService:
             List of dicts with 'category' and 'sub-categories' keys
         """
         try:
-            return self._repository.get_categories_with_subcategories()
+            return self._query('get_categories_with_subcategories')
+        except Exception:
+            return []
+
+    def get_category_tree(self) -> List[Dict[str, Any]]:
+        """
+        Get all categories and subcategories with the number of recipes in each one.
+
+        Returns:
+            List of dicts with 'category', 'count' and 'sub-categories' keys
+        """
+        try:
+            return self._query('get_category_tree')
         except Exception:
             return []
 
@@ -5,6 +5,7 @@ import re
 import hashlib
 from typing import List, Dict, Optional, Tuple
 from console_progressbar import ProgressBar
+from lib.recipe_snapshot_file import generate_snapshot_file
 
 
 class RecipeExtractor:
@@ -270,6 +271,9 @@ class RecipeExtractor:
         # Generate SHA-256 hash file
         self._write_sha256(self.output_file)
 
+        # Generate binary snapshot for fast loading
+        generate_snapshot_file(self.output_file)
+
     def _write_sha256(self, file_path: str) -> None:
         """Generate and write SHA-256 hash file for the given file."""
         sha256_hash = hashlib.sha256()
@@ -0,0 +1,201 @@
+from typing import List, Dict, Optional, Any, Mapping, NamedTuple, Sequence
+from lib.recipe_indexes import field_key, normalize_key
+
+
+# Filter of find_recipes -> recipe key it tests
+FILTER_FIELDS = {
+    'category': 'category',
+    'subcategory': 'sub-category',
+    'tag': 'tags',
+    'dependency': 'dependency',
+    'name': 'name',
+}
+
+# Filters matching a substring of the value instead of the whole value
+_SUBSTRING_FILTERS = frozenset(('dependency', 'name'))
+
+
+class RecipeFilter(NamedTuple):
+    """One condition of a compound recipe query."""
+
+    # Filter name, a key of FILTER_FIELDS
+    name: str
+    # Normalized value to look for
+    key: str
+    # Whether matching recipes are excluded instead of selected
+    exclude: bool
+
+    def matches(self, recipe: Mapping[str, Any]) -> bool:
+        """
+        Test a recipe against the filter.
+
+        Categories, sub-categories and tags match whole values, dependencies and
+        names match substrings, all case-insensitively like the single-filter
+        queries. A recipe lacking the field never matches, so exclusions keep it.
+
+        Args:
+            recipe: Recipe dictionary or compact record
+
+        Returns:
+            True if the recipe passes the filter
+        """
+        if self.name == 'tag':
+            tags = recipe.get('tags', [])
+            found = isinstance(tags, list) and any(
+                isinstance(tag, str) and normalize_key(tag) == self.key for tag in tags)
+        else:
+            value = field_key(recipe, FILTER_FIELDS[self.name])
+            if value is None:
+                found = False
+            elif self.name in _SUBSTRING_FILTERS:
+                found = self.key in value
+            else:
+                found = value == self.key
+        return found != self.exclude
+
+
+def recipe_filters(values: Mapping[str, Optional[str]]) -> List[RecipeFilter]:
+    """
+    Validate the filters of a compound query.
+
+    Args:
+        values: Value of each filter by name, exclusions prefixed with "exclude_";
+            None or empty values are left out
+
+    Returns:
+        The filters to apply, selections before exclusions
+
+    Raises:
+        ValueError: If a filter is unknown or its value is not a string
+    """
+    filters: Dict[bool, List[RecipeFilter]] = {False: [], True: []}
+    for argument, value in values.items():
+        exclude = argument.startswith('exclude_')
+        name = argument[len('exclude_'):] if exclude else argument
+        if name not in FILTER_FIELDS:
+            raise ValueError(f"Unknown filter: {argument}")
+        if value is None or value == "":
+            continue
+        if not isinstance(value, str):
+            raise ValueError(f"{argument} must be a string")
+        filters[exclude].append(RecipeFilter(name, normalize_key(value), exclude))
+
+    return filters[False] + filters[True]
+
+
+def filter_keys(filters: List[RecipeFilter]) -> List[str]:
+    """
+    Get the recipe keys read by filters.
+
+    Args:
+        filters: Filters built by recipe_filters
+
+    Returns:
+        Recipe keys the filters test
+    """
+    return [FILTER_FIELDS[recipe_filter.name] for recipe_filter in filters]
+
+
+# Single-filter queries run_queries accepts -> filter set by each of their arguments;
+# the first argument is required
+_FILTER_QUERIES = {
+    'get_recipes_by_tag': {'tag': 'tag'},
+    'get_recipes_by_category': {'category': 'category', 'subcategory': 'subcategory'},
+    'get_recipes_by_name': {'name_query': 'name'},
+    'get_recipes_by_dependency': {'dependency': 'dependency'},
+}
+
+# Arguments of the single-filter queries that are options rather than filters
+_QUERY_OPTIONS = {
+    'get_recipes_by_name': {'max_distance'},
+}
+
+_FIND_ARGUMENTS = frozenset(list(FILTER_FIELDS) + ['exclude_' + name for name in FILTER_FIELDS])
+
+
+class BatchQuery(NamedTuple):
+    """One query of a batch, parsed by batch_query."""
+
+    # Repository method answering the query
+    method: str
+    # Keyword arguments of the method
+    arguments: Dict[str, Any]
+    # Filters a recipe must pass, or None when the query has no results
+    filters: Optional[List[RecipeFilter]]
+    # Id looked up by get_recipe_by_id queries
+    recipe_id: Optional[str] = None
+
+    @property
+    def fields(self) -> Optional[Sequence[str]]:
+        return self.arguments.get('fields')
+
+    @property
+    def ranked(self) -> bool:
+        """Whether the query is a typo-tolerant name lookup, answered from its index instead of by filters."""
+        return self.method == 'get_recipes_by_name' and self.arguments.get('max_distance') is not None
+
+
+def batch_query(query: Mapping[str, Any]) -> BatchQuery:
+    """
+    Validate one query of a batch.
+
+    A query is a dict naming a repository method and giving its keyword arguments,
+    e.g. {"method": "get_recipes_by_category", "category": "java", "fields": ["id"]}.
+    Accepted methods are get_recipes_by_tag, get_recipes_by_category,
+    get_recipes_by_name, get_recipes_by_dependency, get_recipe_by_id and
+    find_recipes, with the arguments of the method (including max_distance for
+    get_recipes_by_name); pagination arguments are not accepted.
+
+    Args:
+        query: Query to validate
+
+    Returns:
+        The parsed query; invalid values of the queried field give an empty result,
+        like the matching repository method
+
+    Raises:
+        ValueError: If the method is not supported, an argument is unknown or
+            max_distance is not a non-negative integer
+    """
+    if not isinstance(query, Mapping):
+        raise ValueError("Each query must be a dict with a 'method' key")
+
+    method = query.get('method')
+    arguments = {key: value for key, value in query.items() if key != 'method'}
+    if method == 'get_recipe_by_id':
+        accepted = {'recipe_id', 'fields'}
+    elif method == 'find_recipes':
+        accepted = _FIND_ARGUMENTS | {'fields'}
+    elif method in _FILTER_QUERIES:
+        accepted = set(_FILTER_QUERIES[method]) | _QUERY_OPTIONS.get(method, set()) | {'fields'}
+    else:
+        raise ValueError(f"Unsupported query method: {method!r}")
+
+    unknown = sorted(set(arguments) - accepted)
+    if unknown:
+        raise ValueError(f"Unknown arguments for {method}: {', '.join(unknown)}")
+
+    max_distance = arguments.get('max_distance')
+    if max_distance is not None and (not isinstance(max_distance, int) or isinstance(max_distance, bool)
+                                     or max_distance < 0):
+        raise ValueError("max_distance must be a non-negative integer")
+
+    if method == 'get_recipe_by_id':
+        recipe_id = arguments.get('recipe_id')
+        valid = recipe_id and isinstance(recipe_id, str)
+        return BatchQuery(method, arguments, [] if valid else None, recipe_id if valid else None)
+
+    if method == 'find_recipes':
+        return BatchQuery(method, arguments, recipe_filters(
+            {name: arguments.get(name) for name in _FIND_ARGUMENTS}))
+
+    filter_names = _FILTER_QUERIES[method]
+    required = next(iter(filter_names))
+    value = arguments.get(required)
+    if not value or not isinstance(value, str):
+        return BatchQuery(method, arguments, None)
+
+    # Optional arguments that are empty or not strings are ignored like in the repository
+    values = {name: arguments.get(argument) for argument, name in filter_names.items()}
+    return BatchQuery(method, arguments, recipe_filters(
+        {name: value for name, value in values.items() if isinstance(value, str)}))
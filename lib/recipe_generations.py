@@ -0,0 +1,174 @@
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from typing import List, Any, Callable, Mapping, Optional
+
+
+# Directory of the database directory holding one sub-directory per version of the dataset
+GENERATIONS_DIR = "generations"
+
+# Symlink of the database directory pointing at the published generation
+CURRENT_LINK = "current"
+
+# Seconds a replaced generation is kept for readers that resolved it before the switch
+GENERATION_GRACE_PERIOD = 600.0
+
+
+def dataset_path(json_file_path: str) -> str:
+    """
+    Resolve the path of a recipes JSON file to the file of the current generation.
+
+    In a database directory using generations, recipes.json links to
+    current/recipes.json. Resolving it once and deriving every other path (hash,
+    snapshot, indexes) from the result gives a consistent set of files even if a
+    new generation is published meanwhile. Other paths are returned resolved
+    the same way.
+
+    Args:
+        json_file_path: Path to the recipes JSON file
+
+    Returns:
+        Canonical path of the file
+    """
+    return os.path.realpath(json_file_path)
+
+
+def current_generation(dest_dir: str) -> Optional[str]:
+    """
+    Get the name of the published generation of a database directory.
+
+    Args:
+        dest_dir: Database directory
+
+    Returns:
+        Name of the generation directory, or None if the directory does not use generations
+    """
+    try:
+        return os.path.basename(os.readlink(os.path.join(dest_dir, CURRENT_LINK)))
+    except OSError:
+        return None
+
+
+def _replace_symlink(target: str, link_path: str) -> None:
+    # A symlink cannot be overwritten in place, so a new one is renamed over it
+    tmp_link_path = f"{link_path}.{uuid.uuid4().hex}.tmp"
+    os.symlink(target, tmp_link_path)
+    try:
+        os.replace(tmp_link_path, link_path)
+    except OSError:
+        os.remove(tmp_link_path)
+        raise
+
+
+def _supports_symlinks(directory: str) -> bool:
+    probe = os.path.join(directory, f".symlink-{uuid.uuid4().hex}")
+    try:
+        os.symlink(".", probe)
+    except (OSError, NotImplementedError):
+        return False
+    os.remove(probe)
+    return True
+
+
+def _write_file(path: str, content: bytes) -> None:
+    with tempfile.NamedTemporaryFile(mode='wb', dir=os.path.dirname(path), delete=False) as tmp_file:
+        tmp_file.write(content)
+        tmp_file_path = tmp_file.name
+    os.replace(tmp_file_path, path)
+
+
+def publish_generation(dest_dir: str, files: Mapping[str, bytes],
+                       prepare: Optional[Callable[[str], Any]] = None) -> str:
+    """
+    Write a complete version of the dataset and make it the current one.
+
+    The files are written to a new directory under generations/, prepare adds the
+    derived files, then the current symlink is switched to the new directory in
+    one rename. The top-level names of the files link through current, so
+    readers see either the whole previous generation or the whole new one.
+
+    Where symlinks are not supported the files are replaced in place instead,
+    one by one.
+
+    Args:
+        dest_dir: Database directory
+        files: Content of each file of the dataset by name, e.g. recipes.json
+        prepare: Function called with the directory of the new generation before
+            it is published, to write snapshots and indexes next to the files
+
+    Returns:
+        Directory holding the published files
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    if not _supports_symlinks(dest_dir):
+        for name, content in files.items():
+            _write_file(os.path.join(dest_dir, name), content)
+        if prepare is not None:
+            prepare(dest_dir)
+        return dest_dir
+
+    name = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    generation = os.path.join(dest_dir, GENERATIONS_DIR, name)
+    os.makedirs(generation)
+    try:
+        for file_name, content in files.items():
+            _write_file(os.path.join(generation, file_name), content)
+        if prepare is not None:
+            prepare(generation)
+    except BaseException:
+        shutil.rmtree(generation, ignore_errors=True)
+        raise
+
+    previous = current_generation(dest_dir)
+    _replace_symlink(os.path.join(GENERATIONS_DIR, name), os.path.join(dest_dir, CURRENT_LINK))
+    if previous is not None:
+        # The modification time of a replaced generation tells when it was retired
+        try:
+            os.utime(os.path.join(dest_dir, GENERATIONS_DIR, previous))
+        except OSError:
+            pass
+
+    # Only needed the first time, when plain files are turned into links
+    for file_name in files:
+        link_path = os.path.join(dest_dir, file_name)
+        target = os.path.join(CURRENT_LINK, file_name)
+        if not os.path.islink(link_path) or os.readlink(link_path) != target:
+            _replace_symlink(target, link_path)
+
+    return generation
+
+
+def collect_generations(dest_dir: str, grace_period: float = GENERATION_GRACE_PERIOD) -> List[str]:
+    """
+    Delete the generations replaced longer ago than the grace period.
+
+    Args:
+        dest_dir: Database directory
+        grace_period: Seconds a replaced generation is kept
+
+    Returns:
+        Names of the deleted generations
+    """
+    generations = os.path.join(dest_dir, GENERATIONS_DIR)
+    current = current_generation(dest_dir)
+    try:
+        names = sorted(os.listdir(generations))
+    except OSError:
+        return []
+
+    deleted = []
+    now = time.time()
+    for name in names:
+        path = os.path.join(generations, name)
+        try:
+            retired = os.stat(path).st_mtime
+        except OSError:
+            continue
+        if name == current or not os.path.isdir(path) or now - retired < grace_period:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        deleted.append(name)
+
+    return deleted
@@ -0,0 +1,230 @@
+import json
+import os
+import re
+import hashlib
+import tempfile
+from decimal import Decimal
+from typing import List, Dict, Optional, Any, Iterator, Sequence, Tuple
+
+
+ID_INDEX_SUFFIX = ".idx"
+ID_INDEX_VERSION = 1
+
+# Strings are matched whole so brackets inside them are not mistaken for structure
+_JSON_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{}]')
+
+# Recipe id -> (byte offset, byte length) of the record in recipes.json
+IdOffsets = Dict[str, Tuple[int, int]]
+
+
+def id_index_path(json_file_path: str) -> str:
+    """
+    Get the path of the id index sidecar of a recipes dataset.
+
+    Args:
+        json_file_path: Path to the recipes JSON file
+
+    Returns:
+        Path of the sidecar file next to the JSON file
+    """
+    return json_file_path + ID_INDEX_SUFFIX
+
+
+def scan_record_spans(data: bytes) -> Iterator[Tuple[int, int]]:
+    """
+    Find the byte spans of the objects in a top-level JSON array.
+
+    Args:
+        data: Raw content of a JSON file
+
+    Yields:
+        (offset, length) of each object element of the top-level array, in file order
+    """
+    if not data.lstrip().startswith(b'['):
+        return
+
+    depth = 0
+    start = 0
+    for match in _JSON_TOKEN.finditer(data):
+        token = match.group()
+        if token == b'{' or token == b'[':
+            if depth == 1 and token == b'{':
+                start = match.start()
+            depth += 1
+        elif token == b'}' or token == b']':
+            depth -= 1
+            if depth == 1 and token == b'}':
+                yield start, match.end() - start
+            elif depth == 0:
+                return
+
+
+def decode_record(raw: bytes) -> Any:
+    """
+    Decode one record the same way the ijson stream does.
+
+    Args:
+        raw: JSON bytes of a single record
+
+    Returns:
+        Decoded value, with non-integer numbers as Decimal like ijson produces
+    """
+    return json.loads(raw, parse_float=Decimal)
+
+
+def build_id_offsets(data: bytes) -> IdOffsets:
+    """
+    Build the id -> byte span mapping of a recipes dataset.
+
+    Args:
+        data: Raw content of the recipes JSON file
+
+    Returns:
+        Mapping of recipe id to the span of the first record carrying it
+    """
+    offsets: IdOffsets = {}
+    for offset, length in scan_record_spans(data):
+        try:
+            recipe = decode_record(data[offset:offset + length])
+        except ValueError:
+            # The stream stops at the first malformed record, so does the index
+            break
+
+        if isinstance(recipe, dict):
+            recipe_id = recipe.get('id')
+            if isinstance(recipe_id, str) and recipe_id not in offsets:
+                offsets[recipe_id] = (offset, length)
+
+    return offsets
+
+
+def load_id_index(json_file_path: str, expected_sha256: Optional[str]) -> Optional[IdOffsets]:
+    """
+    Load the id index sidecar if it belongs to the current dataset.
+
+    Args:
+        json_file_path: Path to the recipes JSON file
+        expected_sha256: Hash read from recipes.json.sha256
+
+    Returns:
+        The id offsets, or None if the sidecar is missing, unreadable or stale
+    """
+    if not expected_sha256:
+        return None
+
+    try:
+        with open(id_index_path(json_file_path), 'rb') as f:
+            index = json.load(f)
+        size = os.path.getsize(json_file_path)
+    except (OSError, ValueError):
+        return None
+
+    if (not isinstance(index, dict) or index.get('version') != ID_INDEX_VERSION
+            or index.get('sha256') != expected_sha256 or index.get('size') != size):
+        return None
+
+    offsets = index.get('offsets')
+    if not isinstance(offsets, dict):
+        return None
+
+    return {recipe_id: (span[0], span[1]) for recipe_id, span in offsets.items()}
+
+
+def build_id_index(json_file_path: str, expected_sha256: Optional[str]) -> Optional[IdOffsets]:
+    """
+    Build the id index of a dataset and persist it as a sidecar file.
+
+    The index is only built when the content of the JSON file matches its .sha256
+    file, so a sidecar can never describe a different version of the data. Failing
+    to write the sidecar (e.g. read-only install) still returns the index.
+
+    Args:
+        json_file_path: Path to the recipes JSON file
+        expected_sha256: Hash read from recipes.json.sha256
+
+    Returns:
+        The id offsets, or None if the dataset cannot be verified
+    """
+    if not expected_sha256:
+        return None
+
+    try:
+        with open(json_file_path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    if hashlib.sha256(data).hexdigest() != expected_sha256:
+        return None
+
+    offsets = build_id_offsets(data)
+    index = {
+        'version': ID_INDEX_VERSION,
+        'sha256': expected_sha256,
+        'size': len(data),
+        'offsets': offsets
+    }
+
+    dest_dir = os.path.dirname(os.path.abspath(json_file_path))
+    try:
+        with tempfile.NamedTemporaryFile(mode='w', dir=dest_dir, delete=False, encoding='utf-8') as tmp_index:
+            json.dump(index, tmp_index, separators=(',', ':'))
+            tmp_index_path = tmp_index.name
+        os.replace(tmp_index_path, id_index_path(json_file_path))
+    except OSError:
+        pass
+
+    return offsets
+
+
+def read_record(json_file_path: str, offset: int, length: int) -> Optional[Dict[str, Any]]:
+    """
+    Read and decode a single record at a known position of the JSON file.
+
+    Args:
+        json_file_path: Path to the recipes JSON file
+        offset: Byte offset of the record
+        length: Byte length of the record
+
+    Returns:
+        The recipe dictionary, or None if the span does not hold a JSON object
+    """
+    try:
+        with open(json_file_path, 'rb') as f:
+            f.seek(offset)
+            recipe = decode_record(f.read(length))
+    except (OSError, ValueError):
+        return None
+
+    return recipe if isinstance(recipe, dict) else None
+
+
+def read_records(json_file_path: str, spans: Sequence[Tuple[int, int]]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Read and decode several records at known positions of the JSON file with one open.
+
+    Spans are read in file order so the reads move forward through the file.
+
+    Args:
+        json_file_path: Path to the recipes JSON file
+        spans: (offset, length) of each record
+
+    Returns:
+        The recipe dictionary of each span, in the order of the spans, or None for
+        spans that do not hold a JSON object
+    """
+    records: List[Optional[Dict[str, Any]]] = [None] * len(spans)
+    try:
+        with open(json_file_path, 'rb') as f:
+            for index in sorted(range(len(spans)), key=lambda i: spans[i][0]):
+                offset, length = spans[index]
+                f.seek(offset)
+                try:
+                    recipe = decode_record(f.read(length))
+                except ValueError:
+                    continue
+                records[index] = recipe if isinstance(recipe, dict) else None
+    except OSError:
+        pass
+
+    return records
@@ -0,0 +1,575 @@
+import unicodedata
+from bisect import bisect_left
+from typing import List, Dict, Optional, Any, Iterable, Mapping, Sequence, Tuple
+
+
+# Category key -> sub-category key (None when missing) -> record positions
+CategoryIndex = Dict[str, Dict[Optional[str], List[int]]]
+
+# Category key -> sub-category key (None when missing) -> number of records
+CategoryCounts = Mapping[str, Mapping[Optional[str], int]]
+
+
+def normalize_key(value: str) -> str:
+    """
+    Normalize a string for case-insensitive matching.
+
+    Case is folded with casefold() and compatibility characters with NFKC (Unicode
+    compatibility caseless matching), so "Straße", "STRASSE" and "ｓｔｒａｓｓｅ" share a
+    key. ASCII strings, the common case, only need lower().
+
+    Args:
+        value: String to normalize
+
+    Returns:
+        Search key of the string
+    """
+    if value.isascii():
+        return value.lower()
+    folded = unicodedata.normalize('NFD', value).casefold()
+    return unicodedata.normalize('NFKC', unicodedata.normalize('NFKD', folded).casefold())
+
+
+def field_key(recipe: Mapping[str, Any], field: str, default: Any = None) -> Optional[str]:
+    """
+    Get the search key of a string field of a recipe.
+
+    Args:
+        recipe: Recipe dictionary or compact record
+        field: Name of the field
+        default: Value used when the field is missing
+
+    Returns:
+        Normalized value, or None if the value is not a string
+    """
+    value = recipe.get(field, default)
+    return normalize_key(value) if isinstance(value, str) else None
+
+
+def build_category_index(records: Sequence[Dict[str, Any]]) -> CategoryIndex:
+    """
+    Build the two-level category index of a dataset, keyed by normalized names.
+
+    Records without a string category, or with an empty one, are left out, the same
+    way the category queries skip them.
+
+    Args:
+        records: Recipe dictionaries in file order
+
+    Returns:
+        Mapping of category to sub-category to the positions of the matching records,
+        each position list in file order
+    """
+    index: CategoryIndex = {}
+    for position, recipe in enumerate(records):
+        category_val = recipe.get('category')
+        if not category_val or not isinstance(category_val, str):
+            continue
+
+        index.setdefault(normalize_key(category_val), {}).setdefault(field_key(recipe, 'sub-category'), []) \
+            .append(position)
+
+    return index
+
+
+def build_category_positions(category_index: CategoryIndex) -> Dict[str, List[int]]:
+    """
+    Flatten the category index into one position list per category.
+
+    Args:
+        category_index: Index built by build_category_index
+
+    Returns:
+        Mapping of category to the positions of all its records, in file order
+    """
+    return {
+        category: sorted(position for positions in subcategories.values() for position in positions)
+        for category, subcategories in category_index.items()
+    }
+
+
+def build_category_counts(records: Iterable[Mapping[str, Any]]) -> Dict[str, Dict[Optional[str], int]]:
+    """
+    Count the records of a dataset per category and sub-category in a single pass.
+
+    Records are grouped the same way as in build_category_index.
+
+    Args:
+        records: Recipe dictionaries, read only once
+
+    Returns:
+        Mapping of category to sub-category to the number of matching records
+    """
+    counts: Dict[str, Dict[Optional[str], int]] = {}
+    for recipe in records:
+        category_val = recipe.get('category')
+        if not category_val or not isinstance(category_val, str):
+            continue
+
+        subcategory_counts = counts.setdefault(normalize_key(category_val), {})
+        subcategory = field_key(recipe, 'sub-category')
+        subcategory_counts[subcategory] = subcategory_counts.get(subcategory, 0) + 1
+
+    return counts
+
+
+class CategoryTree:
+    """
+    Sorted category and sub-category names of a dataset with their recipe counts.
+
+    The tree is built once per dataset version, so the category listings only copy
+    the part of it they return.
+    """
+
+    def __init__(self, nodes: Sequence[Tuple[str, int, Sequence[Tuple[str, int]]]]):
+        """
+        Initialize the tree.
+
+        Args:
+            nodes: (category, recipe count, ((sub-category, recipe count), ...))
+                tuples, sorted by category and then by sub-category
+        """
+        self.nodes: List[Tuple[str, int, Tuple[Tuple[str, int], ...]]] = [
+            (category, count, tuple(subcategories)) for category, count, subcategories in nodes
+        ]
+        self.categories: Tuple[str, ...] = tuple(category for category, _, _ in self.nodes)
+        self._nodes_by_category = {node[0]: node for node in self.nodes}
+
+    @classmethod
+    def from_counts(cls, counts: CategoryCounts) -> 'CategoryTree':
+        """
+        Build the tree of a dataset from its per-category record counts.
+
+        Records without a string sub-category only count towards their category.
+
+        Args:
+            counts: Mapping of category to sub-category to number of records, as
+                returned by build_category_counts
+
+        Returns:
+            Tree sorted by category and sub-category
+        """
+        return cls([
+            (
+                category,
+                sum(counts[category].values()),
+                sorted((subcategory, count) for subcategory, count in counts[category].items()
+                       if subcategory is not None)
+            )
+            for category in sorted(counts)
+        ])
+
+    @classmethod
+    def from_category_index(cls, category_index: CategoryIndex) -> 'CategoryTree':
+        """
+        Build the tree of a dataset from its category index.
+
+        Args:
+            category_index: Index built by build_category_index
+
+        Returns:
+            Tree with the number of positions of each index entry as its count
+        """
+        return cls.from_counts({
+            category: {subcategory: len(positions) for subcategory, positions in subcategories.items()}
+            for category, subcategories in category_index.items()
+        })
+
+    def subcategories(self, category: str) -> List[str]:
+        """
+        Get the sorted sub-category names of a category, including empty names.
+
+        Args:
+            category: Normalized category name
+
+        Returns:
+            Sub-category names, or an empty list for an unknown category
+        """
+        node = self._nodes_by_category.get(category)
+        return [subcategory for subcategory, _ in node[2]] if node is not None else []
+
+    def with_subcategories(self) -> List[Dict[str, Any]]:
+        """
+        List every category with its non-empty sub-category names.
+
+        Returns:
+            List of dicts with 'category' and 'sub-categories' keys
+        """
+        return [
+            {'category': category, 'sub-categories': [subcategory for subcategory, _ in subcategories if subcategory]}
+            for category, _, subcategories in self.nodes
+        ]
+
+    def with_counts(self) -> List[Dict[str, Any]]:
+        """
+        List every category and non-empty sub-category with its number of recipes.
+
+        Returns:
+            List of dicts with 'category', 'count' and 'sub-categories' keys, the
+            latter holding dicts with 'sub-category' and 'count' keys
+        """
+        return [
+            {
+                'category': category,
+                'count': count,
+                'sub-categories': [
+                    {'sub-category': subcategory, 'count': subcategory_count}
+                    for subcategory, subcategory_count in subcategories if subcategory
+                ]
+            }
+            for category, count, subcategories in self.nodes
+        ]
+
+
+def build_subcategory_positions(records: Sequence[Dict[str, Any]]) -> Dict[str, List[int]]:
+    """
+    Build the sub-category index of a dataset over every record.
+
+    Unlike the category index, records without a category are included, since
+    sub-category filters match them too.
+
+    Args:
+        records: Recipe dictionaries in file order
+
+    Returns:
+        Mapping of sub-category key to the sorted positions of the records carrying it
+    """
+    index: Dict[str, List[int]] = {}
+    for position, recipe in enumerate(records):
+        key = field_key(recipe, 'sub-category')
+        if key is not None:
+            index.setdefault(key, []).append(position)
+
+    return index
+
+
+def build_tag_index(records: Sequence[Dict[str, Any]]) -> Dict[str, List[int]]:
+    """
+    Build the inverted tag index of a dataset.
+
+    Args:
+        records: Recipe dictionaries in file order
+
+    Returns:
+        Mapping of tag key to the sorted positions of the records carrying it.
+        A record is listed once per tag even if the tag is repeated.
+    """
+    index: Dict[str, List[int]] = {}
+    for position, recipe in enumerate(records):
+        tags = recipe.get('tags', [])
+        if not isinstance(tags, list):
+            continue
+
+        for tag in tags:
+            if isinstance(tag, str):
+                postings = index.setdefault(normalize_key(tag), [])
+                if not postings or postings[-1] != position:
+                    postings.append(position)
+
+    return index
+
+
+def build_id_positions(records: Sequence[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Build the recipe id index of a dataset.
+
+    Args:
+        records: Recipe dictionaries in file order
+
+    Returns:
+        Mapping of recipe id to the position of the first record carrying it
+    """
+    index: Dict[str, int] = {}
+    for position, recipe in enumerate(records):
+        recipe_id = recipe.get('id')
+        if isinstance(recipe_id, str) and recipe_id not in index:
+            index[recipe_id] = position
+
+    return index
+
+
+class VocabularyIndex:
+    """
+    Substring index over a column with few distinct values, such as dependencies.
+    """
+
+    def __init__(self, keys: Sequence[Optional[str]]):
+        """
+        Build the index.
+
+        Args:
+            keys: Search key of each record in file order, None for records
+                without a string value
+        """
+        self.postings: Dict[str, List[int]] = {}
+        for position, key in enumerate(keys):
+            if key is not None:
+                self.postings.setdefault(key, []).append(position)
+
+    @classmethod
+    def from_postings(cls, postings: Dict[str, List[int]]) -> 'VocabularyIndex':
+        """
+        Restore an index from previously built postings.
+
+        Args:
+            postings: Mapping of distinct value to sorted record positions
+
+        Returns:
+            Index using the given postings
+        """
+        index = cls([])
+        index.postings = postings
+        return index
+
+    def search(self, query: str) -> List[int]:
+        """
+        Find the records whose value contains the query.
+
+        The query is matched once per distinct value, and the postings of the
+        matching values are merged back into file order.
+
+        Args:
+            query: Normalized, non-empty substring to look for
+
+        Returns:
+            Sorted positions of the matching records
+        """
+        matches = [postings for value, postings in self.postings.items() if query in value]
+        if len(matches) == 1:
+            return list(matches[0])
+        return sorted(position for postings in matches for position in postings)
+
+
+class TrigramIndex:
+    """
+    Trigram index for substring search over a column of search keys.
+    """
+
+    def __init__(self, keys: Sequence[Optional[str]]):
+        """
+        Build the index.
+
+        Args:
+            keys: Search key of each record in file order, None for records
+                without a string value
+        """
+        self.keys = keys
+        self.postings: Dict[str, List[int]] = {}
+
+        for position, key in enumerate(keys):
+            if key is None:
+                continue
+            for trigram in {key[i:i + 3] for i in range(len(key) - 2)}:
+                self.postings.setdefault(trigram, []).append(position)
+
+    @classmethod
+    def from_postings(cls, keys: Sequence[Optional[str]], postings: Dict[str, List[int]]) -> 'TrigramIndex':
+        """
+        Restore an index from previously built postings.
+
+        Args:
+            keys: Search key of each record in file order
+            postings: Mapping of trigram to sorted record positions
+
+        Returns:
+            Index using the given keys and postings
+        """
+        index = cls([])
+        index.keys = keys
+        index.postings = postings
+        return index
+
+    def search(self, query: str) -> List[int]:
+        """
+        Find the records whose value contains the query.
+
+        Queries of three or more characters only look at the records in the posting
+        list of their rarest trigram; shorter queries scan the keys.
+
+        Args:
+            query: Normalized, non-empty substring to look for
+
+        Returns:
+            Sorted positions of the matching records
+        """
+        if len(query) < 3:
+            return [position for position, key in enumerate(self.keys) if key is not None and query in key]
+
+        candidates = None
+        for trigram in {query[i:i + 3] for i in range(len(query) - 2)}:
+            trigram_postings = self.postings.get(trigram)
+            if trigram_postings is None:
+                return []
+            if candidates is None or len(trigram_postings) < len(candidates):
+                candidates = trigram_postings
+
+        # Checking the substring on each candidate is an exact filter, so it also
+        # does the job of intersecting the posting lists of the other trigrams
+        keys = self.keys
+        return [position for position in candidates if query in keys[position]]
+
+
+class FuzzyIndex:
+    """
+    Trie over the distinct search keys of a column for edit-distance lookups.
+
+    A lookup walks the trie while computing the Levenshtein distance of the query
+    to each prefix, one row of the dynamic programming table per trie node, so keys
+    sharing a prefix share its rows and branches already too far from the query
+    are never descended into.
+    """
+
+    def __init__(self, keys: Sequence[Optional[str]]):
+        """
+        Build the index.
+
+        Args:
+            keys: Search key of each record in file order, None for records
+                without a string value
+        """
+        # Nested dicts keyed by character; the '' entry of a node holds the sorted
+        # positions of the records whose key ends there
+        self.trie: Dict[str, Any] = {}
+        for position, key in enumerate(keys):
+            if key is None:
+                continue
+            node = self.trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node.setdefault('', []).append(position)
+
+    def search(self, query: str, max_distance: int) -> List[Tuple[int, int]]:
+        """
+        Find the records whose key is within an edit distance of the query.
+
+        Args:
+            query: Normalized query
+            max_distance: Maximum number of inserted, deleted or substituted characters
+
+        Returns:
+            (position, distance) pairs by increasing distance, ties in file order
+        """
+        matches: List[Tuple[int, int]] = []
+        length = len(query)
+        # Distances above the limit are all capped to one value past it
+        cap = max_distance + 1
+        stack = [(self.trie, 0, [min(column, cap) for column in range(length + 1)])]
+        while stack:
+            node, depth, row = stack.pop()
+            if row[-1] <= max_distance and '' in node:
+                matches.extend((position, row[-1]) for position in node[''])
+
+            depth += 1
+            # Cells further than max_distance from the diagonal exceed the limit anyway
+            first = max(1, depth - max_distance)
+            last = min(length, depth + max_distance)
+            for char, child in node.items():
+                if not char:
+                    continue
+                next_row = [cap] * (length + 1)
+                next_row[0] = min(depth, cap)
+                best = next_row[0]
+                for column in range(first, last + 1):
+                    cell = min(next_row[column - 1] + 1, row[column] + 1,
+                               row[column - 1] + (query[column - 1] != char), cap)
+                    next_row[column] = cell
+                    if cell < best:
+                        best = cell
+                # Distances only grow along a branch once every cell exceeds the limit
+                if best <= max_distance:
+                    stack.append((child, depth, next_row))
+
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches
+
+
+# Recipe keys whose values are offered as completions, in the order ties are listed
+COMPLETION_FIELDS = ('name', 'package')
+
+
+class CompletionIndex:
+    """
+    Sorted array of the distinct search keys of some columns for prefix completion.
+
+    The keys sharing a prefix are contiguous in the array, so a lookup finds the
+    first of them by binary search and reads the next ones in order, without
+    looking at any record.
+    """
+
+    def __init__(self, records: Iterable[Mapping[str, Any]], fields: Sequence[str] = COMPLETION_FIELDS):
+        """
+        Build the index.
+
+        Args:
+            records: Recipes in file order, with at least the given fields
+            fields: Recipe keys whose string values are completed
+        """
+        # (key, field rank) -> [first value seen, number of records]
+        entries: Dict[Tuple[str, int], List[Any]] = {}
+        for record in records:
+            for rank, field in enumerate(fields):
+                key = field_key(record, field)
+                if not key:
+                    continue
+                entry = entries.get((key, rank))
+                if entry is None:
+                    entries[(key, rank)] = [record[field], 1]
+                else:
+                    entry[1] += 1
+
+        ordered = sorted(entries.items())
+        self.keys: List[str] = [key for (key, _), _ in ordered]
+        self.fields: List[str] = [fields[rank] for (_, rank), _ in ordered]
+        self.values: List[str] = [value for _, (value, _) in ordered]
+        self.counts: List[int] = [recipes for _, (_, recipes) in ordered]
+
+    def complete(self, prefix: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Find the values starting with a prefix.
+
+        Args:
+            prefix: Normalized, non-empty prefix
+            limit: Maximum number of completions
+
+        Returns:
+            Completions in key order, each a dict with the original 'value', the
+            'field' it comes from and the number of 'recipes' carrying it
+        """
+        keys = self.keys
+        completions = []
+        position = bisect_left(keys, prefix)
+        end = min(len(keys), position + limit)
+        while position < end and keys[position].startswith(prefix):
+            completions.append({'value': self.values[position], 'field': self.fields[position],
+                                'recipes': self.counts[position]})
+            position += 1
+        return completions
+
+
+def intersect_postings(postings: Sequence[Sequence[int]]) -> List[int]:
+    """
+    Intersect sorted posting lists.
+
+    Lists are intersected from the shortest up, and the survivors are looked up in
+    each longer list by binary search, so the cost follows the size of the
+    smallest list rather than the sum of all of them.
+
+    Args:
+        postings: Sorted lists of record positions, at least one
+
+    Returns:
+        Sorted positions present in every list
+    """
+    ordered = sorted(postings, key=len)
+    survivors = list(ordered[0])
+    for other in ordered[1:]:
+        if not survivors:
+            break
+        size = len(other)
+        kept = []
+        for position in survivors:
+            index = bisect_left(other, position)
+            if index < size and other[index] == position:
+                kept.append(position)
+        survivors = kept
+    return survivors
@@ -0,0 +1,100 @@
+import os
+from types import ModuleType
+from typing import List, Dict, Optional
+import ijson
+
+
+# Environment variable naming the ijson backend that parses recipes.json, e.g. "python"
+JSON_BACKEND_ENV = 'OPENREWRITE_DB_JSON_BACKEND'
+
+# Backends tried in order when none is configured, fastest first
+BACKEND_PREFERENCE = ('yajl2_c', 'yajl2_cffi', 'python')
+
+# Imported backends by name, None for the ones whose library is missing
+_loaded: Dict[str, Optional[ModuleType]] = {}
+
+# Backend used by the recipe streams, selected on first use
+_active: Optional[ModuleType] = None
+
+
+def _load_backend(name: str) -> Optional[ModuleType]:
+    if name not in _loaded:
+        try:
+            _loaded[name] = ijson.get_backend(name)
+        except ImportError:
+            _loaded[name] = None
+    return _loaded[name]
+
+
+def available_json_backends() -> List[str]:
+    """
+    List the ijson backends that can be loaded in this environment.
+
+    Returns:
+        Names of the loadable backends, fastest first
+    """
+    return [name for name in ijson.ALL_BACKENDS if _load_backend(name) is not None]
+
+
+def _select_backend(name: Optional[str]) -> ModuleType:
+    if name is None:
+        name = os.environ.get(JSON_BACKEND_ENV, '').strip() or None
+    if name is None:
+        for candidate in BACKEND_PREFERENCE:
+            backend = _load_backend(candidate)
+            if backend is not None:
+                return backend
+        raise ValueError("No ijson backend is available")
+
+    if name not in ijson.ALL_BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {name!r}, expected one of {', '.join(ijson.ALL_BACKENDS)}")
+    backend = _load_backend(name)
+    if backend is None:
+        raise ValueError(f"JSON backend {name!r} is not available, available backends: "
+                         f"{', '.join(available_json_backends())}")
+    return backend
+
+
+def set_json_backend(name: Optional[str] = None) -> str:
+    """
+    Select the ijson backend parsing recipes.json in this process.
+
+    Args:
+        name: Backend name, e.g. "yajl2_c" or "python"; None to use the backend
+            named by the OPENREWRITE_DB_JSON_BACKEND environment variable, or else
+            the first available one of BACKEND_PREFERENCE
+
+    Returns:
+        Name of the selected backend
+
+    Raises:
+        ValueError: If the backend is unknown or its library is not installed
+    """
+    global _active
+    _active = _select_backend(name)
+    return _active.backend_name
+
+
+def json_backend() -> ModuleType:
+    """
+    Get the ijson backend parsing recipes.json, selecting it on first use.
+
+    Returns:
+        The backend module, with items() and basic_parse() like the ijson package
+
+    Raises:
+        ValueError: If the configured backend is unknown or not installed
+    """
+    if _active is None:
+        set_json_backend()
+    return _active
+
+
+def json_backend_name() -> str:
+    """
+    Get the name of the ijson backend parsing recipes.json, e.g. "yajl2_c".
+
+    Raises:
+        ValueError: If the configured backend is unknown or not installed
+    """
+    return json_backend().backend_name
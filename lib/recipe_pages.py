@@ -0,0 +1,190 @@
+import base64
+import binascii
+import json
+import zlib
+from bisect import bisect_right
+from typing import List, Dict, Optional, Any, Iterable, NamedTuple, Sequence, Tuple
+
+
+# Page of query results: {'recipes': [...], 'total': int or None, 'next_cursor': str or None}
+RecipePage = Dict[str, Any]
+
+
+class PageRequest(NamedTuple):
+    """Page of results asked for by a query, resolved from limit, offset and cursor."""
+
+    limit: int
+    offset: int
+    # Position of the last record of the previous page when resuming from a cursor
+    after: Optional[int]
+    # Dataset version the positions refer to
+    version: str
+
+
+def dataset_version(fingerprint: Any) -> str:
+    """
+    Get a short token identifying a dataset version in cursors.
+
+    Args:
+        fingerprint: JSON-serializable fingerprint of the dataset
+
+    Returns:
+        Hex token that changes whenever the fingerprint changes
+    """
+    return format(zlib.crc32(json.dumps(fingerprint).encode('utf-8')), '08x')
+
+
+def encode_cursor(version: str, position: int) -> str:
+    """
+    Build the opaque cursor resuming a query after a record.
+
+    Args:
+        version: Token of the dataset version the position refers to
+        position: Position of the last record returned
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = f"{version}:{position}".encode('ascii')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """
+    Read a cursor built by encode_cursor.
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        Tuple of dataset version token and record position
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('ascii')
+        version, position = payload.split(':')
+        position = int(position)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+    if position < 0:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return version, position
+
+
+def is_paginated(limit: Optional[int], offset: Optional[int], cursor: Optional[str]) -> bool:
+    """
+    Tell whether a query was called with pagination arguments.
+
+    Args:
+        limit: Maximum number of results
+        offset: Number of results to skip
+        cursor: Cursor of the previous page
+
+    Returns:
+        True if the query returns a page; queries called without pagination
+        arguments return a plain list of every match
+    """
+    return limit is not None or bool(offset) or cursor is not None
+
+
+def page_request(limit: Optional[int], offset: Optional[int], cursor: Optional[str], version: str) -> PageRequest:
+    """
+    Validate the pagination arguments of a query.
+
+    Args:
+        limit: Maximum number of results, or None to run to the last match
+        offset: Number of results to skip
+        cursor: Cursor returned as next_cursor by the previous page
+        version: Token of the current dataset version
+
+    Returns:
+        The page to return
+
+    Raises:
+        ValueError: If an argument is invalid, offset and cursor are combined, or the
+            cursor was issued for another version of the dataset
+    """
+    if limit is not None and (not isinstance(limit, int) or isinstance(limit, bool) or limit < 1):
+        raise ValueError("limit must be a positive integer")
+    if offset is not None and (not isinstance(offset, int) or isinstance(offset, bool) or offset < 0):
+        raise ValueError("offset must be a non-negative integer")
+    if offset and cursor is not None:
+        raise ValueError("offset and cursor cannot be used together")
+
+    after = None
+    if cursor is not None:
+        cursor_version, after = decode_cursor(cursor)
+        if cursor_version != version:
+            raise ValueError("Cursor was issued for another version of the dataset")
+
+    # Without a limit the page runs to the end of the results
+    return PageRequest(limit if limit is not None else -1, offset or 0, after, version)
+
+
+def slice_positions(positions: Sequence[int], request: PageRequest) -> Tuple[List[int], bool]:
+    """
+    Select the page of a sorted list of matching record positions.
+
+    Args:
+        positions: Positions of all the matching records, in file order
+        request: Page to select
+
+    Returns:
+        Tuple of the positions on the page and whether more matches follow
+    """
+    start = bisect_right(positions, request.after) if request.after is not None else request.offset
+    end = start + request.limit if request.limit >= 0 else len(positions)
+    return list(positions[start:end]), end < len(positions)
+
+
+def scan_page(matches: Iterable[Tuple[int, Any]], request: PageRequest) -> Tuple[List[Tuple[int, Any]], bool]:
+    """
+    Collect a page from a stream of matches, stopping as soon as it is known to be full.
+
+    Args:
+        matches: (position, record) pairs of the matching records, in file order
+        request: Page to collect
+
+    Returns:
+        Tuple of the (position, record) pairs on the page and whether more matches follow
+    """
+    page: List[Tuple[int, Any]] = []
+    skipped = 0
+    for position, record in matches:
+        if request.after is not None:
+            if position <= request.after:
+                continue
+        elif skipped < request.offset:
+            skipped += 1
+            continue
+
+        if len(page) == request.limit:
+            # One more match exists past the page; the scan stops here
+            return page, True
+        page.append((position, record))
+
+    return page, False
+
+
+def make_page(recipes: List[Dict[str, Any]], total: Optional[int], last_position: Optional[int],
+              has_more: bool, request: PageRequest) -> RecipePage:
+    """
+    Assemble the result of a paginated query.
+
+    Args:
+        recipes: Recipes on the page
+        total: Number of matches over all pages, or None when it is unknown
+        last_position: Position of the last recipe on the page
+        has_more: Whether matches follow the page
+        request: Page that was asked for
+
+    Returns:
+        Dict with 'recipes', 'total' and 'next_cursor' keys; next_cursor is None
+        on the last page
+    """
+    next_cursor = encode_cursor(request.version, last_position) \
+        if has_more and last_position is not None else None
+    return {'recipes': recipes, 'total': total, 'next_cursor': next_cursor}
@@ -0,0 +1,215 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Any, Callable, Mapping, Sequence, Tuple
+from lib.recipe_snapshot import copy_value
+
+
+# Environment variables configuring the query cache of the MCP server
+CACHE_MAX_ENTRIES_ENV = 'OPENREWRITE_DB_CACHE_MAX_ENTRIES'
+CACHE_MAX_BYTES_ENV = 'OPENREWRITE_DB_CACHE_MAX_BYTES'
+CACHE_TTL_ENV = 'OPENREWRITE_DB_CACHE_TTL'
+
+# Number of results kept when no limit is configured
+DEFAULT_MAX_ENTRIES = 256
+
+
+def query_key(method: str, args: Sequence[Any], kwargs: Mapping[str, Any], version: str) -> str:
+    """
+    Build the cache key of a query.
+
+    Arguments are written as canonical JSON, with keyword arguments sorted, so
+    equal calls give equal keys. The dataset version makes the key change when
+    the database is updated.
+
+    Args:
+        method: Name of the repository method
+        args: Positional arguments of the call
+        kwargs: Keyword arguments of the call
+        version: Token of the dataset version answering the query
+
+    Returns:
+        Key string
+    """
+    return json.dumps([method, list(args), kwargs, version], sort_keys=True, default=repr,
+                      separators=(',', ':'))
+
+
+def _positive(value: Optional[float], name: str, integer: bool = True) -> None:
+    if value is None:
+        return
+    if isinstance(value, bool) or not isinstance(value, int if integer else (int, float)) or value <= 0:
+        raise ValueError(f"{name} must be a positive {'integer' if integer else 'number'}")
+
+
+class QueryCache:
+    """
+    Bounded cache of query results, evicting the least recently used ones.
+
+    The cache holds at most max_entries results and, when max_bytes is set, at
+    most that many bytes of results measured as their JSON size. Results older
+    than ttl seconds are dropped when looked up. Stored and returned results are
+    private copies, so callers may modify what they get. All methods are
+    thread-safe.
+    """
+
+    def __init__(self, max_entries: Optional[int] = DEFAULT_MAX_ENTRIES, max_bytes: Optional[int] = None,
+                 ttl: Optional[float] = None):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum number of results, or None for no limit
+            max_bytes: Maximum JSON size of all results together, or None for no limit
+            ttl: Seconds a result stays valid, or None to keep it until evicted
+
+        Raises:
+            ValueError: If a limit is not positive
+        """
+        _positive(max_entries, 'max_entries')
+        _positive(max_bytes, 'max_bytes')
+        _positive(ttl, 'ttl', integer=False)
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.bytes = 0
+        # Key -> (result, size in bytes, time stored), least recently used first
+        self._entries: 'OrderedDict[str, Tuple[Any, int, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _size(self, value: Any) -> int:
+        # Measuring costs a serialization, so it is only done when bytes are limited
+        if self.max_bytes is None:
+            return 0
+        return len(json.dumps(value, default=str, separators=(',', ':')).encode('utf-8'))
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Get the cached result of a query, running it on a miss.
+
+        The query runs outside the lock, so concurrent misses on the same key may
+        each run it; the last result is kept. Exceptions are not cached.
+
+        Args:
+            key: Key of the query, from query_key
+            compute: Function running the query
+
+        Returns:
+            Private copy of the result
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and now - entry[2] >= self.ttl:
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy_value(entry[0])
+            self.misses += 1
+
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store the result of a query, evicting the least recently used results over the limits.
+
+        A result larger than max_bytes on its own is not stored.
+
+        Args:
+            key: Key of the query, from query_key
+            value: Result to store; a copy is kept
+        """
+        size = self._size(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        stored = copy_value(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (stored, size, time.monotonic())
+            self.bytes += size
+            while (self.max_entries is not None and len(self._entries) > self.max_entries) \
+                    or (self.max_bytes is not None and self.bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every result, keeping the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the counters and limits of the cache.
+
+        Returns:
+            Dict with hits, misses, evictions (results dropped for room), expirations
+            (results dropped for age), the hit rate, the current entries and bytes,
+            and the configured limits
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl
+            }
+
+
+def query_cache_from_env() -> QueryCache:
+    """
+    Build the query cache configured by the environment.
+
+    OPENREWRITE_DB_CACHE_MAX_ENTRIES sets the maximum number of results (256 by
+    default), OPENREWRITE_DB_CACHE_MAX_BYTES the maximum size of all results, and
+    OPENREWRITE_DB_CACHE_TTL the seconds a result stays valid. Setting any of them
+    to 0 removes that limit; the size and age are unlimited by default.
+
+    Returns:
+        Configured cache
+
+    Raises:
+        ValueError: If a variable is not a valid number, or is negative
+    """
+    def read(name: str, parse: Callable[[str], Any]) -> Optional[Any]:
+        value = os.environ.get(name, '').strip()
+        if not value:
+            return None
+        try:
+            return parse(value)
+        except ValueError as e:
+            raise ValueError(f"{name} must be a number, got {value!r}") from e
+
+    max_entries = read(CACHE_MAX_ENTRIES_ENV, int)
+    if max_entries is None:
+        max_entries = DEFAULT_MAX_ENTRIES
+    # 0 means no limit; None stands for it in QueryCache
+    return QueryCache(max_entries or None, read(CACHE_MAX_BYTES_ENV, int) or None, read(CACHE_TTL_ENV, float) or None)
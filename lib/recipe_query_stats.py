@@ -0,0 +1,142 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Dict, Optional, Any, Iterator, Tuple
+
+
+class QueryStats:
+    """
+    Measurements of one repository call: how it reached the records and what it cost.
+
+    Phases are timed exclusively: while a nested phase runs, the enclosing one is
+    paused, so the phase times add up to at most the wall time.
+    """
+
+    def __init__(self, method: str):
+        """
+        Initialize empty statistics.
+
+        Args:
+            method: Name of the repository method being measured
+        """
+        self.method = method
+        self.access_paths: List[str] = []
+        self.records_decoded = 0
+        self.records_examined = 0
+        self.bytes_read = 0
+        self.phases: Dict[str, float] = {}
+        self.wall_time = 0.0
+        # Running phases, innermost last, with the time each one was (re)started
+        self._running: List[Tuple[str, float]] = []
+
+    def _pause(self, now: float) -> None:
+        if self._running:
+            phase, started = self._running[-1]
+            self.phases[phase] = self.phases.get(phase, 0.0) + now - started
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the statistics as a JSON-serializable dictionary.
+
+        Returns:
+            Dict with the method, the access paths in the order they were used, the
+            record and byte counters, and the time of each phase and of the whole
+            call in milliseconds
+        """
+        return {
+            'method': self.method,
+            'access_paths': list(self.access_paths),
+            'records_decoded': self.records_decoded,
+            'records_examined': self.records_examined,
+            'bytes_read': self.bytes_read,
+            'phases_ms': {phase: round(seconds * 1000, 3) for phase, seconds in self.phases.items()},
+            'wall_time_ms': round(self.wall_time * 1000, 3)
+        }
+
+
+# Statistics of the call being explained in the current thread or task, if any
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar('recipe_query_stats', default=None)
+
+
+def current_stats() -> Optional[QueryStats]:
+    """
+    Get the statistics being collected, so hot loops only pay for counting when explaining.
+
+    Returns:
+        Statistics of the call being explained, or None
+    """
+    return _current_stats.get()
+
+
+def note_access(path: str) -> None:
+    """
+    Record an access path used by the call being explained, e.g. "stream" or "tag index".
+
+    Args:
+        path: Short description of how records or aggregates were reached
+    """
+    stats = _current_stats.get()
+    if stats is not None and path not in stats.access_paths:
+        stats.access_paths.append(path)
+
+
+def count(decoded: int = 0, examined: int = 0, bytes_read: int = 0) -> None:
+    """
+    Add to the counters of the call being explained.
+
+    Args:
+        decoded: Records parsed from JSON or read from a database
+        examined: Records tested against a query predicate
+        bytes_read: Bytes read from disk
+    """
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.records_decoded += decoded
+        stats.records_examined += examined
+        stats.bytes_read += bytes_read
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """
+    Time a phase of the call being explained; does nothing otherwise.
+
+    Args:
+        phase: Name of the phase, e.g. "load", "build", "scan" or "fetch"
+    """
+    stats = _current_stats.get()
+    if stats is None:
+        yield
+        return
+
+    stats._pause(time.perf_counter())
+    stats._running.append((phase, time.perf_counter()))
+    try:
+        yield
+    finally:
+        now = time.perf_counter()
+        stats._pause(now)
+        stats._running.pop()
+        if stats._running:
+            stats._running[-1] = (stats._running[-1][0], now)
+
+
+@contextmanager
+def collect_stats(method: str) -> Iterator[QueryStats]:
+    """
+    Collect the statistics of the repository calls made in the block.
+
+    Args:
+        method: Name of the repository method being measured
+
+    Yields:
+        Statistics filled in as the block runs
+    """
+    stats = QueryStats(method)
+    token = _current_stats.set(stats)
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats.wall_time = time.perf_counter() - start
+        _current_stats.reset(token)
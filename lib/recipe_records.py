@@ -0,0 +1,221 @@
+from typing import Dict, Optional, Any, FrozenSet, Iterator, List, Mapping, Sequence, Tuple
+
+
+# Fields whose value usually embeds other fields of the same record, e.g.
+# "mvn ... -Drewrite.recipeArtifactCoordinates=<dependency> -Drewrite.activeRecipes=<package> ...".
+# They are stored as a format template, which is the same string for every record
+# built the same way and is therefore kept only once.
+TEMPLATE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    'mvn-command-line': ('dependency', 'package'),
+}
+
+
+def _escape(value: str) -> str:
+    if '{' not in value and '}' not in value:
+        return value
+    return value.replace('{', '{{').replace('}', '}}')
+
+
+def make_template(value: Any, fields: Mapping[str, Any]) -> Optional[str]:
+    """
+    Turn a string into a format template referencing other fields of its record.
+
+    Args:
+        value: Value of the templated field
+        fields: Values of the fields it may embed, by name
+
+    Returns:
+        Template that format_map(fields) turns back into the value, or None if the
+        value does not embed any of the fields
+    """
+    if not isinstance(value, str):
+        return None
+
+    escaped = _escape(value)
+    template = escaped
+    for name, field_value in fields.items():
+        if isinstance(field_value, str) and field_value:
+            template = template.replace(_escape(field_value), '{' + name + '}')
+
+    try:
+        if template != escaped and template.format_map(fields) == value:
+            return template
+    except (KeyError, ValueError, IndexError, AttributeError):
+        pass
+    return None
+
+
+class RecordLayout:
+    """
+    Field names shared by a group of records, in record order.
+    """
+
+    __slots__ = ('keys', 'positions', 'templated')
+
+    def __init__(self, keys: Tuple[str, ...], templated: FrozenSet[int] = frozenset()):
+        """
+        Initialize the layout.
+
+        Args:
+            keys: Field names in record order
+            templated: Positions of the fields holding a template instead of their value
+        """
+        self.keys = keys
+        self.positions = {key: position for position, key in enumerate(keys)}
+        self.templated = templated
+
+
+class CompactRecipe:
+    """
+    Read-only recipe record of a snapshot.
+
+    Field names live in a layout shared with the other records of the same shape,
+    and values are stored in a tuple whose repeated strings and tag lists are shared
+    across records, so a record costs a fraction of the equivalent dict. It supports
+    the read-only dict interface used by the queries; to_dict() converts it at the
+    API boundary.
+    """
+
+    __slots__ = ('layout', 'raw_values')
+
+    def __init__(self, layout: RecordLayout, raw_values: Tuple[Any, ...]):
+        """
+        Initialize the record.
+
+        Args:
+            layout: Layout of the record
+            raw_values: Field values in layout order, with templated fields holding
+                their template
+        """
+        self.layout = layout
+        self.raw_values = raw_values
+
+    def _value(self, position: int) -> Any:
+        value = self.raw_values[position]
+        if position in self.layout.templated:
+            return value.format_map(self)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        position = self.layout.positions.get(key)
+        if position is None:
+            return default
+        return self._value(position)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._value(self.layout.positions[key])
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.layout.positions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.layout.keys)
+
+    def __len__(self) -> int:
+        return len(self.layout.keys)
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.layout.keys
+
+    def values(self) -> List[Any]:
+        return [self._value(position) for position in range(len(self.layout.keys))]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return list(zip(self.layout.keys, self.values()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the record to a plain recipe dictionary.
+
+        Returns:
+            New dictionary with the fields of the record; nested values are shared
+        """
+        return dict(self.items())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CompactRecipe):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"CompactRecipe({self.to_dict()!r})"
+
+
+class RecordCompactor:
+    """
+    Converts recipe dictionaries to compact records, sharing equal strings, tag lists
+    and layouts between all the records it converts.
+    """
+
+    def __init__(self):
+        self._strings: Dict[str, str] = {}
+        self._string_lists: Dict[Tuple[str, ...], List[str]] = {}
+        self._layouts: Dict[Tuple[Tuple[str, ...], FrozenSet[int]], RecordLayout] = {}
+
+    def layout(self, keys: Sequence[str], templated: FrozenSet[int] = frozenset()) -> RecordLayout:
+        """
+        Get the shared layout for a set of field names.
+
+        Args:
+            keys: Field names in record order
+            templated: Positions of the templated fields
+
+        Returns:
+            Layout object shared by every record with the same fields
+        """
+        key = (tuple(keys), templated)
+        layout = self._layouts.get(key)
+        if layout is None:
+            layout = self._layouts[key] = RecordLayout(tuple(self.value(name) for name in keys), templated)
+        return layout
+
+    def value(self, value: Any) -> Any:
+        """
+        Get the shared copy of a decoded JSON value.
+
+        Args:
+            value: Value of a record field
+
+        Returns:
+            An equal value, shared with earlier equal strings and lists of strings
+        """
+        if isinstance(value, str):
+            return self._strings.setdefault(value, value)
+        if isinstance(value, list):
+            items = [self.value(item) for item in value]
+            # Only lists of strings are shared: [1] and [True] compare equal
+            if all(isinstance(item, str) for item in items):
+                return self._string_lists.setdefault(tuple(items), items)
+            return items
+        if isinstance(value, dict):
+            return {self.value(key): self.value(item) for key, item in value.items()}
+        return value
+
+    def compact(self, recipe: Mapping[str, Any]) -> CompactRecipe:
+        """
+        Convert a recipe to a compact record.
+
+        Args:
+            recipe: Recipe dictionary, or a record to copy into this compactor's pools
+
+        Returns:
+            Compact record equal to the recipe
+        """
+        keys = list(recipe.keys())
+        strings = self._strings
+        # Most values are strings: share them inline and leave the rest to value()
+        values = [strings.setdefault(value, value) if isinstance(value, str) else self.value(value)
+                  for value in recipe.values()]
+
+        templated = []
+        for field, sources in TEMPLATE_FIELDS.items():
+            if field in recipe:
+                position = keys.index(field)
+                template = make_template(values[position], {source: recipe.get(source) for source in sources})
+                if template is not None:
+                    values[position] = self.value(template)
+                    templated.append(position)
+
+        return CompactRecipe(self.layout(keys, frozenset(templated)), tuple(values))
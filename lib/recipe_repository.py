@@ -1,11 +1,25 @@
 import json
 import os
 import hashlib
-import tempfile
-from typing import List, Dict, Optional, Any, Iterator
+import threading
+from typing import List, Dict, Optional, Any, AbstractSet, Callable, Iterator, Mapping, Sequence, Tuple, Union
 import ijson
 import requests
 from jsonpath_ng import parse as jsonpath_parse
+from lib.recipe_snapshot import RecipeSnapshot, DatasetFingerprint, copy_recipe, dataset_fingerprint, iter_recipes, \
+    project_recipe, read_sha256, recipe_fields
+from lib.recipe_snapshot_file import generate_snapshot_file, load_snapshot_file, snapshot_file_path, write_snapshot_file
+from lib.recipe_id_index import IdOffsets, build_id_index, id_index_path, load_id_index, read_record, read_records
+from lib.recipe_json_backend import json_backend, json_backend_name
+from lib.recipe_watcher import DatasetWatcher
+from lib.recipe_generations import GENERATION_GRACE_PERIOD, collect_generations, dataset_path, publish_generation
+from lib.recipe_query_stats import collect_stats, count, current_stats, note_access, timed
+from lib.recipe_pages import PageRequest, RecipePage, dataset_version, is_paginated, make_page, page_request, \
+    scan_page, slice_positions
+from lib.recipe_text_index import SEARCH_FIELDS, TextIndex
+from lib.recipe_filters import BatchQuery, RecipeFilter, batch_query, filter_keys, recipe_filters
+from lib.recipe_indexes import COMPLETION_FIELDS, CategoryTree, CompletionIndex, FuzzyIndex, build_category_counts, field_key, intersect_postings, \
+    normalize_key
 
 
 class RecipeRepository:
@@ -13,36 +27,516 @@ class RecipeRepository:
     Repository for querying OpenRewrite recipes stored in JSON format using JSONPath.
     """
 
-    def __init__(self, json_file_path: str):
+    def __init__(self, json_file_path: str, resident: bool = False):
         """
         Initialize the repository with a path to the JSON file containing the recipes.
 
         Args:
             json_file_path: Path to the JSON file containing the recipes
+            resident: Keep a parsed snapshot of the dataset in memory instead of
+                re-reading the file on every query. The snapshot is reloaded when
+                the JSON file or its .sha256 file changes.
+
+        Raises:
+            ValueError: If json_file_path is empty, or the JSON backend configured
+                through OPENREWRITE_DB_JSON_BACKEND is unknown or not installed
         """
         if not json_file_path or not isinstance(json_file_path, str):
             raise ValueError("json_file_path must be a non-empty string")
+        # Select the parser now, so a misconfigured backend fails here instead of
+        # looking like an empty dataset
+        json_backend()
 
         self.json_file_path = json_file_path
+        self.resident = resident
+        self._snapshot: Optional[RecipeSnapshot] = None
+        self._snapshot_lock = threading.Lock()
+        self._id_offsets: Optional[Tuple[DatasetFingerprint, str, Optional[IdOffsets]]] = None
+        self._category_tree: Optional[Tuple[DatasetFingerprint, CategoryTree]] = None
+        self._text_index: Optional[Tuple[DatasetFingerprint, TextIndex]] = None
+        self._fuzzy_name_index: Optional[Tuple[DatasetFingerprint, FuzzyIndex]] = None
+        self._completion_index: Optional[Tuple[DatasetFingerprint, CompletionIndex]] = None
+        self._watcher: Optional[DatasetWatcher] = None
+
+    @property
+    def json_backend(self) -> str:
+        """Name of the ijson backend parsing the JSON file, e.g. "yajl2_c" or "python"."""
+        return json_backend_name()
+
+    def dataset_sha256(self) -> Optional[str]:
+        """
+        Get the SHA-256 of the dataset version queries are answered from.
+
+        Returns:
+            Hash from recipes.json.sha256, as loaded with the snapshot in resident
+            mode, or None when the dataset has no hash file
+        """
+        if self.resident:
+            return self._current_snapshot().sha256
+        return read_sha256(dataset_path(self.json_file_path))
+
+    def dataset_version(self) -> str:
+        """
+        Get the token of the dataset version queries are answered from.
+
+        Cursors and cached results are bound to this token. It is derived from the
+        hash in recipes.json.sha256 when there is one, so republishing identical
+        content keeps it, and from the stat fingerprint of the files otherwise.
+
+        Returns:
+            Short hex token
+        """
+        if self.resident:
+            snapshot = self._current_snapshot()
+            return dataset_version(snapshot.sha256 or snapshot.fingerprint)
+        return dataset_version(self.dataset_sha256() or dataset_fingerprint(self.json_file_path))
+
+    def explain(self, method: str, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        """
+        Run a query and report how it was answered.
+
+        Args:
+            method: Name of a query method, e.g. "get_recipes_by_tag"
+            *args: Positional arguments of the query
+            **kwargs: Keyword arguments of the query
+
+        Returns:
+            Dict with the query 'result' and its 'plan': the access paths used (e.g.
+            "stream", "snapshot", "tag index", "cached category tree"), the number
+            of records decoded and examined, the bytes read and the time spent in
+            each phase (load, build, scan, fetch, query) and overall, in milliseconds
+
+        Raises:
+            ValueError: If method is not a query method of the repository
+        """
+        query = getattr(self, method, None) if isinstance(method, str) else None
+        if query is None or not callable(query) or not (method == 'complete' or
+                                                        method.startswith(('get_', 'find_', 'search_', 'run_'))):
+            raise ValueError(f"Not a query method: {method!r}")
+
+        with collect_stats(method) as stats:
+            result = query(*args, **kwargs)
+        return {'result': result, 'plan': stats.to_dict()}
 
-    def _stream_recipes(self) -> Iterator[Dict[str, Any]]:
+    def _stream_recipes(self, keys: Optional[AbstractSet[str]] = None,
+                        path: Optional[str] = None) -> Iterator[Dict[str, Any]]:
         """
         Stream recipes from the JSON file one by one.
 
+        Args:
+            keys: Keys the caller reads, so the parser may skip the other values
+            path: File to read, e.g. as resolved by dataset_path; the repository file when None
+
         Yields:
             Recipe dictionaries from the JSON file
         """
+        path = path or self.json_file_path
         try:
-            if not os.path.exists(self.json_file_path):
+            if not os.path.exists(path):
                 return
 
-            with open(self.json_file_path, 'rb') as f:
-                for item in ijson.items(f, 'item'):
-                    if isinstance(item, dict):
-                        yield item
+            note_access('stream')
+            with open(path, 'rb') as f:
+                stats = current_stats()
+                if stats is None:
+                    yield from iter_recipes(f, keys)
+                    return
+
+                try:
+                    for recipe in iter_recipes(f, keys):
+                        stats.records_decoded += 1
+                        yield recipe
+                finally:
+                    stats.bytes_read += f.tell()
         except (ijson.IncompleteJSONError, IOError, Exception):
             return
 
+    def _current_snapshot(self) -> RecipeSnapshot:
+        """
+        Get the resident snapshot, loading it again if the dataset changed on disk.
+
+        Returns:
+            Snapshot matching the current version of the dataset
+        """
+        snapshot = self._snapshot
+        note_access('snapshot')
+        if snapshot is not None and self._watcher is not None and self._watcher.running:
+            # The watcher swaps in new versions of the dataset, so queries never wait for a reload
+            return snapshot
+
+        fingerprint = dataset_fingerprint(self.json_file_path)
+        if snapshot is not None and snapshot.is_current(fingerprint):
+            return snapshot
+
+        with self._snapshot_lock, timed('load'):
+            snapshot = self._snapshot
+            if snapshot is None or not snapshot.is_current(fingerprint):
+                # The fingerprint is taken before reading, so a file replaced while
+                # loading is picked up by the next query
+                snapshot = self._load_snapshot(fingerprint)
+                self._snapshot = snapshot
+
+        return snapshot
+
+    def watch(self, interval: float = 1.0) -> DatasetWatcher:
+        """
+        Reload the resident snapshot in a background thread when the dataset changes on disk.
+
+        The watcher polls the fingerprint of recipes.json and its .sha256 file. When
+        it changes, the watcher loads the new snapshot and builds all its indexes,
+        then publishes it with a single reference swap. Until then queries keep
+        answering from the previous snapshot without checking the files, and
+        queries already running finish on the snapshot they started with.
+
+        Args:
+            interval: Seconds between two polls
+
+        Returns:
+            The running watcher; stop() returns the repository to checking the
+            files on every query
+
+        Raises:
+            ValueError: If the repository is not resident or interval is not a
+                positive number
+        """
+        if not self.resident:
+            raise ValueError("Only resident repositories can be watched")
+        if self._watcher is not None and self._watcher.running:
+            return self._watcher
+
+        watcher = DatasetWatcher(self._refresh_snapshot, interval)
+        self._refresh_snapshot()
+        self._watcher = watcher.start()
+        return watcher
+
+    def _refresh_snapshot(self) -> bool:
+        """
+        Load and index a new snapshot if the dataset changed on disk, then publish it.
+
+        Returns:
+            True if a new snapshot was published
+        """
+        fingerprint = dataset_fingerprint(self.json_file_path)
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.is_current(fingerprint):
+            return False
+
+        with self._snapshot_lock:
+            snapshot = self._load_snapshot(fingerprint)
+            snapshot.build_indexes()
+            # A single reference assignment publishes the new generation
+            self._snapshot = snapshot
+        return True
+
+    def _load_snapshot(self, fingerprint: DatasetFingerprint) -> RecipeSnapshot:
+        """
+        Load a snapshot of the dataset, preferring its binary snapshot file.
+
+        When the binary snapshot is missing or was generated from another version
+        of recipes.json, the JSON file is parsed instead and the binary snapshot is
+        written for the next cold start.
+
+        Args:
+            fingerprint: Fingerprint of the dataset taken before loading
+
+        Returns:
+            Snapshot of the current dataset
+        """
+        # Every file is read from the same generation of the database directory
+        path = dataset_path(self.json_file_path)
+        expected_sha256 = read_sha256(path)
+        snapshot = load_snapshot_file(path, expected_sha256, fingerprint)
+        if snapshot is not None:
+            note_access('snapshot file')
+        else:
+            snapshot = RecipeSnapshot(self._stream_recipes(path=path), fingerprint, expected_sha256)
+            if expected_sha256:
+                write_snapshot_file(path, snapshot)
+
+        return snapshot
+
+    def _current_id_offsets(self) -> Tuple[str, Optional[IdOffsets]]:
+        """
+        Get the byte-offset id index of the dataset, loading or building its sidecar file.
+
+        Returns:
+            Resolved path of the JSON file the offsets refer to, which records must be
+            read from even if a new generation is published meanwhile, and the mapping
+            of recipe id to the (offset, length) of its record, or None when the
+            dataset has no .sha256 file to validate an index against
+        """
+        fingerprint = dataset_fingerprint(self.json_file_path)
+        cached = self._id_offsets
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1], cached[2]
+
+        path = dataset_path(self.json_file_path)
+        expected_sha256 = read_sha256(path)
+        with timed('load'):
+            offsets = load_id_index(path, expected_sha256)
+            if offsets is None:
+                offsets = build_id_index(path, expected_sha256)
+
+        self._id_offsets = (fingerprint, path, offsets)
+        return path, offsets
+
+    def _current_category_tree(self) -> CategoryTree:
+        """
+        Get the category tree of the dataset, building it once per dataset version.
+
+        Returns:
+            Sorted categories and sub-categories with their recipe counts
+        """
+        if self.resident:
+            snapshot = self._current_snapshot()
+            note_access('category tree')
+            return snapshot.category_tree
+
+        fingerprint = dataset_fingerprint(self.json_file_path)
+        cached = self._category_tree
+        if cached is not None and cached[0] == fingerprint:
+            note_access('cached category tree')
+            return cached[1]
+
+        with timed('build'):
+            tree = CategoryTree.from_counts(build_category_counts(self._stream_recipes()))
+        self._category_tree = (fingerprint, tree)
+        return tree
+
+    def _current_text_index(self) -> TextIndex:
+        """
+        Get the BM25 text index of the dataset, building it once per dataset version.
+
+        Returns:
+            Index over the names, descriptions and packages of the recipes
+        """
+        if self.resident:
+            snapshot = self._current_snapshot()
+            note_access('text index')
+            return snapshot.text_index
+
+        fingerprint = dataset_fingerprint(self.json_file_path)
+        cached = self._text_index
+        if cached is not None and cached[0] == fingerprint:
+            note_access('cached text index')
+            return cached[1]
+
+        with timed('build'):
+            index = TextIndex.build(self._stream_recipes(frozenset(field for field, _ in SEARCH_FIELDS)))
+        self._text_index = (fingerprint, index)
+        return index
+
+    def _current_fuzzy_name_index(self) -> FuzzyIndex:
+        """
+        Get the edit-distance index of the recipe names, building it once per dataset version.
+
+        Returns:
+            Trie over the name keys of the recipes
+        """
+        if self.resident:
+            snapshot = self._current_snapshot()
+            note_access('fuzzy name index')
+            return snapshot.fuzzy_name_index
+
+        fingerprint = dataset_fingerprint(self.json_file_path)
+        cached = self._fuzzy_name_index
+        if cached is not None and cached[0] == fingerprint:
+            note_access('cached fuzzy name index')
+            return cached[1]
+
+        with timed('build'):
+            index = FuzzyIndex([field_key(recipe, 'name', '') for recipe in self._stream_recipes(frozenset(('name',)))])
+        self._fuzzy_name_index = (fingerprint, index)
+        return index
+
+    def _current_completion_index(self) -> CompletionIndex:
+        """
+        Get the prefix index of the recipe names and packages, building it once per dataset version.
+
+        Returns:
+            Sorted array of the name and package keys of the recipes
+        """
+        if self.resident:
+            snapshot = self._current_snapshot()
+            note_access('completion index')
+            return snapshot.completion_index
+
+        fingerprint = dataset_fingerprint(self.json_file_path)
+        cached = self._completion_index
+        if cached is not None and cached[0] == fingerprint:
+            note_access('cached completion index')
+            return cached[1]
+
+        with timed('build'):
+            index = CompletionIndex(self._stream_recipes(frozenset(COMPLETION_FIELDS)))
+        self._completion_index = (fingerprint, index)
+        return index
+
+    def _recipes(self, keys: Optional[AbstractSet[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the recipes, from the resident snapshot when enabled.
+
+        Records coming from the snapshot are shared and must go through
+        _export before being handed to callers.
+
+        Args:
+            keys: Keys the caller reads, or None for all of them; streamed recipes
+                may then lack the other keys
+
+        Yields:
+            Recipe dictionaries in file order
+        """
+        if self.resident:
+            return iter(self._current_snapshot().records)
+        return self._stream_recipes(keys)
+
+    @staticmethod
+    def _read_keys(fields: Optional[Tuple[str, ...]], *query_keys: str) -> Optional[AbstractSet[str]]:
+        """
+        Get the keys a query has to read: the ones it filters on plus the projected fields.
+
+        Returns:
+            Set of keys, or None when the whole recipes are returned
+        """
+        return None if fields is None else frozenset(fields).union(query_keys)
+
+    def _export(self, recipe: Dict[str, Any], fields: Optional[Tuple[str, ...]] = None) -> Dict[str, Any]:
+        """
+        Prepare a recipe to be returned to a caller.
+
+        Args:
+            recipe: Recipe dictionary produced by _recipes
+            fields: Keys to return, as validated by recipe_fields, or None for all keys
+
+        Returns:
+            The recipe itself when streaming, or a private copy of the snapshot record,
+            reduced to the requested fields
+        """
+        if fields is not None:
+            return project_recipe(recipe, fields, copy=self.resident)
+        return copy_recipe(recipe) if self.resident else recipe
+
+    def _page_request(self, limit: Optional[int], offset: Optional[int],
+                      cursor: Optional[str]) -> Optional[PageRequest]:
+        """
+        Resolve the pagination arguments of a query against the current dataset.
+
+        Returns:
+            The page to return, or None when the query is not paginated
+
+        Raises:
+            ValueError: If the arguments are invalid or the cursor is stale
+        """
+        if not is_paginated(limit, offset, cursor):
+            return None
+
+        return page_request(limit, offset, cursor, self.dataset_version())
+
+    def _scan(self, predicate: Callable[[Mapping[str, Any]], bool],
+              keys: Optional[AbstractSet[str]] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Stream the recipes matching a predicate.
+
+        Args:
+            predicate: Test applied to each recipe
+            keys: Keys read by the predicate and the caller, or None for all of them
+
+        Yields:
+            (position, recipe) pairs in file order
+        """
+        recipes = enumerate(self._recipes(keys))
+        stats = current_stats()
+        if stats is None:
+            return ((position, recipe) for position, recipe in recipes if predicate(recipe))
+
+        def counted(recipe: Mapping[str, Any]) -> bool:
+            stats.records_examined += 1
+            return predicate(recipe)
+
+        return ((position, recipe) for position, recipe in recipes if counted(recipe))
+
+    def _scanned_results(self, matches: Iterator[Tuple[int, Dict[str, Any]]], page: Optional[PageRequest],
+                         fields: Optional[Tuple[str, ...]]) -> Union[List[Dict[str, Any]], RecipePage]:
+        """
+        Collect the results of a streaming query.
+
+        A paginated scan stops at the first match past the page, so its total is
+        not known and reported as None.
+        """
+        with timed('scan'):
+            if page is None:
+                return [self._export(recipe, fields) for _, recipe in matches]
+
+            selected, has_more = scan_page(matches, page)
+            return make_page([self._export(recipe, fields) for _, recipe in selected], None,
+                             selected[-1][0] if selected else None, has_more, page)
+
+    def _indexed_results(self, snapshot: RecipeSnapshot, positions: Sequence[int], page: Optional[PageRequest],
+                         fields: Optional[Tuple[str, ...]]) -> Union[List[Dict[str, Any]], RecipePage]:
+        """
+        Collect the results of a query answered by a snapshot index.
+
+        Only the records on the page are copied.
+        """
+        records = snapshot.records
+        with timed('fetch'):
+            if page is None:
+                return [self._export(records[position], fields) for position in positions]
+
+            selected, has_more = slice_positions(positions, page)
+            return make_page([self._export(records[position], fields) for position in selected], len(positions),
+                             selected[-1] if selected else None, has_more, page)
+
+    def _records_in_order(self, positions: Sequence[int],
+                          fields: Optional[Tuple[str, ...]]) -> List[Dict[str, Any]]:
+        """
+        Read the records at the given positions of a ranked query, in the given order.
+
+        Args:
+            positions: Distinct record positions, in result order
+            fields: Keys to return, as validated by recipe_fields, or None for all keys
+
+        Returns:
+            Exported recipes, in the order of the positions
+        """
+        if self.resident:
+            records = self._current_snapshot().records
+            with timed('fetch'):
+                return [self._export(records[position], fields) for position in positions]
+
+        # Indexes only hold positions, so the records are read back with one scan
+        # that stops after the last of them
+        wanted = set(positions)
+        found = {}
+        last = max(positions, default=-1)
+        with timed('fetch'):
+            for position, recipe in enumerate(self._stream_recipes(self._read_keys(fields))):
+                if position > last:
+                    break
+                if position in wanted:
+                    found[position] = self._export(recipe, fields)
+
+        return [found[position] for position in positions if position in found]
+
+    def _ranked_results(self, positions: Sequence[int], page: Optional[PageRequest],
+                        fields: Optional[Tuple[str, ...]]) -> Union[List[Dict[str, Any]], RecipePage]:
+        """
+        Collect the results of a query whose matches are ranked rather than in file order.
+
+        Cursors of ranked results hold the rank of the last recipe on the page
+        instead of its position in the file.
+        """
+        if page is None:
+            return self._records_in_order(positions, fields)
+
+        ranks, has_more = slice_positions(range(len(positions)), page)
+        return make_page(self._records_in_order([positions[rank] for rank in ranks], fields), len(positions),
+                         ranks[-1] if ranks else None, has_more, page)
+
+    @staticmethod
+    def _no_results(page: Optional[PageRequest]) -> Union[List[Dict[str, Any]], RecipePage]:
+        return [] if page is None else make_page([], 0, None, False, page)
+
     def get_all_categories(self) -> List[str]:
         """
         Get all unique categories from the recipes.
@@ -50,13 +544,7 @@ class RecipeRepository:
         Returns:
             List of unique category names, sorted alphabetically
         """
-        categories = set()
-        for recipe in self._stream_recipes():
-            category = recipe.get('category')
-            if category and isinstance(category, str):
-                categories.add(category.lower())
-
-        return sorted(list(categories))
+        return list(self._current_category_tree().categories)
 
     def get_categories_with_subcategories(self) -> List[Dict[str, Any]]:
         """
@@ -65,30 +553,18 @@ class RecipeRepository:
         Returns:
             List of dicts with 'category' and 'sub-categories' keys
         """
-        category_map = {}
-
-        for recipe in self._stream_recipes():
-            category_val = recipe.get('category')
-            category = category_val.lower() if isinstance(category_val, str) else None
-            subcategory_val = recipe.get('sub-category')
-            subcategory = subcategory_val.lower() if isinstance(subcategory_val, str) else None
-
-            if category:
-                if category not in category_map:
-                    category_map[category] = set()
-
-                if subcategory:
-                    category_map[category].add(subcategory)
+        return self._current_category_tree().with_subcategories()
 
-        result = []
-        for category in sorted(category_map.keys()):
-            subcategories = sorted(list(category_map[category]))
-            result.append({
-                'category': category,
-                'sub-categories': subcategories
-            })
+    def get_category_tree(self) -> List[Dict[str, Any]]:
+        """
+        Get all categories and subcategories with the number of recipes in each one.
 
-        return result
+        Returns:
+            List of dicts with 'category', 'count' and 'sub-categories' keys, sorted
+            alphabetically by category; 'sub-categories' holds dicts with
+            'sub-category' and 'count' keys, sorted alphabetically
+        """
+        return self._current_category_tree().with_counts()
 
     def get_subcategories_by_category(self, category: str) -> List[str]:
         """
@@ -103,150 +579,751 @@ class RecipeRepository:
         if not category or not isinstance(category, str):
             return []
 
-        category_lower = category.lower()
-        subcategories = set()
-
-        for recipe in self._stream_recipes():
-            category_val = recipe.get('category')
-            if isinstance(category_val, str) and category_val.lower() == category_lower:
-                subcategory_val = recipe.get('sub-category')
-                if isinstance(subcategory_val, str):
-                    subcategories.add(subcategory_val.lower())
-
-        return sorted(list(subcategories))
+        return self._current_category_tree().subcategories(normalize_key(category))
 
-    def get_recipes_by_category(self, category: str, subcategory: Optional[str] = None) -> List[Dict[str, Any]]:
+    def get_recipes_by_category(self, category: str, subcategory: Optional[str] = None,
+                                limit: Optional[int] = None, offset: int = 0,
+                                cursor: Optional[str] = None,
+                                fields: Optional[Sequence[str]] = None) -> Union[List[Dict[str, Any]], RecipePage]:
         """
         Get recipes by category and optional subcategory.
 
         Args:
             category: The category name to filter by
             subcategory: Optional subcategory name to further filter
+            limit: Maximum number of recipes to return
+            offset: Number of matching recipes to skip
+            cursor: next_cursor of the previous page, instead of offset
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
 
         Returns:
-            List of recipe dictionaries matching the criteria
+            List of recipe dictionaries matching the criteria, or a page dict with
+            'recipes', 'total' and 'next_cursor' keys when limit, offset or cursor is given
+
+        Raises:
+            ValueError: If the pagination arguments or the fields are invalid
         """
+        fields = recipe_fields(fields)
+        page = self._page_request(limit, offset, cursor)
         if not category or not isinstance(category, str):
-            return []
-
-        category_lower = category.lower()
-        subcategory_lower = subcategory.lower() if subcategory and isinstance(subcategory, str) else None
-
-        results = []
-        for recipe in self._stream_recipes():
-            category_val = recipe.get('category')
-            if isinstance(category_val, str) and category_val.lower() == category_lower:
-                if subcategory_lower is None:
-                    results.append(recipe)
-                else:
-                    subcategory_val = recipe.get('sub-category')
-                    if isinstance(subcategory_val, str) and subcategory_val.lower() == subcategory_lower:
-                        results.append(recipe)
-
-        return results
-
-    def get_recipes_by_tag(self, tag: str) -> List[Dict[str, Any]]:
+            return self._no_results(page)
+
+        category_key = normalize_key(category)
+        subcategory_key = normalize_key(subcategory) if subcategory and isinstance(subcategory, str) else None
+
+        if self.resident:
+            snapshot = self._current_snapshot()
+            note_access('category index')
+            if subcategory_key is None:
+                positions = snapshot.category_positions.get(category_key, [])
+            else:
+                positions = snapshot.category_index.get(category_key, {}).get(subcategory_key, [])
+            return self._indexed_results(snapshot, positions, page, fields)
+
+        return self._scanned_results(self._scan(
+            lambda recipe: field_key(recipe, 'category') == category_key
+            and (subcategory_key is None or field_key(recipe, 'sub-category') == subcategory_key),
+            self._read_keys(fields, 'category', 'sub-category')), page, fields)
+
+    def get_recipes_by_tag(self, tag: str, limit: Optional[int] = None, offset: int = 0,
+                           cursor: Optional[str] = None,
+                           fields: Optional[Sequence[str]] = None) -> Union[List[Dict[str, Any]], RecipePage]:
         """
         Get recipes that contain a specific tag.
 
         Args:
             tag: The tag to search for
+            limit: Maximum number of recipes to return
+            offset: Number of matching recipes to skip
+            cursor: next_cursor of the previous page, instead of offset
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
 
         Returns:
-            List of recipe dictionaries containing the tag
+            List of recipe dictionaries containing the tag, or a page dict with
+            'recipes', 'total' and 'next_cursor' keys when limit, offset or cursor is given
+
+        Raises:
+            ValueError: If the pagination arguments or the fields are invalid
         """
+        fields = recipe_fields(fields)
+        page = self._page_request(limit, offset, cursor)
         if not tag or not isinstance(tag, str):
-            return []
+            return self._no_results(page)
+
+        tag_key = normalize_key(tag)
+
+        if self.resident:
+            snapshot = self._current_snapshot()
+            note_access('tag index')
+            return self._indexed_results(snapshot, snapshot.tag_index.get(tag_key, []), page, fields)
+
+        def has_tag(recipe: Mapping[str, Any]) -> bool:
+            tags = recipe.get('tags', [])
+            return isinstance(tags, list) and any(
+                isinstance(recipe_tag, str) and normalize_key(recipe_tag) == tag_key for recipe_tag in tags)
+
+        return self._scanned_results(self._scan(has_tag, self._read_keys(fields, 'tags')), page, fields)
+
+    def get_all_tags(self) -> List[Dict[str, Any]]:
+        """
+        Get all unique tags with the number of recipes carrying each one.
 
-        tag_lower = tag.lower()
-        results = []
+        Returns:
+            List of dicts with 'tag' and 'count' keys, sorted alphabetically by tag
+        """
+        if self.resident:
+            tag_index = self._current_snapshot().tag_index
+            note_access('tag index')
+            return [{'tag': tag, 'count': len(tag_index[tag])} for tag in sorted(tag_index) if tag]
 
-        for recipe in self._stream_recipes():
+        tag_counts = {}
+        for recipe in self._recipes():
             tags = recipe.get('tags', [])
             if isinstance(tags, list):
-                for recipe_tag in tags:
-                    if isinstance(recipe_tag, str) and recipe_tag.lower() == tag_lower:
-                        results.append(recipe)
-                        break
+                for tag_key in {normalize_key(recipe_tag) for recipe_tag in tags if isinstance(recipe_tag, str)}:
+                    tag_counts[tag_key] = tag_counts.get(tag_key, 0) + 1
 
-        return results
+        return [{'tag': tag, 'count': tag_counts[tag]} for tag in sorted(tag_counts) if tag]
 
-    def get_recipes_by_name(self, name_query: str) -> List[Dict[str, Any]]:
+    def get_recipes_by_name(self, name_query: str, limit: Optional[int] = None, offset: int = 0,
+                            cursor: Optional[str] = None, fields: Optional[Sequence[str]] = None,
+                            max_distance: Optional[int] = None) -> Union[List[Dict[str, Any]], RecipePage]:
         """
         Get recipes by partial name match (case-insensitive).
 
+        With max_distance, the lookup is typo-tolerant instead: whole names are
+        compared to the query and the recipes whose name is within max_distance
+        inserted, deleted or substituted characters of it are returned, closest first.
+
         Args:
-            name_query: The partial name to search for
+            name_query: The partial name to search for, or the whole name with max_distance
+            limit: Maximum number of recipes to return
+            offset: Number of matching recipes to skip
+            cursor: next_cursor of the previous page, instead of offset
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
+            max_distance: Maximum edit distance between the query and a name, or None
+                for substring matching
 
         Returns:
-            List of recipe dictionaries with names containing the query
+            List of recipe dictionaries with names containing the query (or close to it),
+            or a page dict with 'recipes', 'total' and 'next_cursor' keys when limit,
+            offset or cursor is given
+
+        Raises:
+            ValueError: If the pagination arguments, the fields or max_distance are invalid
         """
+        fields = recipe_fields(fields)
+        if max_distance is not None and (not isinstance(max_distance, int) or isinstance(max_distance, bool)
+                                         or max_distance < 0):
+            raise ValueError("max_distance must be a non-negative integer")
+        page = self._page_request(limit, offset, cursor)
         if not name_query or not isinstance(name_query, str):
-            return []
+            return self._no_results(page)
 
-        query_lower = name_query.lower()
-        results = []
+        query_key = normalize_key(name_query)
 
-        for recipe in self._stream_recipes():
-            name = recipe.get('name', '')
-            if isinstance(name, str) and query_lower in name.lower():
-                results.append(recipe)
+        if max_distance is not None:
+            matches = self._current_fuzzy_name_index().search(query_key, max_distance)
+            return self._ranked_results([position for position, _ in matches], page, fields)
 
-        return results
+        if self.resident:
+            snapshot = self._current_snapshot()
+            note_access('name trigram index')
+            return self._indexed_results(snapshot, snapshot.name_index.search(query_key), page, fields)
 
-    def get_recipe_by_id(self, recipe_id: str) -> Dict[str, Any]:
+        def name_matches(recipe: Mapping[str, Any]) -> bool:
+            name_key = field_key(recipe, 'name', '')
+            return name_key is not None and query_key in name_key
+
+        return self._scanned_results(self._scan(name_matches, self._read_keys(fields, 'name')), page, fields)
+
+    def get_recipe_by_id(self, recipe_id: str, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
         """
         Get a single recipe by its ID.
 
         Args:
             recipe_id: The recipe ID to search for
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
 
         Returns:
             Recipe dictionary if found, empty dict if not found
+
+        Raises:
+            ValueError: If the fields are invalid
         """
+        fields = recipe_fields(fields)
         if not recipe_id or not isinstance(recipe_id, str):
             return {}
 
-        for recipe in self._stream_recipes():
+        if self.resident:
+            snapshot = self._current_snapshot()
+            note_access('id index')
+            position = snapshot.id_positions.get(recipe_id)
+            return self._export(snapshot.records[position], fields) if position is not None else {}
+
+        path, offsets = self._current_id_offsets()
+        if offsets is not None:
+            note_access('id offset index')
+            span = offsets.get(recipe_id)
+            if span is None:
+                return {}
+
+            recipe = read_record(path, *span)
+            count(decoded=1, bytes_read=span[1])
+            if recipe is not None and recipe.get('id') == recipe_id:
+                return self._export(recipe, fields)
+
+        for recipe in self._recipes(self._read_keys(fields, 'id')):
             if recipe.get('id') == recipe_id:
-                return recipe
+                return self._export(recipe, fields)
 
         return {}
 
-    def get_recipes_by_dependency(self, dependency: str) -> List[Dict[str, Any]]:
+    def _find_ids(self, recipe_ids: List[str], fields: Optional[Tuple[str, ...]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Find the recipes carrying the given ids.
+
+        Args:
+            recipe_ids: Distinct recipe ids
+            fields: Keys to return, as validated by recipe_fields, or None for all keys
+
+        Returns:
+            Mapping of each id found to its first recipe, exported
+        """
+        if self.resident:
+            snapshot = self._current_snapshot()
+            note_access('id index')
+            positions = snapshot.id_positions
+            with timed('fetch'):
+                return {recipe_id: self._export(snapshot.records[positions[recipe_id]], fields)
+                        for recipe_id in recipe_ids if recipe_id in positions}
+
+        found = {}
+        pending = set(recipe_ids)
+        path, offsets = self._current_id_offsets()
+        if offsets is not None:
+            note_access('id offset index')
+            spans = [(recipe_id, offsets[recipe_id]) for recipe_id in recipe_ids if recipe_id in offsets]
+            # Ids missing from a current index are in no record
+            pending = set()
+            with timed('fetch'):
+                records = read_records(path, [span for _, span in spans])
+            count(decoded=len(spans), bytes_read=sum(length for _, (_, length) in spans))
+            for (recipe_id, _), recipe in zip(spans, records):
+                if recipe is not None and recipe.get('id') == recipe_id:
+                    found[recipe_id] = self._export(recipe, fields)
+                else:
+                    pending.add(recipe_id)
+
+        if pending:
+            # One pass finds every id left, stopping once all of them were seen
+            examined = 0
+            with timed('scan'):
+                for recipe in self._recipes(self._read_keys(fields, 'id')):
+                    examined += 1
+                    recipe_id = recipe.get('id')
+                    if isinstance(recipe_id, str) and recipe_id in pending:
+                        found[recipe_id] = self._export(recipe, fields)
+                        pending.discard(recipe_id)
+                        if not pending:
+                            break
+            count(examined=examined)
+
+        return found
+
+    def get_recipes_by_ids(self, recipe_ids: Sequence[str],
+                           fields: Optional[Sequence[str]] = None) -> Dict[str, List[Any]]:
+        """
+        Get several recipes by their IDs at once.
+
+        Resident repositories look the ids up in the snapshot, streaming ones read
+        each record at its offset from the id index sidecar, or find them all in a
+        single pass over the file when there is no index.
+
+        Args:
+            recipe_ids: Recipe IDs to look up
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
+
+        Returns:
+            Dict with 'recipes', the recipes found in the order of their first ID in
+            recipe_ids, and 'missing', the IDs matching no recipe, in the same order
+
+        Raises:
+            ValueError: If recipe_ids is not a list of strings or the fields are invalid
+        """
+        fields = recipe_fields(fields)
+        if isinstance(recipe_ids, str) or not isinstance(recipe_ids, (list, tuple)) \
+                or not all(isinstance(recipe_id, str) for recipe_id in recipe_ids):
+            raise ValueError("recipe_ids must be a list of recipe ids")
+
+        wanted = list(dict.fromkeys(recipe_ids))
+        found = self._find_ids(wanted, fields)
+        return {
+            'recipes': [found[recipe_id] for recipe_id in wanted if recipe_id in found],
+            'missing': [recipe_id for recipe_id in wanted if recipe_id not in found]
+        }
+
+    def get_recipes_by_dependency(self, dependency: str, limit: Optional[int] = None, offset: int = 0,
+                                  cursor: Optional[str] = None,
+                                  fields: Optional[Sequence[str]] = None) -> Union[List[Dict[str, Any]], RecipePage]:
         """
         Get recipes by dependency (partial match, case-insensitive).
 
         Args:
             dependency: The dependency string to search for
+            limit: Maximum number of recipes to return
+            offset: Number of matching recipes to skip
+            cursor: next_cursor of the previous page, instead of offset
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
 
         Returns:
-            List of recipe dictionaries with matching dependencies
+            List of recipe dictionaries with matching dependencies, or a page dict with
+            'recipes', 'total' and 'next_cursor' keys when limit, offset or cursor is given
+
+        Raises:
+            ValueError: If the pagination arguments or the fields are invalid
         """
+        fields = recipe_fields(fields)
+        page = self._page_request(limit, offset, cursor)
         if not dependency or not isinstance(dependency, str):
+            return self._no_results(page)
+
+        dependency_key = normalize_key(dependency)
+
+        if self.resident:
+            snapshot = self._current_snapshot()
+            note_access('dependency vocabulary index')
+            return self._indexed_results(snapshot, snapshot.dependency_index.search(dependency_key), page, fields)
+
+        def dependency_matches(recipe: Mapping[str, Any]) -> bool:
+            dep_key = field_key(recipe, 'dependency', '')
+            return dep_key is not None and dependency_key in dep_key
+
+        return self._scanned_results(self._scan(dependency_matches, self._read_keys(fields, 'dependency')), page, fields)
+
+    @staticmethod
+    def _filter_postings(snapshot: RecipeSnapshot, recipe_filter: RecipeFilter) -> Optional[Sequence[int]]:
+        """
+        Get the sorted positions of the recipes a filter selects, or excludes, from the snapshot indexes.
+
+        Returns:
+            Positions of the matching recipes, or None for filters checked on each
+            candidate instead (names, whose substring check is cheaper than their
+            index once other filters narrowed the candidates down)
+        """
+        key = recipe_filter.key
+        if recipe_filter.name == 'category':
+            return snapshot.category_positions.get(key, [])
+        if recipe_filter.name == 'subcategory':
+            return snapshot.subcategory_positions.get(key, [])
+        if recipe_filter.name == 'tag':
+            return snapshot.tag_index.get(key, [])
+        if recipe_filter.name == 'dependency':
+            return snapshot.dependency_index.search(key)
+        return None
+
+    def _filtered_positions(self, snapshot: RecipeSnapshot, filters: List[RecipeFilter]) -> Sequence[int]:
+        """
+        Get the positions of the snapshot records passing every filter, from the snapshot indexes.
+
+        Returns:
+            Sorted positions of the matching records
+        """
+        postings = []
+        excluded = set()
+        checks = []
+        for recipe_filter in filters:
+            filter_postings = self._filter_postings(snapshot, recipe_filter)
+            if filter_postings is None:
+                checks.append(recipe_filter)
+                continue
+
+            note_access(f'{recipe_filter.name} index')
+            if recipe_filter.exclude:
+                excluded.update(filter_postings)
+            else:
+                postings.append(filter_postings)
+
+        if postings:
+            positions = intersect_postings(postings)
+        elif checks and not checks[0].exclude:
+            # A name filter alone is answered by its trigram index
+            note_access('name trigram index')
+            positions = snapshot.name_index.search(checks.pop(0).key)
+        else:
+            positions = range(len(snapshot))
+
+        if excluded:
+            positions = [position for position in positions if position not in excluded]
+
+        # Unindexed filters only look at the recipes that survived the indexed ones
+        if checks:
+            count(examined=len(positions))
+            records = snapshot.records
+            positions = [position for position in positions
+                         if all(recipe_filter.matches(records[position]) for recipe_filter in checks)]
+
+        return positions
+
+    def find_recipes(self, category: Optional[str] = None, subcategory: Optional[str] = None,
+                     tag: Optional[str] = None, dependency: Optional[str] = None, name: Optional[str] = None,
+                     exclude_category: Optional[str] = None, exclude_subcategory: Optional[str] = None,
+                     exclude_tag: Optional[str] = None, exclude_dependency: Optional[str] = None,
+                     exclude_name: Optional[str] = None, limit: Optional[int] = None, offset: int = 0,
+                     cursor: Optional[str] = None,
+                     fields: Optional[Sequence[str]] = None) -> Union[List[Dict[str, Any]], RecipePage]:
+        """
+        Get the recipes matching every given filter.
+
+        Categories, sub-categories and tags match whole values, dependencies and
+        names match substrings, all case-insensitively. Each exclude_* filter drops
+        the recipes its counterpart would select. Filters left to None are ignored.
+
+        Args:
+            category: Category the recipes belong to
+            subcategory: Sub-category the recipes belong to, in any category
+            tag: Tag the recipes carry
+            dependency: Substring of the recipe dependency
+            name: Substring of the recipe name
+            exclude_category: Category the recipes must not belong to
+            exclude_subcategory: Sub-category the recipes must not belong to
+            exclude_tag: Tag the recipes must not carry
+            exclude_dependency: Substring the recipe dependency must not contain
+            exclude_name: Substring the recipe name must not contain
+            limit: Maximum number of recipes to return
+            offset: Number of matching recipes to skip
+            cursor: next_cursor of the previous page, instead of offset
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
+
+        Returns:
+            List of recipe dictionaries in file order, or a page dict with 'recipes',
+            'total' and 'next_cursor' keys when limit, offset or cursor is given
+
+        Raises:
+            ValueError: If a filter is not a string, or the pagination arguments or
+                the fields are invalid
+        """
+        filters = recipe_filters({
+            'category': category, 'subcategory': subcategory, 'tag': tag, 'dependency': dependency, 'name': name,
+            'exclude_category': exclude_category, 'exclude_subcategory': exclude_subcategory,
+            'exclude_tag': exclude_tag, 'exclude_dependency': exclude_dependency, 'exclude_name': exclude_name
+        })
+        fields = recipe_fields(fields)
+        page = self._page_request(limit, offset, cursor)
+
+        if not self.resident:
+            return self._scanned_results(self._scan(
+                lambda recipe: all(recipe_filter.matches(recipe) for recipe_filter in filters),
+                self._read_keys(fields, *filter_keys(filters))), page, fields)
+
+        snapshot = self._current_snapshot()
+        return self._indexed_results(snapshot, self._filtered_positions(snapshot, filters), page, fields)
+
+    def search_recipes(self, query: str, limit: int = 10,
+                       fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Search recipes by free text over their name, description and package.
+
+        The query is split into terms like the indexed text: at punctuation, digits
+        and camelCase boundaries, case-insensitively. Recipes are ranked with BM25,
+        a term in the name weighing more than one in the description or package.
+
+        Args:
+            query: Free text to search for, e.g. "junit 5 migration"
+            limit: Maximum number of recipes to return
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
+
+        Returns:
+            List of recipe dictionaries, most relevant first
+
+        Raises:
+            ValueError: If limit is not a positive integer or the fields are invalid
+        """
+        fields = recipe_fields(fields)
+        if not isinstance(limit, int) or isinstance(limit, bool) or limit < 1:
+            raise ValueError("limit must be a positive integer")
+        if not query or not isinstance(query, str):
             return []
 
-        dependency_lower = dependency.lower()
-        results = []
+        ranked = [position for position, _ in self._current_text_index().search(query, limit)]
+        return self._records_in_order(ranked, fields)
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Complete a prefix with the recipe names and packages starting with it.
+
+        Matching ignores case like the other queries. The values are kept in a
+        sorted array built once per dataset version, so a lookup is a binary search
+        followed by reading the completions in order.
+
+        Args:
+            prefix: Start of a recipe name or fully qualified package, e.g.
+                "org.openrewrite.java.migrate."
+            limit: Maximum number of completions to return
+
+        Returns:
+            List of completions in alphabetical order, each a dict with the 'value',
+            the 'field' it comes from ('name' or 'package') and the number of
+            'recipes' carrying it
 
-        for recipe in self._stream_recipes():
-            dep = recipe.get('dependency', '')
-            if isinstance(dep, str) and dependency_lower in dep.lower():
-                results.append(recipe)
+        Raises:
+            ValueError: If limit is not a positive integer
+        """
+        if not isinstance(limit, int) or isinstance(limit, bool) or limit < 1:
+            raise ValueError("limit must be a positive integer")
+        if not prefix or not isinstance(prefix, str):
+            return []
+
+        return self._current_completion_index().complete(normalize_key(prefix), limit)
+
+    def run_queries(self, queries: Sequence[Mapping[str, Any]]) -> List[Any]:
+        """
+        Run a batch of queries.
+
+        Each query is a dict naming a query method and giving its keyword arguments,
+        e.g. {"method": "get_recipes_by_tag", "tag": "spring", "fields": ["id"]}.
+        The methods get_recipes_by_tag, get_recipes_by_category, get_recipes_by_name,
+        get_recipes_by_dependency, get_recipe_by_id and find_recipes are supported,
+        without pagination. When streaming, all the queries are answered in a single
+        pass over the file instead of one pass each.
+
+        Args:
+            queries: Queries to run
 
+        Returns:
+            Result of each query, in query order, as returned by its method
+
+        Raises:
+            ValueError: If a query names an unsupported method, has an unknown
+                argument or invalid filters or fields; no query runs then
+        """
+        if not isinstance(queries, (list, tuple)):
+            raise ValueError("queries must be a list of query dicts")
+
+        batch = [batch_query(query) for query in queries]
+        for query in batch:
+            recipe_fields(query.fields)
+
+        if self.resident:
+            return [getattr(self, query.method)(**query.arguments) for query in batch]
+        return self._scan_queries(batch)
+
+    def _scan_queries(self, batch: List[BatchQuery]) -> List[Any]:
+        """
+        Answer a batch of validated queries with one pass over the recipes.
+
+        Every recipe is tested against each query still running and appended to the
+        results of the ones it matches. The pass stops early once only id lookups
+        remain and all of them are found. Typo-tolerant name lookups are answered
+        from the fuzzy name index, outside the pass.
+        """
+        results: List[Any] = [{} if query.method == 'get_recipe_by_id' else []
+                              for query in batch]
+        for index, query in enumerate(batch):
+            if query.ranked:
+                results[index] = self.get_recipes_by_name(**query.arguments)
+        batch = [query._replace(filters=None) if query.ranked else query for query in batch]
+
+        fields = [recipe_fields(query.fields) for query in batch]
+        filtered = [index for index, query in enumerate(batch)
+                    if query.filters is not None and query.recipe_id is None]
+        pending_ids = {index: query.recipe_id for index, query in enumerate(batch) if query.recipe_id is not None}
+        if not filtered and not pending_ids:
+            return results
+
+        keys: Optional[set] = set()
+        for index, query in enumerate(batch):
+            if fields[index] is None:
+                keys = None
+                break
+            keys.update(fields[index], filter_keys(query.filters or []))
+        if keys is not None and pending_ids:
+            keys.add('id')
+
+        note_access('batch scan')
+        examined = 0
+        with timed('scan'):
+            for recipe in self._stream_recipes(frozenset(keys) if keys is not None else None):
+                examined += 1
+                # The first query matching a recipe gets it, the others private copies
+                taken = False
+                for index in filtered:
+                    if all(recipe_filter.matches(recipe) for recipe_filter in batch[index].filters):
+                        exported = self._export(recipe, fields[index])
+                        results[index].append(copy_recipe(exported) if taken else exported)
+                        taken = True
+
+                if pending_ids:
+                    recipe_id = recipe.get('id')
+                    for index in [index for index, wanted in pending_ids.items() if wanted == recipe_id]:
+                        exported = self._export(recipe, fields[index])
+                        results[index] = copy_recipe(exported) if taken else exported
+                        taken = True
+                        del pending_ids[index]
+                    if not pending_ids and not filtered:
+                        break
+
+        count(examined=examined)
         return results
 
-    def update_from_remote(self, json_url: str, sha256_url: str, dest_dir: str = "resource/db") -> str:
+    def iter_recipes_by_category(self, category: str, subcategory: Optional[str] = None,
+                                 fields: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate lazily over the recipes of a category and optional subcategory.
+
+        Like the other iter_* methods, this yields the recipes get_recipes_by_category
+        returns, one at a time: a streaming repository only holds the recipe being
+        yielded, and closing the iterator (e.g. through contextlib.closing) before
+        its end closes the file right away. Arguments are validated when the
+        method is called.
+
+        Args:
+            category: The category name to filter by
+            subcategory: Optional subcategory name to further filter
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
+
+        Returns:
+            Iterator over the matching recipe dictionaries, in file order
+
+        Raises:
+            ValueError: If the fields are invalid
+        """
+        return self._iter_query({'method': 'get_recipes_by_category', 'category': category,
+                                 'subcategory': subcategory, 'fields': fields})
+
+    def iter_recipes_by_tag(self, tag: str, fields: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate lazily over the recipes containing a specific tag.
+
+        Args:
+            tag: The tag to search for
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
+
+        Returns:
+            Iterator over the matching recipe dictionaries, in file order
+
+        Raises:
+            ValueError: If the fields are invalid
+        """
+        return self._iter_query({'method': 'get_recipes_by_tag', 'tag': tag, 'fields': fields})
+
+    def iter_recipes_by_name(self, name_query: str,
+                             fields: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate lazily over the recipes whose name contains a substring (case-insensitive).
+
+        Args:
+            name_query: The partial name to search for
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
+
+        Returns:
+            Iterator over the matching recipe dictionaries, in file order
+
+        Raises:
+            ValueError: If the fields are invalid
+        """
+        return self._iter_query({'method': 'get_recipes_by_name', 'name_query': name_query, 'fields': fields})
+
+    def iter_recipes_by_dependency(self, dependency: str,
+                                   fields: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate lazily over the recipes whose dependency contains a substring (case-insensitive).
+
+        Args:
+            dependency: The dependency to search for
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
+
+        Returns:
+            Iterator over the matching recipe dictionaries, in file order
+
+        Raises:
+            ValueError: If the fields are invalid
+        """
+        return self._iter_query({'method': 'get_recipes_by_dependency', 'dependency': dependency,
+                                 'fields': fields})
+
+    def iter_recipes_matching(self, fields: Optional[Sequence[str]] = None,
+                              **filters: Optional[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate lazily over the recipes matching every given filter.
+
+        Args:
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
+            **filters: Filters of find_recipes, e.g. category="java", exclude_tag="junit"
+
+        Returns:
+            Iterator over the matching recipe dictionaries, in file order
+
+        Raises:
+            ValueError: If a filter is unknown or not a string, or the fields are invalid
+        """
+        return self._iter_query({'method': 'find_recipes', **filters, 'fields': fields})
+
+    def _iter_query(self, query: Mapping[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Validate a query eagerly and return the lazy iterator over its results.
+
+        Raises:
+            ValueError: If the query is invalid
+        """
+        parsed = batch_query(query)
+        fields = recipe_fields(parsed.fields)
+        if parsed.filters is None:
+            return iter(())
+        return self._iter_filtered(parsed.filters, fields)
+
+    def _iter_filtered(self, filters: List[RecipeFilter],
+                       fields: Optional[Tuple[str, ...]]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the recipes passing every filter, in file order.
+
+        The stream is closed as soon as this generator is closed, so a consumer
+        stopping early releases the file right away instead of at garbage collection.
+        """
+        if self.resident:
+            snapshot = self._current_snapshot()
+            for position in self._filtered_positions(snapshot, filters):
+                yield self._export(snapshot.records[position], fields)
+            return
+
+        recipes = self._stream_recipes(self._read_keys(fields, *filter_keys(filters)))
+        try:
+            for recipe in recipes:
+                if all(recipe_filter.matches(recipe) for recipe_filter in filters):
+                    yield self._export(recipe, fields)
+        finally:
+            recipes.close()
+
+    @staticmethod
+    def _remove_legacy_sidecars(json_path: str) -> None:
+        """Delete the index files left next to recipes.json before it was published as a generation."""
+        if not os.path.islink(json_path):
+            return
+        for path in (snapshot_file_path(json_path), id_index_path(json_path)):
+            try:
+                if not os.path.islink(path) and os.path.isfile(path):
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def update_from_remote(self, json_url: str, sha256_url: str, dest_dir: str = "resource/db",
+                           grace_period: float = GENERATION_GRACE_PERIOD) -> str:
         """
         Update the recipes database by downloading from remote URLs with SHA-256 verification.
 
         Downloads the SHA-256 hash file first, then the JSON file, verifies the hash matches,
-        and saves both files to the destination directory if verification succeeds.
+        and publishes both files as a new generation of the destination directory if
+        verification succeeds: they are written with their binary snapshot and id index
+        to generations/<name>/, then the current symlink is switched to it, so readers
+        never see the new JSON file with the old hash. recipes.json and
+        recipes.json.sha256 link through current. Generations replaced longer ago than
+        the grace period are deleted.
 
         Args:
             json_url: URL to download the recipes.json file from
             sha256_url: URL to download the recipes.json.sha256 file from
             dest_dir: Directory to save the files to (default: "resource/db")
+            grace_period: Seconds a replaced generation is kept for readers still using it
 
         Returns:
             Path to the saved recipes.json file
@@ -275,27 +1352,22 @@ class RecipeRepository:
             if actual_hash != expected_hash:
                 raise ValueError(f"SHA-256 hash mismatch: expected {expected_hash}, got {actual_hash}")
 
-            # Ensure destination directory exists
-            os.makedirs(dest_dir, exist_ok=True)
-
-            # Save files atomically using temporary files
             json_path = os.path.join(dest_dir, "recipes.json")
-            sha256_path = os.path.join(dest_dir, "recipes.json.sha256")
-
-            # Write JSON file
-            with tempfile.NamedTemporaryFile(mode='wb', dir=dest_dir, delete=False) as tmp_json:
-                tmp_json.write(json_bytes)
-                tmp_json_path = tmp_json.name
-
-            os.replace(tmp_json_path, json_path)
-
-            # Write SHA-256 file (preserve remote content format)
-            sha256_content = sha256_resp.text.rstrip() + '\n'  # Ensure single trailing newline
-            with tempfile.NamedTemporaryFile(mode='w', dir=dest_dir, delete=False, encoding='utf-8') as tmp_sha256:
-                tmp_sha256.write(sha256_content)
-                tmp_sha256_path = tmp_sha256.name
-
-            os.replace(tmp_sha256_path, sha256_path)
+            # SHA-256 file keeps the remote content format, with a single trailing newline
+            sha256_content = sha256_resp.text.rstrip() + '\n'
+
+            def prepare(directory: str) -> None:
+                # Precompile the binary snapshot and the id index so the next cold
+                # start skips JSON parsing
+                generation_json_path = os.path.join(directory, "recipes.json")
+                generate_snapshot_file(generation_json_path)
+                build_id_index(generation_json_path, expected_hash)
+
+            # The files and their derived indexes are published together as a new generation
+            publish_generation(dest_dir, {"recipes.json": json_bytes,
+                                          "recipes.json.sha256": sha256_content.encode('utf-8')}, prepare)
+            self._remove_legacy_sidecars(json_path)
+            collect_generations(dest_dir, grace_period)
 
             return json_path
 
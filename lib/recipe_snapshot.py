@@ -0,0 +1,372 @@
+import os
+import json
+from decimal import Decimal
+from functools import cached_property
+from types import ModuleType
+from typing import List, Dict, Optional, Any, AbstractSet, BinaryIO, Callable, Iterable, Iterator, Mapping, Tuple
+import ijson
+from lib.recipe_records import CompactRecipe, RecordCompactor
+from lib.recipe_json_backend import json_backend
+from lib.recipe_query_stats import timed
+from lib.recipe_text_index import TextIndex
+from lib.recipe_indexes import CategoryIndex, CategoryTree, build_category_index, build_category_positions, build_tag_index, \
+    build_subcategory_positions, build_id_positions, field_key, CompletionIndex, FuzzyIndex, TrigramIndex, VocabularyIndex
+
+
+# (mtime_ns, size, inode) of a file, or None when the file does not exist
+FileStat = Optional[Tuple[int, int, int]]
+
+# Identity of a dataset version: stat of recipes.json plus stat of its .sha256 file
+DatasetFingerprint = Tuple[FileStat, FileStat]
+
+
+def _file_stat(path: str) -> FileStat:
+    """
+    Get the (mtime, size, inode) triple of a file.
+
+    Args:
+        path: Path of the file to stat
+
+    Returns:
+        Tuple with mtime in nanoseconds, size and inode, or None if the file is missing
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def dataset_fingerprint(json_file_path: str) -> DatasetFingerprint:
+    """
+    Compute the change-detection fingerprint of a recipes dataset.
+
+    Only file metadata is read, so the check is cheap enough to run on every query.
+
+    Args:
+        json_file_path: Path to the recipes JSON file
+
+    Returns:
+        Fingerprint combining the stat of the JSON file and of its .sha256 file
+    """
+    return (_file_stat(json_file_path), _file_stat(json_file_path + ".sha256"))
+
+
+def read_sha256(json_file_path: str) -> Optional[str]:
+    """
+    Read the expected SHA-256 hash of a recipes dataset from its .sha256 file.
+
+    Args:
+        json_file_path: Path to the recipes JSON file
+
+    Returns:
+        Lowercase hex digest, or None if the hash file is missing or empty
+    """
+    try:
+        with open(json_file_path + ".sha256", 'r', encoding='utf-8') as f:
+            content = f.read().strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    # Handle formats like "hash" or "hash filename"
+    return content.split()[0].lower() if content else None
+
+
+# Whether unrequested values are skipped, or None to decide from the backend: C
+# backends build whole values faster than a Python event loop can skip them, so
+# unrequested values are only skipped by backends that build values in Python
+_SKIPS_UNREQUESTED_VALUES: Optional[bool] = None
+
+
+def iter_recipes(f: BinaryIO, keys: Optional[AbstractSet[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Decode the recipes of a JSON array one by one.
+
+    Non-object items are skipped and decoding stops silently at the first error,
+    so a malformed file yields the recipes that precede the problem.
+
+    Args:
+        f: Binary file object positioned at the start of the JSON document
+        keys: Top-level keys the caller needs. With a backend that builds values in
+            Python the other values are skipped by the parser instead of being
+            built; the recipes may still carry extra keys.
+
+    Yields:
+        Recipe dictionaries in file order
+
+    Raises:
+        ValueError: If the configured JSON backend is unknown or not installed
+    """
+    backend = json_backend()
+    skips_values = _SKIPS_UNREQUESTED_VALUES if _SKIPS_UNREQUESTED_VALUES is not None \
+        else not backend.backend_name.endswith('_c')
+    try:
+        if keys is not None and skips_values:
+            yield from _iter_recipe_keys(backend, f, keys)
+            return
+
+        for item in backend.items(f, 'item'):
+            if isinstance(item, dict):
+                yield item
+    except (ijson.IncompleteJSONError, IOError, Exception):
+        return
+
+
+def _iter_recipe_keys(backend: ModuleType, f: BinaryIO, keys: AbstractSet[str]) -> Iterator[Dict[str, Any]]:
+    # Like items(f, 'item'), only the elements of a top-level array are recipes
+    events = backend.basic_parse(f)
+    first = next(events, None)
+    if first is None or first[0] != 'start_array':
+        return
+
+    # Depth 1 is the top-level array and depth 2 the inside of a recipe object;
+    # values under a requested key are fed to a builder, the others are dropped
+    depth = 1
+    recipe: Optional[Dict[str, Any]] = None
+    key = None
+    builder = None
+    for event, value in events:
+        if event == 'start_map' or event == 'start_array':
+            depth += 1
+            if depth == 2:
+                if event == 'start_map':
+                    recipe = {}
+            elif builder is not None:
+                builder.event(event, value)
+        elif event == 'end_map' or event == 'end_array':
+            depth -= 1
+            if depth == 1:
+                if recipe is not None:
+                    yield recipe
+                    recipe = None
+            elif builder is not None:
+                builder.event(event, value)
+                if depth == 2:
+                    recipe[key] = builder.value
+                    builder = None
+        elif depth == 2:
+            if recipe is None:
+                continue
+            if event == 'map_key':
+                key = value
+                builder = ijson.ObjectBuilder() if value in keys else None
+            elif builder is not None:
+                recipe[key] = value
+                builder = None
+        elif builder is not None:
+            builder.event(event, value)
+
+
+def dump_json(value: Any) -> str:
+    """
+    Serialize a value decoded by ijson back to compact JSON.
+
+    Unlike json.dumps, Decimal numbers are written as JSON numbers.
+
+    Args:
+        value: Decoded JSON value
+
+    Returns:
+        JSON text of the value
+    """
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, list):
+        return '[' + ','.join(dump_json(item) for item in value) + ']'
+    if isinstance(value, dict):
+        return '{' + ','.join(json.dumps(key, ensure_ascii=False) + ':' + dump_json(item)
+                              for key, item in value.items()) + '}'
+    return json.dumps(value, ensure_ascii=False)
+
+
+def copy_recipe(recipe: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Copy a recipe so callers can modify it without touching the snapshot.
+
+    Args:
+        recipe: Recipe dictionary or compact record held by a snapshot
+
+    Returns:
+        Copy of the recipe with nested lists and dicts copied as well
+    """
+    return {key: copy_value(value) for key, value in recipe.items()}
+
+
+def recipe_fields(fields: Optional[Iterable[str]]) -> Optional[Tuple[str, ...]]:
+    """
+    Validate the fields a caller asked a query to return.
+
+    Args:
+        fields: Names of the recipe keys to return, or None for all of them
+
+    Returns:
+        Distinct field names in the order given, or None for all fields
+
+    Raises:
+        ValueError: If fields is a single string or contains a non-string name
+    """
+    if fields is None:
+        return None
+    if isinstance(fields, str) or not all(isinstance(field, str) for field in fields):
+        raise ValueError("fields must be a list of field names")
+    return tuple(dict.fromkeys(fields))
+
+
+def project_recipe(recipe: Mapping[str, Any], fields: Tuple[str, ...], copy: bool = True) -> Dict[str, Any]:
+    """
+    Build a recipe holding only some of its keys.
+
+    Args:
+        recipe: Recipe dictionary or compact record
+        fields: Keys to keep, in output order; keys the recipe lacks are left out
+        copy: Copy nested lists and dicts, for records shared by a snapshot
+
+    Returns:
+        New dictionary with the requested keys
+    """
+    if copy:
+        return {field: copy_value(recipe[field]) for field in fields if field in recipe}
+    return {field: recipe[field] for field in fields if field in recipe}
+
+
+def copy_value(value: Any) -> Any:
+    """
+    Copy a decoded JSON value, with nested lists and dicts copied as well.
+
+    Args:
+        value: Value made of dicts, lists and immutable scalars
+
+    Returns:
+        Copy sharing only the immutable scalars with the value
+    """
+    if isinstance(value, list):
+        return [copy_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: copy_value(item) for key, item in value.items()}
+    return value
+
+
+class RecipeSnapshot:
+    """
+    Immutable in-memory copy of a recipes dataset.
+
+    A snapshot is bound to the fingerprint of the files it was loaded from, so the
+    repository can tell when it has to be replaced. Indexes are built on first use
+    and live as long as the snapshot, so they are rebuilt only for a new dataset.
+    Records are held as CompactRecipe objects sharing their repeated strings.
+    """
+
+    def __init__(self, records: Iterable[Mapping[str, Any]], fingerprint: DatasetFingerprint,
+                 sha256: Optional[str] = None, index_loaders: Optional[Dict[str, Callable[[], Any]]] = None):
+        """
+        Initialize the snapshot.
+
+        Args:
+            records: Recipe dictionaries or compact records in file order
+            fingerprint: Fingerprint of the dataset taken before the records were read
+            sha256: Expected SHA-256 of the dataset, if known
+            index_loaders: Functions returning prebuilt indexes by property name (e.g.
+                decoding them from a snapshot file); indexes without a loader, or
+                whose loader fails, are built from the records on first use
+        """
+        compactor = RecordCompactor()
+        self.records: Tuple[CompactRecipe, ...] = tuple(
+            record if isinstance(record, CompactRecipe) else compactor.compact(record) for record in records)
+        self.fingerprint = fingerprint
+        self.sha256 = sha256
+        self._index_loaders = dict(index_loaders or {})
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def is_current(self, fingerprint: DatasetFingerprint) -> bool:
+        """
+        Check whether the snapshot still matches the dataset on disk.
+
+        Args:
+            fingerprint: Current fingerprint of the dataset
+
+        Returns:
+            True if the snapshot was loaded from the same dataset version
+        """
+        return self.fingerprint == fingerprint
+
+    def build_indexes(self) -> None:
+        """
+        Build or load every index now instead of on first use.
+
+        Used before a snapshot is published to running queries, so none of them
+        waits for an index to be built.
+        """
+        for name in ('category_index', 'category_positions', 'subcategory_positions', 'category_tree', 'tag_index',
+                     'id_positions', 'name_index', 'fuzzy_name_index', 'completion_index', 'dependency_index',
+                     'text_index'):
+            getattr(self, name)
+
+    def _index(self, name: str, build: Callable[[], Any]) -> Any:
+        with timed('build'):
+            loader = self._index_loaders.pop(name, None)
+            if loader is not None:
+                try:
+                    return loader()
+                except ValueError:
+                    pass
+            return build()
+
+    @cached_property
+    def category_index(self) -> CategoryIndex:
+        """Category key -> sub-category key -> record positions."""
+        return self._index('category_index', lambda: build_category_index(self.records))
+
+    @cached_property
+    def category_positions(self) -> Dict[str, List[int]]:
+        """Category key -> positions of all its records."""
+        return build_category_positions(self.category_index)
+
+    @cached_property
+    def subcategory_positions(self) -> Dict[str, List[int]]:
+        """Sub-category key -> positions of all its records, with or without a category."""
+        return build_subcategory_positions(self.records)
+
+    @cached_property
+    def category_tree(self) -> CategoryTree:
+        """Sorted categories and sub-categories with their recipe counts."""
+        return self._index('category_tree', lambda: CategoryTree.from_category_index(self.category_index))
+
+    @cached_property
+    def tag_index(self) -> Dict[str, List[int]]:
+        """Casefolded tag -> sorted record positions."""
+        return self._index('tag_index', lambda: build_tag_index(self.records))
+
+    @cached_property
+    def id_positions(self) -> Dict[str, int]:
+        """Recipe id -> position of the first record carrying it."""
+        return self._index('id_positions', lambda: build_id_positions(self.records))
+
+    @cached_property
+    def name_index(self) -> TrigramIndex:
+        """Trigram index over the recipe name keys."""
+        return self._index('name_index', lambda: TrigramIndex(
+            [field_key(recipe, 'name', '') for recipe in self.records]))
+
+    @cached_property
+    def fuzzy_name_index(self) -> FuzzyIndex:
+        """Trie over the recipe name keys for typo-tolerant lookups."""
+        return FuzzyIndex(self.name_index.keys)
+
+    @cached_property
+    def completion_index(self) -> CompletionIndex:
+        """Sorted name and package keys for prefix completion."""
+        with timed('build'):
+            return CompletionIndex(self.records)
+
+    @cached_property
+    def dependency_index(self) -> VocabularyIndex:
+        """Vocabulary index over the dependency keys."""
+        return self._index('dependency_index', lambda: VocabularyIndex(
+            [field_key(recipe, 'dependency', '') for recipe in self.records]))
+
+    @cached_property
+    def text_index(self) -> TextIndex:
+        """BM25 index over the names, descriptions and packages."""
+        return self._index('text_index', lambda: TextIndex.build(self.records))
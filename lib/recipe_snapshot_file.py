@@ -0,0 +1,445 @@
+import json
+import os
+import sys
+import struct
+import hashlib
+import tempfile
+import zlib
+from array import array
+from decimal import Decimal
+from itertools import accumulate
+from typing import List, Dict, Optional, Any, Callable, Tuple
+from lib.recipe_indexes import CategoryTree, TrigramIndex, VocabularyIndex
+from lib.recipe_query_stats import count
+from lib.recipe_records import CompactRecipe, RecordLayout
+from lib.recipe_text_index import TextIndex
+from lib.recipe_snapshot import RecipeSnapshot, DatasetFingerprint, dataset_fingerprint, dump_json, iter_recipes, \
+    read_sha256
+
+
+SNAPSHOT_SUFFIX = ".snap"
+SNAPSHOT_MAGIC = b"ORDBSNAP"
+SNAPSHOT_VERSION = 5
+
+# magic, format version, raw SHA-256 of the source JSON, size of the source JSON,
+# CRC-32 of the rest of the file
+_HEADER = struct.Struct('<8sH32sQI')
+_LENGTH = struct.Struct('<I')
+
+# Value references are indexes into the value pool built at load time:
+# strings first, then complex values in reverse, then False, True and None,
+# so negative references address the fixed tail of the pool
+_NONE_REF = -1
+_TRUE_REF = -2
+_FALSE_REF = -3
+_FIRST_COMPLEX_REF = -4
+
+_ENCODING = 'utf-8'
+_ENCODING_ERRORS = 'surrogatepass'
+_STRING_SEPARATOR = '\x00'
+
+
+def snapshot_file_path(json_file_path: str) -> str:
+    """
+    Get the path of the binary snapshot of a recipes dataset.
+
+    Args:
+        json_file_path: Path to the recipes JSON file
+
+    Returns:
+        Path of the snapshot file next to the JSON file
+    """
+    return json_file_path + SNAPSHOT_SUFFIX
+
+
+# Indexes stored after the records, in file order, with their number of sections
+# (a posting list table takes two sections: lengths and positions)
+_INDEX_SECTIONS = (
+    ('category_index', 4),
+    ('category_tree', 5),
+    ('tag_index', 3),
+    ('id_positions', 2),
+    ('name_index', 4),
+    ('dependency_index', 3),
+    ('text_index', 4),
+)
+
+
+class _Encoder:
+    """Accumulates the sections of a snapshot file and dictionary-encodes values."""
+
+    def __init__(self):
+        self.parts: List[bytes] = []
+        self.strings: Dict[str, int] = {}
+        self.complex_values: Dict[str, int] = {}
+
+    def ref(self, value: Any) -> int:
+        if isinstance(value, str):
+            string_id = self.strings.get(value)
+            if string_id is None:
+                string_id = self.strings[value] = len(self.strings)
+            return string_id
+        if value is None:
+            return _NONE_REF
+        if value is True:
+            return _TRUE_REF
+        if value is False:
+            return _FALSE_REF
+
+        # Lists, objects and numbers are stored as JSON, once per distinct value
+        encoded = dump_json(value)
+        complex_id = self.complex_values.get(encoded)
+        if complex_id is None:
+            complex_id = self.complex_values[encoded] = len(self.complex_values)
+        return _FIRST_COMPLEX_REF - complex_id
+
+    def put_bytes(self, data: bytes) -> None:
+        self.parts.append(_LENGTH.pack(len(data)))
+        self.parts.append(data)
+
+    def put_array(self, typecode: str, values: List[int]) -> None:
+        data = array(typecode, values)
+        if sys.byteorder == 'big':
+            data.byteswap()
+        self.put_bytes(data.tobytes())
+
+    def put_postings(self, postings: List[List[int]]) -> None:
+        self.put_array('I', [len(positions) for positions in postings])
+        self.put_array('I', [position for positions in postings for position in positions])
+
+
+class _Decoder:
+    """Reads the sections written by _Encoder."""
+
+    def __init__(self, data: bytes, offset: int):
+        self.data = memoryview(data)
+        self.offset = offset
+
+    def get_bytes(self) -> memoryview:
+        (length,) = _LENGTH.unpack_from(self.data, self.offset)
+        start = self.offset + _LENGTH.size
+        self.offset = start + length
+        if self.offset > len(self.data):
+            raise ValueError("Truncated snapshot file")
+        return self.data[start:self.offset]
+
+    def get_array(self, typecode: str) -> List[int]:
+        values = array(typecode)
+        values.frombytes(self.get_bytes())
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values.tolist()
+
+    @staticmethod
+    def resolve(pool: List[Any], refs: List[int]) -> List[Any]:
+        return list(map(pool.__getitem__, refs))
+
+    def get_postings(self) -> List[List[int]]:
+        lengths = self.get_array('I')
+        positions = self.get_array('I')
+        ends = list(accumulate(lengths))
+        return [positions[end - length:end] for length, end in zip(lengths, ends)]
+
+
+def encode_snapshot(snapshot: RecipeSnapshot, source_size: int) -> bytes:
+    """
+    Serialize a snapshot and its indexes to the binary snapshot format.
+
+    Args:
+        snapshot: Snapshot to serialize; its sha256 must be set
+        source_size: Size in bytes of the JSON file the snapshot was loaded from
+
+    Returns:
+        Content of the snapshot file
+    """
+    encoder = _Encoder()
+    ref = encoder.ref
+
+    # Records are stored as compact as they are held: templated fields keep their
+    # template, which is written once in the string table
+    layouts: Dict[Tuple[Tuple[str, ...], Tuple[int, ...]], int] = {}
+    layout_ids = []
+    record_refs = []
+    for recipe in snapshot.records:
+        layout = (recipe.layout.keys, tuple(sorted(recipe.layout.templated)))
+        layout_id = layouts.get(layout)
+        if layout_id is None:
+            layout_id = layouts[layout] = len(layouts)
+        layout_ids.append(layout_id)
+        record_refs.extend(ref(value) for value in recipe.raw_values)
+
+    category_entries = [
+        (category, subcategory, positions)
+        for category, subcategories in snapshot.category_index.items()
+        for subcategory, positions in subcategories.items()
+    ]
+    category_tree = snapshot.category_tree
+    subcategory_nodes = [subcategory for _, _, subcategories in category_tree.nodes for subcategory in subcategories]
+    name_index = snapshot.name_index
+    dependency_index = snapshot.dependency_index
+    text_postings = snapshot.text_index.postings
+
+    # Index keys must be interned before the string table is written
+    sections = [
+        ('i', [ref(category) for category, _, _ in category_entries]),
+        ('i', [ref(subcategory) for _, subcategory, _ in category_entries]),
+        [positions for _, _, positions in category_entries],
+        ('i', [ref(category) for category in category_tree.categories]),
+        ('I', [count for _, count, _ in category_tree.nodes]),
+        ('I', [len(subcategories) for _, _, subcategories in category_tree.nodes]),
+        ('i', [ref(subcategory) for subcategory, _ in subcategory_nodes]),
+        ('I', [count for _, count in subcategory_nodes]),
+        ('i', [ref(tag) for tag in snapshot.tag_index]),
+        list(snapshot.tag_index.values()),
+        ('i', [ref(recipe_id) for recipe_id in snapshot.id_positions]),
+        ('I', list(snapshot.id_positions.values())),
+        ('i', [ref(key) for key in name_index.keys]),
+        ('i', [ref(trigram) for trigram in name_index.postings]),
+        list(name_index.postings.values()),
+        ('i', [ref(dependency) for dependency in dependency_index.postings]),
+        list(dependency_index.postings.values()),
+        ('i', [ref(term) for term in text_postings]),
+        [positions for positions, _ in text_postings.values()],
+        ('d', [score for _, scores in text_postings.values() for score in scores]),
+    ]
+
+    # Strings are NUL-separated so they can be decoded with a single split; the
+    # length of every string is only stored when one of them contains a NUL
+    strings = list(encoder.strings)
+    has_separator = any(_STRING_SEPARATOR in string for string in strings)
+    if has_separator:
+        encoder.put_array('I', [len(strings)] + [len(string) for string in strings])
+        encoder.put_bytes(''.join(strings).encode(_ENCODING, _ENCODING_ERRORS))
+    else:
+        encoder.put_array('I', [len(strings)])
+        encoder.put_bytes(_STRING_SEPARATOR.join(strings).encode(_ENCODING, _ENCODING_ERRORS))
+    encoder.put_bytes(('[' + ','.join(encoder.complex_values) + ']').encode(_ENCODING, _ENCODING_ERRORS))
+    encoder.put_bytes(json.dumps([[list(keys), list(templated)] for keys, templated in layouts]).encode(_ENCODING))
+    encoder.put_array('I', layout_ids)
+    encoder.put_array('i', record_refs)
+    for section in sections:
+        if isinstance(section, tuple):
+            encoder.put_array(*section)
+        else:
+            encoder.put_postings(section)
+
+    payload = b''.join(encoder.parts)
+    header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, bytes.fromhex(snapshot.sha256), source_size,
+                          zlib.crc32(payload))
+    return header + payload
+
+
+def decode_snapshot(data: bytes, fingerprint: DatasetFingerprint) -> RecipeSnapshot:
+    """
+    Load a snapshot from the binary snapshot format.
+
+    Records are decoded right away; each index is decoded the first time the
+    snapshot needs it.
+
+    Args:
+        data: Content of the snapshot file
+        fingerprint: Fingerprint of the source dataset to bind the snapshot to
+
+    Returns:
+        Snapshot with loaders for its prebuilt indexes
+
+    Raises:
+        ValueError: If the data is not a valid snapshot file
+    """
+    try:
+        magic, version, sha256, _, checksum = _HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError("Unsupported snapshot file")
+        if zlib.crc32(memoryview(data)[_HEADER.size:]) != checksum:
+            raise ValueError("Snapshot file checksum mismatch")
+
+        decoder = _Decoder(data, _HEADER.size)
+        string_count, *lengths = decoder.get_array('I')
+        text = str(decoder.get_bytes(), _ENCODING, _ENCODING_ERRORS)
+        if lengths:
+            strings = [text[end - length:end] for length, end in zip(lengths, accumulate(lengths))]
+        else:
+            strings = text.split(_STRING_SEPARATOR) if string_count else []
+        complex_values = json.loads(str(decoder.get_bytes(), _ENCODING, _ENCODING_ERRORS), parse_float=Decimal)
+        layouts = [RecordLayout(tuple(keys), frozenset(templated))
+                   for keys, templated in json.loads(str(decoder.get_bytes(), _ENCODING))]
+
+        pool = strings + complex_values[::-1] + [False, True, None]
+        layout_ids = decoder.get_array('I')
+        values = _Decoder.resolve(pool, decoder.get_array('i'))
+        records = []
+        start = 0
+        for layout_id in layout_ids:
+            layout = layouts[layout_id]
+            end = start + len(layout.keys)
+            records.append(CompactRecipe(layout, tuple(values[start:end])))
+            start = end
+        if start != len(values):
+            raise ValueError("Snapshot record values do not match their layouts")
+
+        # Remember where each index starts and skip over its sections
+        index_offsets = {}
+        for name, section_count in _INDEX_SECTIONS:
+            index_offsets[name] = decoder.offset
+            for _ in range(section_count):
+                decoder.get_bytes()
+    except (struct.error, IndexError, TypeError, ValueError) as e:
+        raise ValueError(f"Corrupt snapshot file: {e}") from e
+
+    def loader(name: str) -> Callable[[], Any]:
+        return lambda: _decode_index(name, _Decoder(data, index_offsets[name]), pool)
+
+    return RecipeSnapshot(records, fingerprint, sha256.hex(),
+                          index_loaders={name: loader(name) for name in index_offsets})
+
+
+def _decode_index(name: str, decoder: '_Decoder', pool: List[Any]) -> Any:
+    def refs() -> List[Any]:
+        return _Decoder.resolve(pool, decoder.get_array('i'))
+
+    try:
+        if name == 'category_index':
+            category_index: Dict[str, Dict[Optional[str], List[int]]] = {}
+            for category, subcategory, positions in zip(refs(), refs(), decoder.get_postings()):
+                category_index.setdefault(category, {})[subcategory] = positions
+            return category_index
+        if name == 'category_tree':
+            categories, counts = refs(), decoder.get_array('I')
+            lengths = decoder.get_array('I')
+            subcategory_nodes = list(zip(refs(), decoder.get_array('I')))
+            if len(subcategory_nodes) != sum(lengths):
+                raise ValueError("Snapshot category tree does not match its sub-categories")
+            return CategoryTree([
+                (category, count, subcategory_nodes[end - length:end])
+                for category, count, length, end in zip(categories, counts, lengths, accumulate(lengths))
+            ])
+        if name == 'tag_index':
+            return dict(zip(refs(), decoder.get_postings()))
+        if name == 'id_positions':
+            return dict(zip(refs(), decoder.get_array('I')))
+        if name == 'name_index':
+            name_keys = refs()
+            return TrigramIndex.from_postings(name_keys, dict(zip(refs(), decoder.get_postings())))
+        if name == 'dependency_index':
+            return VocabularyIndex.from_postings(dict(zip(refs(), decoder.get_postings())))
+        if name == 'text_index':
+            terms, postings, scores = refs(), decoder.get_postings(), decoder.get_array('d')
+            ends = list(accumulate(len(positions) for positions in postings))
+            if len(scores) != (ends[-1] if ends else 0):
+                raise ValueError("Snapshot text index scores do not match their postings")
+            return TextIndex({term: (positions, scores[end - len(positions):end])
+                              for term, positions, end in zip(terms, postings, ends)})
+    except (struct.error, IndexError, TypeError) as e:
+        raise ValueError(f"Corrupt snapshot file: {e}") from e
+
+    raise ValueError(f"Unknown snapshot index: {name}")
+
+
+def load_snapshot_file(json_file_path: str, expected_sha256: Optional[str],
+                       fingerprint: DatasetFingerprint) -> Optional[RecipeSnapshot]:
+    """
+    Load the binary snapshot of a dataset if it was generated from the current JSON file.
+
+    Args:
+        json_file_path: Path to the recipes JSON file
+        expected_sha256: Hash read from recipes.json.sha256
+        fingerprint: Current fingerprint of the dataset
+
+    Returns:
+        The snapshot, or None if the file is missing, stale or unreadable
+    """
+    json_stat = fingerprint[0]
+    if not expected_sha256 or json_stat is None:
+        return None
+
+    try:
+        with open(snapshot_file_path(json_file_path), 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return None
+
+            magic, version, sha256, source_size, _ = _HEADER.unpack(header)
+            if (magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION
+                    or sha256.hex() != expected_sha256 or source_size != json_stat[1]):
+                return None
+
+            data = header + f.read()
+    except OSError:
+        return None
+
+    count(bytes_read=len(data))
+
+    try:
+        snapshot = decode_snapshot(data, fingerprint)
+    except ValueError:
+        return None
+
+    # Every record is decoded, like when the JSON file is parsed
+    count(decoded=len(snapshot))
+    return snapshot
+
+
+def write_snapshot_file(json_file_path: str, snapshot: RecipeSnapshot) -> bool:
+    """
+    Write the binary snapshot of a dataset next to its JSON file.
+
+    The file is only written when the JSON file still matches both the snapshot
+    fingerprint and the hash in its .sha256 file, so a snapshot file can never
+    describe a different version of the data. Write errors are ignored.
+
+    Args:
+        json_file_path: Path to the recipes JSON file
+        snapshot: Snapshot loaded from that file
+
+    Returns:
+        True if the snapshot file was written
+    """
+    if not snapshot.sha256 or snapshot.fingerprint[0] is None:
+        return False
+
+    sha256_hash = hashlib.sha256()
+    try:
+        with open(json_file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                sha256_hash.update(chunk)
+    except OSError:
+        return False
+
+    if sha256_hash.hexdigest() != snapshot.sha256 or dataset_fingerprint(json_file_path) != snapshot.fingerprint:
+        return False
+
+    data = encode_snapshot(snapshot, snapshot.fingerprint[0][1])
+    dest_dir = os.path.dirname(os.path.abspath(json_file_path))
+    try:
+        with tempfile.NamedTemporaryFile(mode='wb', dir=dest_dir, delete=False) as tmp_snapshot:
+            tmp_snapshot.write(data)
+            tmp_snapshot_path = tmp_snapshot.name
+        os.replace(tmp_snapshot_path, snapshot_file_path(json_file_path))
+    except OSError:
+        return False
+
+    return True
+
+
+def generate_snapshot_file(json_file_path: str) -> bool:
+    """
+    Generate the binary snapshot of a recipes JSON file and its .sha256 file.
+
+    Args:
+        json_file_path: Path to the recipes JSON file
+
+    Returns:
+        True if the snapshot file was written
+    """
+    fingerprint = dataset_fingerprint(json_file_path)
+    expected_sha256 = read_sha256(json_file_path)
+    if not expected_sha256:
+        return False
+
+    try:
+        with open(json_file_path, 'rb') as f:
+            snapshot = RecipeSnapshot(iter_recipes(f), fingerprint, expected_sha256)
+    except OSError:
+        return False
+
+    return write_snapshot_file(json_file_path, snapshot)
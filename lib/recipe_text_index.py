@@ -0,0 +1,164 @@
+import heapq
+import math
+import re
+from typing import List, Dict, Any, Iterable, Mapping, Sequence, Tuple
+from lib.recipe_indexes import normalize_key
+
+
+# Fields searched by search_recipes and the weight of a term occurrence in each
+SEARCH_FIELDS = (
+    ('name', 2.0),
+    ('description', 1.0),
+    ('package', 1.0),
+)
+
+# BM25 term frequency saturation and document length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_WORD = re.compile(r'[^\W_]+')
+_ALPHA_OR_DIGITS = re.compile(r'[^\W\d_]+|\d+')
+_CAMEL_PART = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into normalized search terms.
+
+    Words are split at punctuation (so dotted package names and dashed artifact ids
+    give one term per segment), between letters and digits, and at camelCase
+    boundaries. A camelCase word also keeps its whole form as a term, so
+    "JUnit" yields "j", "unit" and "junit".
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        Search keys of the terms, in text order
+    """
+    terms = []
+    for word in _WORD.findall(text):
+        for segment in _ALPHA_OR_DIGITS.findall(word):
+            parts = _CAMEL_PART.findall(segment) if segment.isascii() and segment.isalpha() else []
+            if len(parts) > 1 and ''.join(parts) == segment:
+                terms.extend(normalize_key(part) for part in parts)
+            terms.append(normalize_key(segment))
+    return terms
+
+
+def query_terms(query: str) -> List[str]:
+    """
+    Get the distinct search terms of a query.
+
+    Args:
+        query: Free text
+
+    Returns:
+        Terms in query order, each listed once
+    """
+    return list(dict.fromkeys(tokenize(query)))
+
+
+class TextIndex:
+    """
+    Inverted index ranking recipes with BM25 over their name, description and package.
+
+    The BM25 contribution of every (term, record) pair only depends on the dataset,
+    so it is computed when the index is built and a query just adds up the
+    precomputed scores of its terms.
+    """
+
+    def __init__(self, postings: Dict[str, Tuple[List[int], List[float]]]):
+        """
+        Initialize the index.
+
+        Args:
+            postings: Mapping of term to the sorted positions of the records
+                containing it and the BM25 score of the term in each record
+        """
+        self.postings = postings
+
+    @classmethod
+    def build(cls, records: Iterable[Mapping[str, Any]]) -> 'TextIndex':
+        """
+        Build the index of a dataset.
+
+        Term frequencies are weighted by the field they occur in (BM25F), so a term
+        in the name counts more than one in the description.
+
+        Args:
+            records: Recipe dictionaries in file order
+
+        Returns:
+            Index over the searched fields of the records
+        """
+        frequencies: Dict[str, Dict[int, float]] = {}
+        lengths: List[float] = []
+        for position, recipe in enumerate(records):
+            length = 0.0
+            for field, weight in SEARCH_FIELDS:
+                value = recipe.get(field)
+                if not isinstance(value, str):
+                    continue
+                terms = tokenize(value)
+                length += weight * len(terms)
+                for term in terms:
+                    term_frequencies = frequencies.setdefault(term, {})
+                    term_frequencies[position] = term_frequencies.get(position, 0.0) + weight
+            lengths.append(length)
+
+        record_count = len(lengths)
+        average_length = sum(lengths) / record_count if record_count else 0.0
+        postings: Dict[str, Tuple[List[int], List[float]]] = {}
+        for term, term_frequencies in frequencies.items():
+            idf = math.log(1.0 + (record_count - len(term_frequencies) + 0.5) / (len(term_frequencies) + 0.5))
+            positions = sorted(term_frequencies)
+            scores = []
+            for position in positions:
+                tf = term_frequencies[position]
+                norm = 1.0 - BM25_B + BM25_B * lengths[position] / average_length
+                scores.append(idf * tf * (BM25_K1 + 1.0) / (tf + BM25_K1 * norm))
+            postings[term] = (positions, scores)
+
+        return cls(postings)
+
+    def search(self, query: str, limit: int) -> List[Tuple[int, float]]:
+        """
+        Find the records best matching a free-text query.
+
+        Args:
+            query: Free text, tokenized like the indexed fields
+            limit: Maximum number of records to return
+
+        Returns:
+            (position, score) pairs by decreasing score, ties in file order
+        """
+        scores: Dict[int, float] = {}
+        for term in query_terms(query):
+            term_postings = self.postings.get(term)
+            if term_postings is None:
+                continue
+            get = scores.get
+            for position, score in zip(*term_postings):
+                scores[position] = get(position, 0.0) + score
+
+        # A bounded heap keeps the top results without sorting every match
+        return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+
+
+def search_texts(recipe: Mapping[str, Any]) -> Sequence[str]:
+    """
+    Get the tokenized text of each searched field of a recipe, for storage engines
+    with their own BM25 implementation.
+
+    Args:
+        recipe: Recipe dictionary
+
+    Returns:
+        Space-separated terms of each field of SEARCH_FIELDS, in order
+    """
+    texts = []
+    for field, _ in SEARCH_FIELDS:
+        value = recipe.get(field)
+        texts.append(' '.join(tokenize(value)) if isinstance(value, str) else '')
+    return texts
@@ -0,0 +1,92 @@
+import threading
+from typing import Callable, Optional
+
+
+class DatasetWatcher:
+    """
+    Background thread polling a dataset for changes.
+
+    Every interval the thread calls a refresh function, which reloads the dataset
+    when its files changed and tells whether it did. The thread is a daemon, so it
+    never keeps the process alive, and a failing refresh is retried at the next
+    poll while the previous data keeps being served.
+    """
+
+    def __init__(self, refresh: Callable[[], bool], interval: float = 1.0):
+        """
+        Initialize a stopped watcher.
+
+        Args:
+            refresh: Function reloading the dataset if it changed, returning True
+                when it published a new version
+            interval: Seconds between two polls
+
+        Raises:
+            ValueError: If interval is not a positive number
+        """
+        if not isinstance(interval, (int, float)) or isinstance(interval, bool) or interval <= 0:
+            raise ValueError("interval must be a positive number of seconds")
+
+        self.interval = interval
+        self.reloads = 0
+        self.last_error: Optional[Exception] = None
+        self._refresh = refresh
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the polling thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def check(self) -> bool:
+        """
+        Poll the dataset once, in the calling thread.
+
+        Returns:
+            True if a new version of the dataset was published
+        """
+        try:
+            reloaded = self._refresh()
+        except Exception as e:
+            self.last_error = e
+            return False
+
+        self.last_error = None
+        if reloaded:
+            self.reloads += 1
+        return reloaded
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.check()
+
+    def start(self) -> 'DatasetWatcher':
+        """
+        Start polling in a background thread; does nothing if already running.
+
+        Returns:
+            The watcher itself
+        """
+        if not self.running:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name='recipe-dataset-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop polling and wait for the thread to exit.
+
+        Args:
+            timeout: Maximum seconds to wait for a reload in progress, or None to wait for it
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def __enter__(self) -> 'DatasetWatcher':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,657 @@
+import json
+import sqlite3
+import threading
+from typing import List, Dict, Optional, Any, Iterable, Iterator, Sequence, Tuple, Union
+from lib.recipe_repository import RecipeRepository
+from lib.recipe_id_index import decode_record
+from lib.recipe_filters import BatchQuery, RecipeFilter, recipe_filters
+from lib.recipe_indexes import CategoryTree, CompletionIndex, FuzzyIndex, field_key, normalize_key
+from lib.recipe_text_index import SEARCH_FIELDS, query_terms, search_texts
+from lib.recipe_query_stats import count, current_stats, note_access, timed
+from lib.recipe_pages import PageRequest, RecipePage, make_page, slice_positions
+from lib.recipe_snapshot import DatasetFingerprint, dataset_fingerprint, dump_json, project_recipe, recipe_fields
+
+
+SQLITE_SUFFIX = ".sqlite"
+
+# Bumped whenever the tables or the way their keys are computed change
+SCHEMA_VERSION = 4
+
+_SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE recipes (
+    position INTEGER PRIMARY KEY,
+    id TEXT,
+    name_key TEXT,
+    category_key TEXT,
+    subcategory_key TEXT,
+    dependency_key TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX recipes_category ON recipes (category_key, subcategory_key);
+CREATE INDEX recipes_subcategory ON recipes (subcategory_key);
+CREATE INDEX recipes_id ON recipes (id);
+CREATE INDEX recipes_dependency ON recipes (dependency_key);
+CREATE TABLE recipe_tags (
+    tag_key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (tag_key, position)
+) WITHOUT ROWID;
+CREATE TABLE category_counts (
+    category_key TEXT NOT NULL,
+    subcategory_key TEXT,
+    recipes INTEGER NOT NULL
+);
+"""
+
+# Contentless trigram table: MATCH on a phrase finds substrings of three or more characters
+_FTS_SCHEMA = "CREATE VIRTUAL TABLE recipes_fts USING fts5(name, description, content='', tokenize='trigram')"
+
+# Records are fetched by position in batches below SQLite's default variable limit
+_POSITION_BATCH = 500
+
+# Word index over the tokenized name, description and package, ranked with bm25()
+_SEARCH_SCHEMA = ("CREATE VIRTUAL TABLE recipes_search USING fts5(name, description, package, content='', "
+                  "tokenize='unicode61 remove_diacritics 0')")
+
+# SQL condition of each find_recipes filter, selecting and excluding; keys missing
+# from a recipe are NULL, which never matches and is never excluded
+_FILTER_CLAUSES = {
+    'category': ("category_key = ?", "category_key IS NOT ?"),
+    'subcategory': ("subcategory_key = ?", "subcategory_key IS NOT ?"),
+    'tag': ("position IN (SELECT position FROM recipe_tags WHERE tag_key = ?)",
+            "position NOT IN (SELECT position FROM recipe_tags WHERE tag_key = ?)"),
+    'dependency': ("instr(dependency_key, ?) > 0", "coalesce(instr(dependency_key, ?), 0) = 0"),
+    'name': ("instr(name_key, ?) > 0", "coalesce(instr(name_key, ?), 0) = 0"),
+}
+
+_TABLES = ("recipes_search", "recipes_fts", "category_counts", "recipe_tags", "recipes", "meta")
+
+
+class SqliteRecipeRepository(RecipeRepository):
+    """
+    RecipeRepository backed by an SQLite database built from the recipes JSON file.
+
+    Queries run against B-tree indexes on category, sub-category, id, dependency and
+    tags, and an FTS5 trigram table over names and descriptions, so memory use is
+    bounded by the size of the results. Recipe counts per category and sub-category
+    are aggregated when the database is built. The database is rebuilt whenever the
+    JSON file or its .sha256 file changes.
+    """
+
+    def __init__(self, json_file_path: str, db_path: Optional[str] = None, resident: bool = False):
+        """
+        Initialize the repository.
+
+        Args:
+            json_file_path: Path to the JSON file containing the recipes
+            db_path: Path of the SQLite database; defaults to the JSON path with a
+                .sqlite suffix. Use ":memory:" for a private in-memory database.
+            resident: Accepted for compatibility with RecipeRepository and ignored
+        """
+        super().__init__(json_file_path)
+        self.db_path = db_path or json_file_path + SQLITE_SUFFIX
+        self._connection: Optional[sqlite3.Connection] = None
+        self._connection_lock = threading.RLock()
+        self._fingerprint: Optional[DatasetFingerprint] = None
+        self._has_fts = False
+        self._has_search = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Get the database connection, rebuilding the database if the dataset changed.
+
+        Returns:
+            Open connection to an up-to-date database
+        """
+        fingerprint = dataset_fingerprint(self.json_file_path)
+        if self._connection is not None and self._fingerprint == fingerprint:
+            return self._connection
+
+        with self._connection_lock:
+            if self._connection is None:
+                # Autocommit mode: transactions are opened explicitly when rebuilding
+                self._connection = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+
+            if self._fingerprint != fingerprint:
+                stored = self._read_meta('fingerprint')
+                if stored != json.dumps(fingerprint) or self._read_meta('schema') != str(SCHEMA_VERSION):
+                    with timed('load'):
+                        self._rebuild(fingerprint)
+                self._has_fts = self._read_meta('fts') == 'true'
+                self._has_search = self._read_meta('search') == 'true'
+                self._fingerprint = fingerprint
+
+        return self._connection
+
+    def _read_meta(self, key: str) -> Optional[str]:
+        try:
+            row = self._connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        except sqlite3.OperationalError:
+            return None
+        return row[0] if row else None
+
+    def _rebuild(self, fingerprint: DatasetFingerprint) -> None:
+        """
+        Recreate the database content from the JSON file in a single transaction.
+
+        Args:
+            fingerprint: Fingerprint of the dataset taken before reading it
+        """
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for table in _TABLES:
+                connection.execute(f"DROP TABLE IF EXISTS {table}")
+            # executescript() would commit the open transaction, so statements run one by one
+            for statement in _SCHEMA.split(';'):
+                if statement.strip():
+                    connection.execute(statement)
+
+            try:
+                connection.execute(_FTS_SCHEMA)
+                has_fts = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5 or the trigram tokenizer: names are scanned
+                has_fts = False
+
+            try:
+                connection.execute(_SEARCH_SCHEMA)
+                has_search = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5: search_recipes uses the in-memory index
+                has_search = False
+
+            for position, recipe in enumerate(self._stream_recipes()):
+                self._insert_recipe(connection, position, recipe, has_fts, has_search)
+
+            connection.execute(
+                "INSERT INTO category_counts (category_key, subcategory_key, recipes) "
+                "SELECT category_key, subcategory_key, COUNT(*) FROM recipes WHERE category_key IS NOT NULL "
+                "GROUP BY category_key, subcategory_key")
+
+            connection.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", [
+                ('fingerprint', json.dumps(fingerprint)),
+                ('schema', str(SCHEMA_VERSION)),
+                ('fts', 'true' if has_fts else 'false'),
+                ('search', 'true' if has_search else 'false')
+            ])
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _insert_recipe(connection: sqlite3.Connection, position: int, recipe: Dict[str, Any],
+                       has_fts: bool, has_search: bool) -> None:
+        category_val = recipe.get('category')
+        recipe_id = recipe.get('id')
+        name_key = field_key(recipe, 'name', '')
+
+        connection.execute(
+            "INSERT INTO recipes (position, id, name_key, category_key, subcategory_key, dependency_key, record) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                position,
+                recipe_id if isinstance(recipe_id, str) else None,
+                name_key,
+                normalize_key(category_val) if category_val and isinstance(category_val, str) else None,
+                field_key(recipe, 'sub-category'),
+                field_key(recipe, 'dependency', ''),
+                dump_json(recipe)
+            )
+        )
+
+        tags = recipe.get('tags', [])
+        if isinstance(tags, list):
+            connection.executemany(
+                "INSERT OR IGNORE INTO recipe_tags (tag_key, position) VALUES (?, ?)",
+                [(normalize_key(tag), position) for tag in tags if isinstance(tag, str)]
+            )
+
+        if has_fts:
+            connection.execute(
+                "INSERT INTO recipes_fts (rowid, name, description) VALUES (?, ?, ?)",
+                (position, name_key, field_key(recipe, 'description'))
+            )
+
+        if has_search:
+            connection.execute(
+                "INSERT INTO recipes_search (rowid, name, description, package) VALUES (?, ?, ?, ?)",
+                (position, *search_texts(recipe))
+            )
+
+    @staticmethod
+    def _explain_query(connection: sqlite3.Connection, sql: str, params: Tuple) -> None:
+        """Record the SQLite query plan steps of a statement as access paths when explaining."""
+        if current_stats() is not None:
+            for row in connection.execute("EXPLAIN QUERY PLAN " + sql, params):
+                note_access('sqlite ' + row[-1])
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        with self._connection_lock:
+            connection = self._connect()
+            self._explain_query(connection, sql, params)
+            with timed('query'):
+                return connection.execute(sql, params).fetchall()
+
+    def _current_category_tree(self) -> CategoryTree:
+        """
+        Get the category tree of the dataset, read from its aggregate table once per dataset version.
+
+        Returns:
+            Sorted categories and sub-categories with their recipe counts
+        """
+        with self._connection_lock:
+            connection = self._connect()
+            cached = self._category_tree
+            if cached is not None and cached[0] == self._fingerprint:
+                note_access('cached category tree')
+                return cached[1]
+
+            note_access('sqlite category_counts')
+            counts: Dict[str, Dict[Optional[str], int]] = {}
+            for category, subcategory, recipes in connection.execute(
+                    "SELECT category_key, subcategory_key, recipes FROM category_counts"):
+                counts.setdefault(category, {})[subcategory] = recipes
+
+            tree = CategoryTree.from_counts(counts)
+            self._category_tree = (self._fingerprint, tree)
+            return tree
+
+    def _current_fuzzy_name_index(self) -> FuzzyIndex:
+        """
+        Get the edit-distance index of the recipe names, built from the name keys once per dataset version.
+
+        Returns:
+            Trie over the name keys of the recipes
+        """
+        with self._connection_lock:
+            self._connect()
+            cached = self._fuzzy_name_index
+            if cached is not None and cached[0] == self._fingerprint:
+                note_access('cached fuzzy name index')
+                return cached[1]
+
+            with timed('build'):
+                index = FuzzyIndex([row[0] for row in self._query("SELECT name_key FROM recipes ORDER BY position")])
+            self._fuzzy_name_index = (self._fingerprint, index)
+            return index
+
+    def _current_completion_index(self) -> CompletionIndex:
+        """
+        Get the prefix index of the recipe names and packages, built from the records once per dataset version.
+
+        Returns:
+            Sorted array of the name and package keys of the recipes
+        """
+        with self._connection_lock:
+            self._connect()
+            cached = self._completion_index
+            if cached is not None and cached[0] == self._fingerprint:
+                note_access('cached completion index')
+                return cached[1]
+
+            with timed('build'):
+                index = CompletionIndex(self._records(self._query("SELECT record FROM recipes ORDER BY position")))
+            self._completion_index = (self._fingerprint, index)
+            return index
+
+    @staticmethod
+    def _records(rows: Iterable[Tuple]) -> List[Dict[str, Any]]:
+        records = [row[-1] for row in rows]
+        count(decoded=len(records), bytes_read=sum(len(record) for record in records))
+        return [decode_record(record) for record in records]
+
+    def _records_at(self, positions: Sequence[int],
+                    fields: Optional[Tuple[str, ...]] = None) -> List[Dict[str, Any]]:
+        """
+        Read the records at the given positions, in file order, reduced to the requested fields.
+
+        Must be called with the connection lock held, right after the positions
+        were queried, so both reads see the same version of the database.
+        """
+        records = []
+        with timed('fetch'):
+            for start in range(0, len(positions), _POSITION_BATCH):
+                batch = tuple(positions[start:start + _POSITION_BATCH])
+                sql = f"SELECT record FROM recipes WHERE position IN ({','.join('?' * len(batch))}) ORDER BY position"
+                self._explain_query(self._connection, sql, batch)
+                records.extend(self._records(self._connection.execute(sql, batch).fetchall()))
+        if fields is not None:
+            return [project_recipe(record, fields, copy=False) for record in records]
+        return records
+
+    def _records_in_order(self, positions: Sequence[int],
+                          fields: Optional[Tuple[str, ...]]) -> List[Dict[str, Any]]:
+        """
+        Read the records at the given positions of a ranked query, in the given order.
+
+        Must be called with the connection lock held, like _records_at.
+        """
+        records = dict(zip(sorted(positions), self._records_at(sorted(positions), fields)))
+        return [records[position] for position in positions]
+
+    def _paged_records(self, positions: Sequence[int], page: Optional[PageRequest],
+                       fields: Optional[Tuple[str, ...]]) -> Union[List[Dict[str, Any]], RecipePage]:
+        """
+        Read the records of a query from the sorted positions of its matches.
+
+        Only the records on the page are read and decoded.
+        """
+        if page is None:
+            return self._records_at(positions, fields)
+
+        selected, has_more = slice_positions(positions, page)
+        return make_page(self._records_at(selected, fields), len(positions), selected[-1] if selected else None,
+                         has_more, page)
+
+    def get_recipes_by_category(self, category: str, subcategory: Optional[str] = None,
+                                limit: Optional[int] = None, offset: int = 0,
+                                cursor: Optional[str] = None,
+                                fields: Optional[Sequence[str]] = None) -> Union[List[Dict[str, Any]], RecipePage]:
+        """
+        Get recipes by category and optional subcategory.
+
+        Args:
+            category: The category name to filter by
+            subcategory: Optional subcategory name to further filter
+            limit: Maximum number of recipes to return
+            offset: Number of matching recipes to skip
+            cursor: next_cursor of the previous page, instead of offset
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
+
+        Returns:
+            List of recipe dictionaries matching the criteria, or a page dict with
+            'recipes', 'total' and 'next_cursor' keys when limit, offset or cursor is given
+        """
+        fields = recipe_fields(fields)
+        page = self._page_request(limit, offset, cursor)
+        if not category or not isinstance(category, str):
+            return self._no_results(page)
+
+        with self._connection_lock:
+            if subcategory and isinstance(subcategory, str):
+                rows = self._query(
+                    "SELECT position FROM recipes WHERE category_key = ? AND subcategory_key = ? ORDER BY position",
+                    (normalize_key(category), normalize_key(subcategory)))
+            else:
+                rows = self._query(
+                    "SELECT position FROM recipes WHERE category_key = ? ORDER BY position",
+                    (normalize_key(category),))
+            return self._paged_records([row[0] for row in rows], page, fields)
+
+    def get_recipes_by_tag(self, tag: str, limit: Optional[int] = None, offset: int = 0,
+                           cursor: Optional[str] = None,
+                           fields: Optional[Sequence[str]] = None) -> Union[List[Dict[str, Any]], RecipePage]:
+        """
+        Get recipes that contain a specific tag.
+
+        Args:
+            tag: The tag to search for
+            limit: Maximum number of recipes to return
+            offset: Number of matching recipes to skip
+            cursor: next_cursor of the previous page, instead of offset
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
+
+        Returns:
+            List of recipe dictionaries containing the tag, or a page dict with
+            'recipes', 'total' and 'next_cursor' keys when limit, offset or cursor is given
+        """
+        fields = recipe_fields(fields)
+        page = self._page_request(limit, offset, cursor)
+        if not tag or not isinstance(tag, str):
+            return self._no_results(page)
+
+        with self._connection_lock:
+            rows = self._query(
+                "SELECT position FROM recipe_tags WHERE tag_key = ? ORDER BY position", (normalize_key(tag),))
+            return self._paged_records([row[0] for row in rows], page, fields)
+
+    def get_all_tags(self) -> List[Dict[str, Any]]:
+        """
+        Get all unique tags with the number of recipes carrying each one.
+
+        Returns:
+            List of dicts with 'tag' and 'count' keys, sorted alphabetically by tag
+        """
+        rows = self._query(
+            "SELECT tag_key, COUNT(*) FROM recipe_tags WHERE tag_key != '' GROUP BY tag_key ORDER BY tag_key")
+        return [{'tag': tag, 'count': count} for tag, count in rows]
+
+    def get_recipes_by_name(self, name_query: str, limit: Optional[int] = None, offset: int = 0,
+                            cursor: Optional[str] = None, fields: Optional[Sequence[str]] = None,
+                            max_distance: Optional[int] = None) -> Union[List[Dict[str, Any]], RecipePage]:
+        """
+        Get recipes by partial name match (case-insensitive).
+
+        Args:
+            name_query: The partial name to search for, or the whole name with max_distance
+            limit: Maximum number of recipes to return
+            offset: Number of matching recipes to skip
+            cursor: next_cursor of the previous page, instead of offset
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
+            max_distance: Maximum edit distance between the query and a name, or None
+                for substring matching
+
+        Returns:
+            List of recipe dictionaries with names containing the query (or close to it),
+            or a page dict with 'recipes', 'total' and 'next_cursor' keys when limit,
+            offset or cursor is given
+        """
+        if max_distance is not None:
+            # Typo-tolerant lookups walk the in-memory name trie, then read the records here
+            with self._connection_lock:
+                return super().get_recipes_by_name(name_query, limit, offset, cursor, fields, max_distance)
+
+        fields = recipe_fields(fields)
+        page = self._page_request(limit, offset, cursor)
+        if not name_query or not isinstance(name_query, str):
+            return self._no_results(page)
+
+        query_key = normalize_key(name_query)
+        with self._connection_lock:
+            self._connect()
+            if self._has_fts and len(query_key) >= 3:
+                # The trigram table folds case on its own, so candidates are checked
+                # again with the same test as the streaming path
+                phrase = '"' + query_key.replace('"', '""') + '"'
+                rows = self._query(
+                    "SELECT r.position, r.name_key FROM recipes r WHERE r.position IN "
+                    "(SELECT rowid FROM recipes_fts WHERE recipes_fts MATCH ?) ORDER BY r.position",
+                    ('name : ' + phrase,))
+            else:
+                rows = self._query(
+                    "SELECT position, name_key FROM recipes WHERE instr(name_key, ?) > 0 ORDER BY position",
+                    (query_key,))
+
+            return self._paged_records(
+                [position for position, name_key in rows if name_key is not None and query_key in name_key], page, fields)
+
+    def get_recipe_by_id(self, recipe_id: str, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Get a single recipe by its ID.
+
+        Args:
+            recipe_id: The recipe ID to search for
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
+
+        Returns:
+            Recipe dictionary if found, empty dict if not found
+        """
+        fields = recipe_fields(fields)
+        if not recipe_id or not isinstance(recipe_id, str):
+            return {}
+
+        rows = self._query("SELECT record FROM recipes WHERE id = ? ORDER BY position LIMIT 1", (recipe_id,))
+        if not rows:
+            return {}
+
+        recipe = self._records(rows)[0]
+        return project_recipe(recipe, fields, copy=False) if fields is not None else recipe
+
+    def _find_ids(self, recipe_ids: List[str], fields: Optional[Tuple[str, ...]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Find the recipes carrying the given ids through the id index, in batches.
+
+        Returns:
+            Mapping of each id found to its first recipe
+        """
+        found: Dict[str, Dict[str, Any]] = {}
+        with self._connection_lock:
+            for start in range(0, len(recipe_ids), _POSITION_BATCH):
+                batch = tuple(recipe_ids[start:start + _POSITION_BATCH])
+                rows = self._query(
+                    f"SELECT id, record FROM recipes WHERE id IN ({','.join('?' * len(batch))}) ORDER BY position",
+                    batch)
+                for (recipe_id, _), recipe in zip(rows, self._records(rows)):
+                    if recipe_id not in found:
+                        found[recipe_id] = project_recipe(recipe, fields, copy=False) if fields is not None else recipe
+        return found
+
+    def get_recipes_by_dependency(self, dependency: str, limit: Optional[int] = None, offset: int = 0,
+                                  cursor: Optional[str] = None,
+                                  fields: Optional[Sequence[str]] = None) -> Union[List[Dict[str, Any]], RecipePage]:
+        """
+        Get recipes by dependency (partial match, case-insensitive).
+
+        Args:
+            dependency: The dependency string to search for
+            limit: Maximum number of recipes to return
+            offset: Number of matching recipes to skip
+            cursor: next_cursor of the previous page, instead of offset
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
+
+        Returns:
+            List of recipe dictionaries with matching dependencies, or a page dict with
+            'recipes', 'total' and 'next_cursor' keys when limit, offset or cursor is given
+        """
+        fields = recipe_fields(fields)
+        page = self._page_request(limit, offset, cursor)
+        if not dependency or not isinstance(dependency, str):
+            return self._no_results(page)
+
+        # The substring is matched once per distinct dependency, read from its index
+        with self._connection_lock:
+            rows = self._query(
+                "SELECT position FROM recipes WHERE dependency_key IN "
+                "(SELECT DISTINCT dependency_key FROM recipes WHERE instr(dependency_key, ?) > 0) ORDER BY position",
+                (normalize_key(dependency),))
+            return self._paged_records([row[0] for row in rows], page, fields)
+
+    def find_recipes(self, category: Optional[str] = None, subcategory: Optional[str] = None,
+                     tag: Optional[str] = None, dependency: Optional[str] = None, name: Optional[str] = None,
+                     exclude_category: Optional[str] = None, exclude_subcategory: Optional[str] = None,
+                     exclude_tag: Optional[str] = None, exclude_dependency: Optional[str] = None,
+                     exclude_name: Optional[str] = None, limit: Optional[int] = None, offset: int = 0,
+                     cursor: Optional[str] = None,
+                     fields: Optional[Sequence[str]] = None) -> Union[List[Dict[str, Any]], RecipePage]:
+        """
+        Get the recipes matching every given filter.
+
+        The filters become one WHERE clause, so SQLite picks the most selective
+        index and checks the other conditions on the rows it returns.
+
+        Args:
+            category: Category the recipes belong to
+            subcategory: Sub-category the recipes belong to, in any category
+            tag: Tag the recipes carry
+            dependency: Substring of the recipe dependency
+            name: Substring of the recipe name
+            exclude_category: Category the recipes must not belong to
+            exclude_subcategory: Sub-category the recipes must not belong to
+            exclude_tag: Tag the recipes must not carry
+            exclude_dependency: Substring the recipe dependency must not contain
+            exclude_name: Substring the recipe name must not contain
+            limit: Maximum number of recipes to return
+            offset: Number of matching recipes to skip
+            cursor: next_cursor of the previous page, instead of offset
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
+
+        Returns:
+            List of recipe dictionaries in file order, or a page dict with 'recipes',
+            'total' and 'next_cursor' keys when limit, offset or cursor is given
+        """
+        filters = recipe_filters({
+            'category': category, 'subcategory': subcategory, 'tag': tag, 'dependency': dependency, 'name': name,
+            'exclude_category': exclude_category, 'exclude_subcategory': exclude_subcategory,
+            'exclude_tag': exclude_tag, 'exclude_dependency': exclude_dependency, 'exclude_name': exclude_name
+        })
+        fields = recipe_fields(fields)
+        page = self._page_request(limit, offset, cursor)
+
+        clauses = [_FILTER_CLAUSES[recipe_filter.name][recipe_filter.exclude] for recipe_filter in filters]
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        with self._connection_lock:
+            rows = self._query(f"SELECT position FROM recipes{where} ORDER BY position",
+                               tuple(recipe_filter.key for recipe_filter in filters))
+            return self._paged_records([row[0] for row in rows], page, fields)
+
+    def search_recipes(self, query: str, limit: int = 10,
+                       fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Search recipes by free text over their name, description and package.
+
+        Args:
+            query: Free text to search for, e.g. "junit 5 migration"
+            limit: Maximum number of recipes to return
+            fields: Recipe keys to return, e.g. ['id', 'name', 'package']; all keys when None
+
+        Returns:
+            List of recipe dictionaries, most relevant first
+        """
+        with self._connection_lock:
+            self._connect()
+            if not self._has_search:
+                return super().search_recipes(query, limit, fields)
+
+            fields = recipe_fields(fields)
+            if not isinstance(limit, int) or isinstance(limit, bool) or limit < 1:
+                raise ValueError("limit must be a positive integer")
+            terms = query_terms(query) if query and isinstance(query, str) else []
+            if not terms:
+                return []
+
+            # bm25() is lower for better matches; columns are weighted like the in-memory index
+            weights = ', '.join(str(weight) for _, weight in SEARCH_FIELDS)
+            rows = self._query(
+                f"SELECT r.record FROM recipes_search s JOIN recipes r ON r.position = s.rowid "
+                f"WHERE recipes_search MATCH ? ORDER BY bm25(recipes_search, {weights}), s.rowid LIMIT ?",
+                (' OR '.join('"' + term + '"' for term in terms), limit))
+
+        records = self._records(rows)
+        return [project_recipe(record, fields, copy=False) for record in records] if fields is not None else records
+
+    def _scan_queries(self, batch: List[BatchQuery]) -> List[Any]:
+        """
+        Answer a batch of validated queries one by one, each through the database indexes.
+
+        Returns:
+            Result of each query, in query order
+        """
+        return [getattr(self, query.method)(**query.arguments) for query in batch]
+
+    def _iter_filtered(self, filters: List[RecipeFilter],
+                       fields: Optional[Tuple[str, ...]]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the recipes passing every filter, in file order, reading them in batches.
+
+        Each batch resumes after the position of the previous one, so only one batch
+        of records is held at a time and the connection lock is released between
+        batches.
+        """
+        clauses = [_FILTER_CLAUSES[recipe_filter.name][recipe_filter.exclude] for recipe_filter in filters]
+        where = "".join(" AND " + clause for clause in clauses)
+        keys = tuple(recipe_filter.key for recipe_filter in filters)
+        after = -1
+        while True:
+            rows = self._query(f"SELECT position, record FROM recipes WHERE position > ?{where} "
+                               f"ORDER BY position LIMIT ?", (after,) + keys + (_POSITION_BATCH,))
+            for record in self._records(rows):
+                yield project_recipe(record, fields, copy=False) if fields is not None else record
+            if len(rows) < _POSITION_BATCH:
+                return
+            after = rows[-1][0]
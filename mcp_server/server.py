@@ -9,6 +9,7 @@ from pydantic import BaseModel, Field
 from mcp.server import FastMCP
 from lib.recipe_repository import RecipeRepository
 from lib.mcp_service import RecipeMcpService
+from lib.recipe_query_cache import query_cache_from_env
 
 def build_server() -> FastMCP:
     """
@@ -18,15 +19,20 @@ def build_server() -> FastMCP:
     Returns:
         Configured FastMCP Server instance
     """
-    # Initialize repository and service with fixed path
-    repository = RecipeRepository('resource/db/recipes.json')
-    service = RecipeMcpService(repository)
+    # Initialize repository and service with fixed path. The server is long-running,
+    # so the dataset is kept resident instead of being parsed on every tool call.
+    repository = RecipeRepository('resource/db/recipes.json', resident=True)
+    # Pick up database updates in the background, without a restart or a slow query
+    repository.watch()
+    # Repeated tool calls are answered from a result cache until the database changes
+    service = RecipeMcpService(repository, cache=query_cache_from_env())
 
     server = FastMCP("openrewrite-recipes")
 
     @server.tool()
     async def get_recipe_by_id(
-        recipe_id: str = Field(description="The recipe ID to search for (md5/canonical), e.g., ebe22a8d0299cd2871cb0bb4d5339906")
+        recipe_id: str = Field(description="The recipe ID to search for (md5/canonical), e.g., ebe22a8d0299cd2871cb0bb4d5339906"),
+        fields: Optional[List[str]] = Field(default=None, description="Optional recipe keys to return, e.g., ['id', 'name', 'package']; all keys when omitted")
     ) -> str:
         """
         Get a single OpenRewrite recipe by its ID (md5 string).
@@ -38,30 +44,63 @@ def build_server() -> FastMCP:
             Response format: {"name": "Recipe Name", "id": "recipe.id", "category": "category", ...}
             or {} if recipe not found
         """
-        result = service.get_recipe_by_id(recipe_id)
+        result = service.get_recipe_by_id(recipe_id, fields)
+        return str(result)
+
+    @server.tool()
+    async def get_recipes_by_ids(
+        recipe_ids: List[str] = Field(description="Recipe IDs (md5) to look up, e.g., ['ebe22a8d0299cd2871cb0bb4d5339906', 'ac355b9c7c78c7fa01d7b5b630faea44']"),
+        fields: Optional[List[str]] = Field(default=None, description="Optional recipe keys to return, e.g., ['id', 'name', 'package']; all keys when omitted")
+    ) -> str:
+        """
+        Get several OpenRewrite recipes by their IDs in one call.
+
+        Prefer this tool over repeated get_recipe_by_id calls when resolving IDs collected
+        from earlier answers: all IDs are looked up at once.
+
+        Returns:
+            JSON string containing the recipes found, in the order of the given IDs, and the IDs not found.
+            Response format: {"recipes": [{"name": "Recipe Name", "id": "recipe.id", ...}, ...], "missing": ["unknown.id", ...]}
+        """
+        result = service.get_recipes_by_ids(recipe_ids, fields)
         return str(result)
 
     @server.tool()
     async def get_recipes_by_name(
-        name_query: str = Field(description="Case-insensitive substring to match in recipe names, e.g., 'NoGuavaPrimitiveAsList' or 'PreferJavaUtilObjectsEquals'")
+        name_query: str = Field(description="Case-insensitive substring to match in recipe names, e.g., 'NoGuavaPrimitiveAsList' or 'PreferJavaUtilObjectsEquals'"),
+        limit: Optional[int] = Field(default=None, description="Optional maximum number of recipes to return; the response becomes a page object"),
+        offset: int = Field(default=0, description="Optional number of matching recipes to skip"),
+        cursor: Optional[str] = Field(default=None, description="Optional next_cursor of the previous page, used instead of offset"),
+        fields: Optional[List[str]] = Field(default=None, description="Optional recipe keys to return, e.g., ['id', 'name', 'package']; all keys when omitted"),
+        max_distance: Optional[int] = Field(default=None, description="Optional maximum number of mistyped characters for a typo-tolerant lookup of a whole recipe name, e.g., 2; closest names come first")
     ) -> str:
         """
         Get OpenRewrite recipes by partial name match (case-insensitive).
 
         Searches for recipes in the OpenRewrite recipes database where the name contains
         the provided query string (case-insensitive partial match).
+        With max_distance, the query is compared to whole names instead and recipes whose
+        name differs from it by at most max_distance inserted, deleted or substituted
+        characters are returned, closest first. Use it when an exact name finds nothing.
 
         Returns:
             JSON string containing a list of matching recipes or empty list [] if none found.
             Response format: [{"name": "Recipe Name", "id": "recipe.id", "category": "category", ...}, ...]
             or [] if no recipes match the query
+            When limit, offset or cursor is given, a page object is returned instead:
+            {"recipes": [...], "total": 1342, "next_cursor": "..."} where next_cursor is null on the last page
+            and total is null when it is not known without reading the whole database.
         """
-        result = service.get_recipes_by_name(name_query)
+        result = service.get_recipes_by_name(name_query, limit, offset, cursor, fields, max_distance)
         return str(result)
 
     @server.tool()
     async def get_recipes_by_tag(
-        tag: str = Field(description="Exact tag to filter by, e.g., 'spring', 'java', 'database'")
+        tag: str = Field(description="Exact tag to filter by, e.g., 'spring', 'java', 'database'"),
+        limit: Optional[int] = Field(default=None, description="Optional maximum number of recipes to return; the response becomes a page object"),
+        offset: int = Field(default=0, description="Optional number of matching recipes to skip"),
+        cursor: Optional[str] = Field(default=None, description="Optional next_cursor of the previous page, used instead of offset"),
+        fields: Optional[List[str]] = Field(default=None, description="Optional recipe keys to return, e.g., ['id', 'name', 'package']; all keys when omitted")
     ) -> str:
         """
         Get OpenRewrite recipes that contain a specific tag.
@@ -73,14 +112,36 @@ def build_server() -> FastMCP:
             JSON string containing a list of recipes with the specified tag or empty list [] if none found.
             Response format: [{"name": "Recipe Name", "id": "recipe.id", "tags": ["tag1", "tag2"], ...}, ...]
             or [] if no recipes contain the specified tag
+            When limit, offset or cursor is given, a page object is returned instead:
+            {"recipes": [...], "total": 1342, "next_cursor": "..."} where next_cursor is null on the last page
+            and total is null when it is not known without reading the whole database.
+        """
+        result = service.get_recipes_by_tag(tag, limit, offset, cursor, fields)
+        return str(result)
+
+    @server.tool()
+    async def get_all_tags() -> str:
+        """
+        Get all unique tags from the OpenRewrite recipes database with their recipe counts.
+
+        Retrieves every tag used in the OpenRewrite recipes database (lowercased), sorted
+        alphabetically, together with the number of recipes carrying it.
+
+        Returns:
+            JSON string containing a list of tag objects.
+            Response format: [{"tag": "tag1", "count": 12}, {"tag": "tag2", "count": 3}, ...]
         """
-        result = service.get_recipes_by_tag(tag)
+        result = service.get_all_tags()
         return str(result)
 
     @server.tool()
     async def get_recipes_by_category(
         category: str = Field(description="Category name to filter by, e.g., 'spring', 'java', 'testing'"),
-        subcategory: Optional[str] = Field(default=None, description="Optional subcategory to further filter, e.g., 'jdbc', 'web', 'junit'")
+        subcategory: Optional[str] = Field(default=None, description="Optional subcategory to further filter, e.g., 'jdbc', 'web', 'junit'"),
+        limit: Optional[int] = Field(default=None, description="Optional maximum number of recipes to return; the response becomes a page object"),
+        offset: int = Field(default=0, description="Optional number of matching recipes to skip"),
+        cursor: Optional[str] = Field(default=None, description="Optional next_cursor of the previous page, used instead of offset"),
+        fields: Optional[List[str]] = Field(default=None, description="Optional recipe keys to return, e.g., ['id', 'name', 'package']; all keys when omitted")
     ) -> str:
         """
         Get OpenRewrite recipes by category and optional subcategory.
@@ -92,13 +153,20 @@ def build_server() -> FastMCP:
             JSON string containing a list of recipes in the specified category/subcategory or empty list [] if none found.
             Response format: [{"name": "Recipe Name", "id": "recipe.id", "category": "category", "sub-category": "subcategory", ...}, ...]
             or [] if no recipes match the criteria
+            When limit, offset or cursor is given, a page object is returned instead:
+            {"recipes": [...], "total": 1342, "next_cursor": "..."} where next_cursor is null on the last page
+            and total is null when it is not known without reading the whole database.
         """
-        result = service.get_recipes_by_category(category, subcategory)
+        result = service.get_recipes_by_category(category, subcategory, limit, offset, cursor, fields)
         return str(result)
 
     @server.tool()
     async def get_recipes_by_dependency(
-        dependency: str = Field(description="Partial dependency identifier, e.g., 'rewrite-migrate-java', 'rewrite-migrate-jackson', 'rewrite-micronaut'")
+        dependency: str = Field(description="Partial dependency identifier, e.g., 'rewrite-migrate-java', 'rewrite-migrate-jackson', 'rewrite-micronaut'"),
+        limit: Optional[int] = Field(default=None, description="Optional maximum number of recipes to return; the response becomes a page object"),
+        offset: int = Field(default=0, description="Optional number of matching recipes to skip"),
+        cursor: Optional[str] = Field(default=None, description="Optional next_cursor of the previous page, used instead of offset"),
+        fields: Optional[List[str]] = Field(default=None, description="Optional recipe keys to return, e.g., ['id', 'name', 'package']; all keys when omitted")
     ) -> str:
         """
         Get OpenRewrite recipes by dependency package name (partial match, case-insensitive).
@@ -110,8 +178,109 @@ def build_server() -> FastMCP:
             JSON string containing a list of recipes with matching dependencies or empty list [] if none found.
             Response format: [{"name": "Recipe Name", "id": "recipe.id", "dependency": "dependency.string", ...}, ...]
             or [] if no recipes have matching dependencies
+            When limit, offset or cursor is given, a page object is returned instead:
+            {"recipes": [...], "total": 1342, "next_cursor": "..."} where next_cursor is null on the last page
+            and total is null when it is not known without reading the whole database.
         """
-        result = service.get_recipes_by_dependency(dependency)
+        result = service.get_recipes_by_dependency(dependency, limit, offset, cursor, fields)
+        return str(result)
+
+    @server.tool()
+    async def find_recipes(
+        category: Optional[str] = Field(default=None, description="Optional category the recipes belong to, e.g., 'java' or 'spring'"),
+        subcategory: Optional[str] = Field(default=None, description="Optional sub-category the recipes belong to, in any category, e.g., 'testing/junit5'"),
+        tag: Optional[str] = Field(default=None, description="Optional tag the recipes carry, e.g., 'junit' or 'spring/boot3'"),
+        dependency: Optional[str] = Field(default=None, description="Optional partial dependency identifier, e.g., 'rewrite-testing-frameworks'"),
+        name: Optional[str] = Field(default=None, description="Optional substring of the recipe names, e.g., 'Assert'"),
+        exclude_category: Optional[str] = Field(default=None, description="Optional category the recipes must not belong to"),
+        exclude_subcategory: Optional[str] = Field(default=None, description="Optional sub-category the recipes must not belong to"),
+        exclude_tag: Optional[str] = Field(default=None, description="Optional tag the recipes must not carry"),
+        exclude_dependency: Optional[str] = Field(default=None, description="Optional partial dependency identifier the recipes must not match"),
+        exclude_name: Optional[str] = Field(default=None, description="Optional substring the recipe names must not contain"),
+        limit: Optional[int] = Field(default=None, description="Optional maximum number of recipes to return; the response becomes a page object"),
+        offset: int = Field(default=0, description="Optional number of matching recipes to skip"),
+        cursor: Optional[str] = Field(default=None, description="Optional next_cursor of the previous page, used instead of offset"),
+        fields: Optional[List[str]] = Field(default=None, description="Optional recipe keys to return, e.g., ['id', 'name', 'package']; all keys when omitted")
+    ) -> str:
+        """
+        Get OpenRewrite recipes matching several filters at once (case-insensitive).
+
+        Combines the filters of the other recipe tools in one call, e.g. the java recipes tagged
+        junit from rewrite-testing-frameworks. Categories, sub-categories and tags match whole
+        values; dependencies and names match substrings. Each exclude_ filter drops the recipes
+        its counterpart would select. Omitted filters are ignored.
+
+        Returns:
+            JSON string containing a list of the recipes matching every filter or empty list [] if none found.
+            Response format: [{"name": "Recipe Name", "id": "recipe.id", "category": "category", ...}, ...]
+            When limit, offset or cursor is given, a page object is returned instead:
+            {"recipes": [...], "total": 1342, "next_cursor": "..."} where next_cursor is null on the last page
+            and total is null when it is not known without reading the whole database.
+        """
+        result = service.find_recipes(category, subcategory, tag, dependency, name, exclude_category,
+                                      exclude_subcategory, exclude_tag, exclude_dependency, exclude_name,
+                                      limit, offset, cursor, fields)
+        return str(result)
+
+    @server.tool()
+    async def search_recipes(
+        query: str = Field(description="Free text to search for in recipe names, descriptions and packages, e.g., 'junit 5 migration' or 'remove unused imports'"),
+        limit: int = Field(default=10, description="Maximum number of recipes to return"),
+        fields: Optional[List[str]] = Field(default=None, description="Optional recipe keys to return, e.g., ['id', 'name', 'package']; all keys when omitted")
+    ) -> str:
+        """
+        Search OpenRewrite recipes by free text, ranked by relevance.
+
+        Matches the words of the query against recipe names, descriptions and packages.
+        CamelCase and dotted identifiers are split into words, and recipes are ranked with
+        BM25, so recipes whose name contains the query words come first.
+
+        Returns:
+            JSON string containing a list of the best matching recipes, most relevant first.
+            Response format: [{"name": "Recipe Name", "id": "recipe.id", "description": "...", ...}, ...]
+            or [] if no recipe contains any of the query words
+        """
+        result = service.search_recipes(query, limit, fields)
+        return str(result)
+
+    @server.tool()
+    async def complete(
+        prefix: str = Field(description="Start of a recipe name or fully qualified package, e.g., 'Upgrade to Java' or 'org.openrewrite.java.migrate.'"),
+        limit: int = Field(default=10, description="Maximum number of completions to return")
+    ) -> str:
+        """
+        Complete the start of a recipe name or package, for search-as-you-type.
+
+        Matches recipe names and fully qualified packages starting with the prefix,
+        ignoring case, in alphabetical order.
+
+        Returns:
+            JSON string containing a list of completions.
+            Response format: [{"value": "org.openrewrite.java.migrate.UpgradeToJava17", "field": "package", "recipes": 1}, ...]
+            or [] if nothing starts with the prefix
+        """
+        result = service.complete(prefix, limit)
+        return str(result)
+
+    @server.tool()
+    async def run_queries(
+        queries: List[Dict[str, Any]] = Field(description="Queries to run, each naming a tool with 'method' and giving its arguments, e.g., [{'method': 'get_recipes_by_tag', 'tag': 'spring', 'fields': ['id', 'name']}, {'method': 'get_recipe_by_id', 'recipe_id': 'ebe22a8d0299cd2871cb0bb4d5339906'}]")
+    ) -> str:
+        """
+        Run several recipe queries in one call.
+
+        Supported methods are get_recipes_by_tag, get_recipes_by_category, get_recipes_by_name,
+        get_recipes_by_dependency, get_recipe_by_id and find_recipes, with the same arguments
+        as the tools of that name except limit, offset and cursor. Prefer this tool over
+        several separate calls: the database is read once for the whole batch.
+
+        Returns:
+            JSON string containing the result of each query, in query order, shaped like the
+            result of its tool.
+            Response format: {"results": [[{"name": "Recipe Name", "id": "recipe.id", ...}, ...], {...}, ...]}
+            with an "error" key and no results when a query is invalid
+        """
+        result = service.run_queries(queries)
         return str(result)
 
     @server.tool()
@@ -169,6 +338,24 @@ def build_server() -> FastMCP:
         result = service.get_categories_with_subcategories()
         return str(result)
 
+    @server.tool()
+    async def get_category_tree() -> str:
+        """
+        Get all categories and subcategories from the OpenRewrite recipes database with their recipe counts.
+
+        Retrieves every category with its subcategories, sorted alphabetically, together with
+        the number of recipes in each category and subcategory.
+
+        Returns:
+            JSON string containing a list of category objects with their counts.
+            Response format: [
+                {"category": "category1", "count": 12, "sub-categories": [{"sub-category": "sub1", "count": 7}, ...]},
+                ...
+            ]
+        """
+        result = service.get_category_tree()
+        return str(result)
+
     @server.tool()
     async def update_recipes_database() -> str:
         """
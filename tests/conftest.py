@@ -0,0 +1,41 @@
+import pytest
+import lib.recipe_repository
+from lib.sqlite_recipe_repository import SqliteRecipeRepository
+
+
+REPOSITORY_BACKENDS = ["json", "sqlite"]
+
+
+def _runs_on_every_backend(module) -> bool:
+    """
+    Tell whether a test module exercises the repository contract.
+
+    Modules importing RecipeRepository run once per backend, except those marked
+    json_backend because they test internals of the JSON implementation.
+    """
+    if getattr(module, 'RecipeRepository', None) is not lib.recipe_repository.RecipeRepository:
+        return False
+
+    marks = getattr(module, 'pytestmark', [])
+    if not isinstance(marks, list):
+        marks = [marks]
+    return not any(mark.name == 'json_backend' for mark in marks)
+
+
+def pytest_generate_tests(metafunc):
+    if _runs_on_every_backend(metafunc.module):
+        metafunc.fixturenames.append('repository_backend')
+        metafunc.parametrize('repository_backend', REPOSITORY_BACKENDS)
+
+
+@pytest.fixture
+def repository_backend(request, monkeypatch):
+    """Point the RecipeRepository name of the test module at the selected backend."""
+    backend = getattr(request, 'param', 'json')
+    if backend == 'sqlite':
+        def create_repository(json_file_path, resident=False):
+            return SqliteRecipeRepository(json_file_path, db_path=':memory:', resident=resident)
+
+        monkeypatch.setattr(request.module, 'RecipeRepository', create_repository)
+
+    return backend
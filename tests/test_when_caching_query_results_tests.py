@@ -0,0 +1,199 @@
+import hashlib
+import json
+import pytest
+from unittest.mock import MagicMock
+from lib.recipe_repository import RecipeRepository
+from lib.mcp_service import RecipeMcpService
+from lib.recipe_query_cache import QueryCache, query_cache_from_env, query_key
+
+
+def write_dataset(path, names, with_sha256=True):
+    content = json.dumps([{"name": name, "id": name.lower(), "tags": ["spring"]} for name in names]).encode()
+    path.write_bytes(content)
+    if with_sha256:
+        (path.parent / (path.name + ".sha256")).write_text(hashlib.sha256(content).hexdigest())
+
+
+class WhenCachingQueryResultsTests:
+    def test_that_keys_should_normalize_keyword_order_test(self):
+        assert query_key("find_recipes", [], {"tag": "a", "name": "b"}, "abc") == \
+            query_key("find_recipes", (), {"name": "b", "tag": "a"}, "abc")
+        assert query_key("find_recipes", [], {"tag": "a"}, "abc") != query_key("find_recipes", [], {"tag": "a"}, "def")
+        assert query_key("get_recipes_by_tag", ["a"], {}, "abc") != query_key("get_recipes_by_name", ["a"], {}, "abc")
+
+    def test_that_least_recently_used_result_should_be_evicted_test(self):
+        cache = QueryCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get_or_compute("a", lambda: pytest.fail("should be cached")) == 1
+        cache.put("c", 3)
+
+        assert cache.get_or_compute("b", lambda: "recomputed") == "recomputed"
+        assert cache.stats()["evictions"] == 2
+        assert len(cache) == 2
+
+    def test_that_bytes_limit_should_evict_and_skip_oversized_results_test(self):
+        cache = QueryCache(max_entries=None, max_bytes=20)
+        cache.put("a", "x" * 8)
+        cache.put("b", "y" * 8)
+        assert cache.bytes == 20
+        cache.put("c", "z" * 8)
+        assert cache.stats()["entries"] == 2
+        assert cache.evictions == 1
+
+        cache.put("d", "w" * 100)
+        assert cache.get_or_compute("d", lambda: None) is None
+        assert cache.bytes <= 20
+
+    def test_that_expired_results_should_be_recomputed_test(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr("lib.recipe_query_cache.time.monotonic", lambda: now[0])
+        cache = QueryCache(ttl=10)
+        cache.put("a", 1)
+        now[0] = 105.0
+        assert cache.get_or_compute("a", lambda: 2) == 1
+        now[0] = 111.0
+        assert cache.get_or_compute("a", lambda: 2) == 2
+        assert cache.stats()["expirations"] == 1
+
+    def test_that_counters_should_be_reported_test(self):
+        cache = QueryCache()
+        cache.get_or_compute("a", lambda: [1])
+        cache.get_or_compute("a", lambda: [2])
+        cache.get_or_compute("a", lambda: [3])
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 0)
+        assert stats["hit_rate"] == pytest.approx(2 / 3, abs=1e-4)
+        assert stats["max_entries"] == 256
+
+    def test_that_callers_should_get_private_copies_test(self):
+        cache = QueryCache()
+        first = cache.get_or_compute("a", lambda: [{"name": "A", "tags": ["x"]}])
+        first[0]["tags"].append("changed")
+        second = cache.get_or_compute("a", lambda: None)
+        second.append("changed")
+
+        assert cache.get_or_compute("a", lambda: None) == [{"name": "A", "tags": ["x"]}]
+
+    def test_that_invalid_limits_should_raise_value_error_test(self):
+        for kwargs in ({"max_entries": 0}, {"max_bytes": -1}, {"ttl": 0}, {"max_entries": "10"}):
+            with pytest.raises(ValueError):
+                QueryCache(**kwargs)
+
+    def test_that_cache_should_be_configured_from_environment_test(self, monkeypatch):
+        assert query_cache_from_env().stats()["max_entries"] == 256
+
+        monkeypatch.setenv("OPENREWRITE_DB_CACHE_MAX_ENTRIES", "0")
+        monkeypatch.setenv("OPENREWRITE_DB_CACHE_MAX_BYTES", "4096")
+        monkeypatch.setenv("OPENREWRITE_DB_CACHE_TTL", "30")
+        stats = query_cache_from_env().stats()
+        assert (stats["max_entries"], stats["max_bytes"], stats["ttl"]) == (None, 4096, 30.0)
+
+        monkeypatch.setenv("OPENREWRITE_DB_CACHE_MAX_BYTES", "0")
+        monkeypatch.setenv("OPENREWRITE_DB_CACHE_TTL", "0")
+        stats = query_cache_from_env().stats()
+        assert (stats["max_entries"], stats["max_bytes"], stats["ttl"]) == (None, None, None)
+
+        monkeypatch.setenv("OPENREWRITE_DB_CACHE_TTL", "-5")
+        with pytest.raises(ValueError):
+            query_cache_from_env()
+
+        monkeypatch.setenv("OPENREWRITE_DB_CACHE_TTL", "soon")
+        with pytest.raises(ValueError):
+            query_cache_from_env()
+
+
+class WhenCachingServiceQueriesTests:
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_repeated_query_should_be_answered_from_cache_test(self, tmp_path, resident):
+        json_path = tmp_path / "recipes.json"
+        write_dataset(json_path, ["First"])
+        service = RecipeMcpService(RecipeRepository(str(json_path), resident=resident), cache=QueryCache())
+
+        first = service.get_recipes_by_tag("spring")
+        second = service.get_recipes_by_tag(" spring ")
+
+        assert first == second == [{"name": "First", "id": "first", "tags": ["spring"]}]
+        stats = service.cache_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_database_update_should_invalidate_cached_results_test(self, tmp_path, resident):
+        json_path = tmp_path / "recipes.json"
+        write_dataset(json_path, ["First"])
+        service = RecipeMcpService(RecipeRepository(str(json_path), resident=resident), cache=QueryCache())
+        service.get_recipes_by_tag("spring")
+
+        write_dataset(json_path, ["First", "Second"])
+
+        assert [recipe["name"] for recipe in service.get_recipes_by_tag("spring")] == ["First", "Second"]
+        assert service.cache_stats()["misses"] == 2
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_dataset_without_hash_should_be_invalidated_by_its_fingerprint_test(self, tmp_path, resident):
+        json_path = tmp_path / "recipes.json"
+        write_dataset(json_path, ["First"], with_sha256=False)
+        service = RecipeMcpService(RecipeRepository(str(json_path), resident=resident), cache=QueryCache())
+        service.get_recipes_by_tag("spring")
+        assert service.get_recipes_by_tag("spring") == [{"name": "First", "id": "first", "tags": ["spring"]}]
+
+        write_dataset(json_path, ["Second", "Third"], with_sha256=False)
+
+        assert [recipe["name"] for recipe in service.get_recipes_by_tag("spring")] == ["Second", "Third"]
+        assert (service.cache_stats()["hits"], service.cache_stats()["misses"]) == (1, 2)
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_cached_page_cursor_should_survive_republishing_identical_content_test(self, tmp_path, resident):
+        json_path = tmp_path / "recipes.json"
+        write_dataset(json_path, ["First", "Second", "Third"])
+        repository = RecipeRepository(str(json_path), resident=resident)
+        service = RecipeMcpService(repository, cache=QueryCache())
+        service.get_recipes_by_tag("spring", limit=2)
+
+        # Same bytes as a new file, like update_recipes_database publishing a new generation
+        content = json_path.read_bytes()
+        json_path.unlink()
+        write_dataset(json_path, ["First", "Second", "Third"])
+        assert json_path.read_bytes() == content
+
+        first = service.get_recipes_by_tag("spring", limit=2)
+        assert service.cache_stats()["hits"] == 1
+        second = service.get_recipes_by_tag("spring", cursor=first["next_cursor"])
+
+        assert "error" not in second
+        assert [recipe["name"] for recipe in second["recipes"]] == ["Third"]
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_cached_page_cursor_should_follow_a_changed_dataset_test(self, tmp_path, resident):
+        json_path = tmp_path / "recipes.json"
+        write_dataset(json_path, ["First", "Second", "Third"], with_sha256=False)
+        service = RecipeMcpService(RecipeRepository(str(json_path), resident=resident), cache=QueryCache())
+        service.get_recipes_by_tag("spring", limit=2)
+
+        json_path.unlink()
+        write_dataset(json_path, ["First", "Second", "Fourth"], with_sha256=False)
+        first = service.get_recipes_by_tag("spring", limit=2)
+        second = service.get_recipes_by_tag("spring", cursor=first["next_cursor"])
+
+        assert [recipe["name"] for recipe in second["recipes"]] == ["Fourth"]
+
+    def test_that_cache_hit_should_not_call_repository_test(self):
+        repository = MagicMock()
+        repository.dataset_version.return_value = "abc"
+        repository.get_all_categories.return_value = ["Java"]
+        service = RecipeMcpService(repository, cache=QueryCache())
+
+        assert service.get_all_categories() == ["Java"]
+        assert service.get_all_categories() == ["Java"]
+        repository.get_all_categories.assert_called_once_with()
+
+    def test_that_service_without_cache_should_report_no_stats_test(self):
+        repository = MagicMock()
+        service = RecipeMcpService(repository)
+
+        service.get_all_categories()
+        service.get_all_categories()
+
+        assert repository.get_all_categories.call_count == 2
+        assert service.cache_stats() == {}
@@ -0,0 +1,41 @@
+import pytest
+from unittest.mock import MagicMock
+from lib.mcp_service import RecipeMcpService
+
+
+class WhenCompletingRecipePrefixesFromMcpTests:
+    @pytest.fixture
+    def repo_mock(self):
+        return MagicMock()
+
+    @pytest.fixture
+    def service(self, repo_mock):
+        return RecipeMcpService(repo_mock)
+
+    def test_that_returns_completions(self, service, repo_mock):
+        completions = [{"value": "org.openrewrite.java.migrate.UpgradeToJava17", "field": "package", "recipes": 1}]
+        repo_mock.complete.return_value = completions
+
+        result = service.complete("  org.openrewrite.java.migrate.", 5)
+
+        assert result == completions, "Completions should be returned unchanged"
+        repo_mock.complete.assert_called_once_with("org.openrewrite.java.migrate.", 5)
+
+    def test_that_trailing_spaces_are_kept(self, service, repo_mock):
+        service.complete("Upgrade to ")
+
+        repo_mock.complete.assert_called_once_with("Upgrade to ", 10)
+
+    @pytest.mark.parametrize("prefix", ["", "   ", None])
+    def test_that_blank_prefix_returns_empty_list(self, service, repo_mock, prefix):
+        result = service.complete(prefix)
+
+        assert result == [], "Blank prefix should return empty list"
+        repo_mock.complete.assert_not_called()
+
+    def test_that_repo_exception_returns_empty_list(self, service, repo_mock):
+        repo_mock.complete.side_effect = ValueError("limit must be a positive integer")
+
+        result = service.complete("upgrade", 0)
+
+        assert result == [], "Should return empty list when repository throws exception"
@@ -0,0 +1,80 @@
+import json
+import pytest
+from lib.recipe_repository import RecipeRepository
+from lib.recipe_indexes import CompletionIndex
+
+
+@pytest.fixture
+def sample_data():
+    return [
+        {"name": "UpgradeToJava17", "id": "java17", "package": "org.openrewrite.java.migrate.UpgradeToJava17"},
+        {"name": "UpgradeToJava21", "id": "java21", "package": "org.openrewrite.java.migrate.UpgradeToJava21"},
+        {"name": "UpgradeSpringBoot_3_0", "id": "boot3", "package": "org.openrewrite.java.spring.boot3.UpgradeSpringBoot_3_0"},
+        {"name": "upgradetojava17", "id": "java17-copy", "package": "org.openrewrite.java.migrate.UpgradeToJava17Copy"},
+        {"name": "Straße", "id": "strasse"},
+        {"name": None, "id": "none", "package": 42},
+        {"description": "no name", "id": "missing"}
+    ]
+
+
+@pytest.fixture
+def json_path(tmp_path, sample_data):
+    path = tmp_path / "recipes.json"
+    path.write_text(json.dumps(sample_data))
+    return str(path)
+
+
+class WhenCompletingRecipePrefixesTests:
+    def test_that_index_should_match_brute_force_prefix_scan_test(self, sample_data):
+        index = CompletionIndex(sample_data)
+
+        for prefix in ("u", "upgrade", "org.openrewrite.java.", "org.openrewrite.java.migrate.upgradetojava17", "zzz"):
+            expected = sorted(key for key in index.keys if key.startswith(prefix))
+            assert [completion["value"].lower() for completion in index.complete(prefix, 100)] == expected
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_package_prefix_should_complete_fully_qualified_packages_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        result = repo.complete("org.openrewrite.java.migrate.", 2)
+
+        assert result == [
+            {"value": "org.openrewrite.java.migrate.UpgradeToJava17", "field": "package", "recipes": 1},
+            {"value": "org.openrewrite.java.migrate.UpgradeToJava17Copy", "field": "package", "recipes": 1}
+        ]
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_names_should_be_matched_case_insensitively_and_counted_once_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        result = repo.complete("UPGRADETO")
+
+        assert result == [
+            {"value": "UpgradeToJava17", "field": "name", "recipes": 2},
+            {"value": "UpgradeToJava21", "field": "name", "recipes": 1}
+        ]
+        assert repo.complete("STRASSE") == [{"value": "Straße", "field": "name", "recipes": 1}]
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_unknown_or_empty_prefix_should_return_no_completions_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        assert repo.complete("Downgrade") == []
+        assert repo.complete("") == []
+        assert repo.complete(None) == []
+
+    @pytest.mark.parametrize("limit", [0, -1, "10", True])
+    def test_that_invalid_limit_should_raise_value_error_test(self, json_path, limit):
+        repo = RecipeRepository(json_path)
+
+        with pytest.raises(ValueError):
+            repo.complete("upgrade", limit)
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_updated_dataset_should_rebuild_the_index_test(self, tmp_path, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+        assert repo.complete("remove") == []
+
+        (tmp_path / "recipes.json").write_text(json.dumps([{"name": "RemoveUnusedImports", "id": "imports"}]))
+
+        assert repo.complete("remove") == [{"value": "RemoveUnusedImports", "field": "name", "recipes": 1}]
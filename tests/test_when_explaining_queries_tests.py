@@ -0,0 +1,132 @@
+import json
+import time
+import pytest
+from lib.recipe_repository import RecipeRepository
+from lib.sqlite_recipe_repository import SqliteRecipeRepository
+from lib.recipe_query_stats import collect_stats, timed
+
+
+pytestmark = pytest.mark.json_backend
+
+
+@pytest.fixture
+def sample_data():
+    return [
+        {"name": "Add Spring JDBC", "category": "spring", "sub-category": "jdbc", "id": "jdbc",
+         "tags": ["spring", "jdbc"], "dependency": "rewrite-spring"},
+        {"name": "Add Spring Web", "category": "spring", "sub-category": "web", "id": "web",
+         "tags": ["spring", "web"], "dependency": "rewrite-spring"},
+        {"name": "Migrate to JUnit 5", "category": "testing", "sub-category": "junit", "id": "junit",
+         "tags": ["junit"], "dependency": "rewrite-testing-frameworks"}
+    ]
+
+
+@pytest.fixture
+def json_path(tmp_path, sample_data):
+    path = tmp_path / "recipes.json"
+    path.write_text(json.dumps(sample_data))
+    return str(path)
+
+
+class WhenExplainingQueriesTests:
+    def test_that_explain_should_return_the_query_result_test(self, json_path):
+        repo = RecipeRepository(json_path)
+
+        explained = repo.explain("get_recipes_by_tag", "junit", fields=["id"])
+
+        assert explained["result"] == [{"id": "junit"}]
+        assert explained["plan"]["method"] == "get_recipes_by_tag"
+
+    def test_that_streaming_query_should_report_a_full_scan_test(self, json_path):
+        repo = RecipeRepository(json_path)
+
+        plan = repo.explain("get_recipes_by_tag", "spring")["plan"]
+
+        assert plan["access_paths"] == ["stream"]
+        assert plan["records_decoded"] == 3
+        assert plan["records_examined"] == 3
+        assert plan["bytes_read"] > 0
+        assert set(plan["phases_ms"]) == {"scan"}
+        assert plan["wall_time_ms"] >= plan["phases_ms"]["scan"]
+
+    def test_that_paginated_scan_should_report_early_termination_test(self, json_path):
+        repo = RecipeRepository(json_path)
+
+        plan = repo.explain("get_recipes_by_tag", "spring", limit=1)["plan"]
+
+        # The scan stops at the second match, before the last record
+        assert plan["records_examined"] == 2
+
+    def test_that_resident_query_should_report_its_index_test(self, json_path):
+        repo = RecipeRepository(json_path, resident=True)
+        repo.get_all_categories()
+
+        plan = repo.explain("get_recipes_by_tag", "spring")["plan"]
+
+        assert plan["access_paths"] == ["snapshot", "tag index"]
+        assert plan["records_decoded"] == 0
+        assert plan["records_examined"] == 0
+        assert plan["bytes_read"] == 0
+
+    def test_that_cached_aggregate_should_report_the_cache_test(self, json_path):
+        repo = RecipeRepository(json_path)
+
+        first = repo.explain("get_all_categories")["plan"]
+        second = repo.explain("get_all_categories")["plan"]
+
+        assert first["access_paths"] == ["stream"] and "build" in first["phases_ms"]
+        assert second["access_paths"] == ["cached category tree"]
+        assert second["records_decoded"] == 0
+
+    def test_that_completion_should_report_its_index_test(self, json_path):
+        repo = RecipeRepository(json_path)
+
+        first = repo.explain("complete", "add spring")
+        second = repo.explain("complete", "add spring", 1)["plan"]
+
+        assert [completion["value"] for completion in first["result"]] == ["Add Spring JDBC", "Add Spring Web"]
+        assert first["plan"]["method"] == "complete"
+        assert first["plan"]["access_paths"] == ["stream"] and "build" in first["plan"]["phases_ms"]
+        assert second["access_paths"] == ["cached completion index"]
+        assert second["records_decoded"] == 0
+
+        resident = RecipeRepository(json_path, resident=True)
+        resident.get_all_categories()
+        assert resident.explain("complete", "migrate")["plan"]["access_paths"] == ["snapshot", "completion index"]
+
+    def test_that_sqlite_query_should_report_its_query_plan_test(self, json_path):
+        repo = SqliteRecipeRepository(json_path, db_path=":memory:")
+        repo.get_all_categories()
+
+        plan = repo.explain("get_recipe_by_id", "web")["plan"]
+
+        assert any("recipes_id" in path for path in plan["access_paths"]), plan["access_paths"]
+        assert plan["records_decoded"] == 1
+        assert "query" in plan["phases_ms"]
+
+    @pytest.mark.parametrize("method", ["update_from_remote", "explain", "_recipes", "missing", "completed", None])
+    def test_that_non_query_method_should_raise_test(self, json_path, method):
+        repo = RecipeRepository(json_path)
+
+        with pytest.raises(ValueError):
+            repo.explain(method)
+
+    def test_that_nested_phases_should_be_timed_exclusively_test(self):
+        with collect_stats("query") as stats:
+            with timed("scan"):
+                time.sleep(0.01)
+                with timed("build"):
+                    time.sleep(0.02)
+
+        assert stats.phases["build"] >= 0.02
+        assert 0.01 <= stats.phases["scan"] < 0.02
+        assert stats.phases["scan"] + stats.phases["build"] <= stats.wall_time
+
+    def test_that_queries_outside_explain_should_not_collect_stats_test(self, json_path):
+        repo = RecipeRepository(json_path)
+
+        with collect_stats("outer") as stats:
+            pass
+        repo.get_recipes_by_tag("spring")
+
+        assert stats.records_decoded == 0
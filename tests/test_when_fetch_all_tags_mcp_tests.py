@@ -0,0 +1,28 @@
+import pytest
+from unittest.mock import MagicMock
+from lib.mcp_service import RecipeMcpService
+
+
+class WhenFetchAllTagsFromMcpTests:
+    @pytest.fixture
+    def repo_mock(self):
+        return MagicMock()
+
+    @pytest.fixture
+    def service(self, repo_mock):
+        return RecipeMcpService(repo_mock)
+
+    def test_that_returns_tags_with_counts(self, service, repo_mock):
+        sample_tags = [{"tag": "jdbc", "count": 1}, {"tag": "spring", "count": 2}]
+        repo_mock.get_all_tags.return_value = sample_tags
+
+        result = service.get_all_tags()
+
+        assert result == sample_tags, "Tags and counts should be returned unchanged"
+
+    def test_that_repo_exception_returns_empty_list(self, service, repo_mock):
+        repo_mock.get_all_tags.side_effect = Exception("Database error")
+
+        result = service.get_all_tags()
+
+        assert result == [], "Should return empty list when repository throws exception"
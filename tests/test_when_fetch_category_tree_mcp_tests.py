@@ -0,0 +1,30 @@
+import pytest
+from unittest.mock import MagicMock
+from lib.mcp_service import RecipeMcpService
+
+
+class WhenFetchCategoryTreeFromMcpTests:
+    @pytest.fixture
+    def repo_mock(self):
+        return MagicMock()
+
+    @pytest.fixture
+    def service(self, repo_mock):
+        return RecipeMcpService(repo_mock)
+
+    def test_that_returns_categories_with_counts(self, service, repo_mock):
+        sample_tree = [
+            {"category": "spring", "count": 3, "sub-categories": [{"sub-category": "jdbc", "count": 2}]}
+        ]
+        repo_mock.get_category_tree.return_value = sample_tree
+
+        result = service.get_category_tree()
+
+        assert result == sample_tree, "Category tree should be returned unchanged"
+
+    def test_that_repo_exception_returns_empty_list(self, service, repo_mock):
+        repo_mock.get_category_tree.side_effect = Exception("Database error")
+
+        result = service.get_category_tree()
+
+        assert result == [], "Should return empty list when repository throws exception"
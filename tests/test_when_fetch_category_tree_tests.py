@@ -0,0 +1,78 @@
+import json
+import os
+import pytest
+from lib.recipe_repository import RecipeRepository
+
+
+@pytest.fixture
+def sample_data():
+    return [
+        {"name": "Recipe 1", "category": "spring", "sub-category": "jdbc"},
+        {"name": "Recipe 2", "category": "Spring", "sub-category": "Web"},
+        {"name": "Recipe 3", "category": "testing", "sub-category": None},
+        {"name": "Recipe 4", "category": "spring", "sub-category": "jdbc"},
+        {"name": "Recipe 5", "category": "spring", "sub-category": ""},
+        {"name": "Recipe 6", "category": "", "sub-category": "orphan"},
+        {"name": "Recipe 7", "category": 42, "sub-category": "orphan"},
+        {"name": "Recipe 8", "sub-category": "orphan"},
+        {"name": "Recipe 9", "category": "testing", "sub-category": "junit"}
+    ]
+
+
+@pytest.fixture
+def json_path(tmp_path, sample_data):
+    path = tmp_path / "recipes.json"
+    path.write_text(json.dumps(sample_data))
+    return str(path)
+
+
+class WhenFetchCategoryTreeTests:
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_category_tree_should_count_recipes_per_node_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        assert repo.get_category_tree() == [
+            {
+                "category": "spring",
+                "count": 4,
+                "sub-categories": [{"sub-category": "jdbc", "count": 2}, {"sub-category": "web", "count": 1}]
+            },
+            {
+                "category": "testing",
+                "count": 2,
+                "sub-categories": [{"sub-category": "junit", "count": 1}]
+            }
+        ]
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_category_listings_should_agree_with_the_tree_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        assert repo.get_all_categories() == ["spring", "testing"]
+        assert repo.get_categories_with_subcategories() == [
+            {"category": "spring", "sub-categories": ["jdbc", "web"]},
+            {"category": "testing", "sub-categories": ["junit"]}
+        ]
+        assert repo.get_subcategories_by_category("SPRING") == ["", "jdbc", "web"]
+
+    def test_that_returned_listings_should_not_share_state_test(self, json_path):
+        repo = RecipeRepository(json_path, resident=True)
+
+        repo.get_all_categories().append("changed")
+        repo.get_categories_with_subcategories()[0]["sub-categories"].clear()
+        repo.get_category_tree()[0]["sub-categories"][0]["count"] = 0
+
+        assert repo.get_all_categories() == ["spring", "testing"]
+        assert repo.get_categories_with_subcategories()[0]["sub-categories"] == ["jdbc", "web"]
+        assert repo.get_category_tree()[0]["sub-categories"][0]["count"] == 2
+
+    def test_that_category_tree_should_follow_dataset_changes_test(self, json_path, sample_data):
+        repo = RecipeRepository(json_path)
+        assert repo.get_all_categories() == ["spring", "testing"]
+
+        with open(json_path, 'w') as f:
+            json.dump(sample_data[2:3], f)
+        st = os.stat(json_path)
+        os.utime(json_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        assert repo.get_category_tree() == [{"category": "testing", "count": 1, "sub-categories": []}]
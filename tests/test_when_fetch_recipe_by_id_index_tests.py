@@ -0,0 +1,89 @@
+import json
+import hashlib
+import pytest
+from unittest.mock import patch
+from lib.recipe_repository import RecipeRepository
+from lib.recipe_id_index import build_id_offsets, id_index_path, scan_record_spans
+
+
+pytestmark = pytest.mark.json_backend
+
+
+@pytest.fixture
+def sample_data():
+    return [
+        {"name": "Recipe {1}", "id": "id-1", "description": "braces } and [ brackets ] in \"strings\""},
+        {"name": "Recipe 2", "id": "id-2", "tags": ["a", {"nested": [1, 2]}]},
+        "not a recipe",
+        {"name": "Recipe 3", "id": "id-3", "score": 1.5},
+        {"name": "Recipe 3 duplicate", "id": "id-3"},
+        {"name": "Recipe without id"}
+    ]
+
+
+@pytest.fixture
+def json_path(tmp_path, sample_data):
+    path = tmp_path / "recipes.json"
+    content = json.dumps(sample_data, indent=2).encode('utf-8')
+    path.write_bytes(content)
+    (tmp_path / "recipes.json.sha256").write_text(hashlib.sha256(content).hexdigest() + "\n")
+    return str(path)
+
+
+class WhenFetchRecipeByIdIndexTests:
+    def test_that_spans_should_cover_each_object_of_the_array_test(self, sample_data):
+        data = json.dumps(sample_data).encode('utf-8')
+
+        records = [json.loads(data[offset:offset + length]) for offset, length in scan_record_spans(data)]
+
+        assert records == [r for r in sample_data if isinstance(r, dict)]
+
+    def test_that_offsets_should_keep_the_first_record_of_each_id_test(self, sample_data):
+        data = json.dumps(sample_data).encode('utf-8')
+
+        offsets = build_id_offsets(data)
+
+        assert set(offsets) == {"id-1", "id-2", "id-3"}
+        offset, length = offsets["id-3"]
+        assert json.loads(data[offset:offset + length])["name"] == "Recipe 3"
+
+    def test_that_lookup_should_build_sidecar_and_match_streaming_results_test(self, json_path, sample_data):
+        repo = RecipeRepository(json_path)
+
+        for recipe_id in ["id-1", "id-2", "id-3", "missing"]:
+            expected = next((r for r in sample_data if isinstance(r, dict) and r.get("id") == recipe_id), {})
+            assert repo.get_recipe_by_id(recipe_id) == expected
+
+        with open(id_index_path(json_path)) as f:
+            assert set(json.load(f)["offsets"]) == {"id-1", "id-2", "id-3"}
+
+    def test_that_lookup_with_valid_sidecar_should_not_scan_the_dataset_test(self, json_path):
+        RecipeRepository(json_path).get_recipe_by_id("id-1")
+        repo = RecipeRepository(json_path)
+
+        with patch.object(repo, '_stream_recipes') as stream:
+            assert repo.get_recipe_by_id("id-3")["name"] == "Recipe 3"
+            assert repo.get_recipe_by_id("missing") == {}
+
+        stream.assert_not_called()
+
+    def test_that_stale_sidecar_should_not_be_used_test(self, json_path, sample_data):
+        RecipeRepository(json_path).get_recipe_by_id("id-1")
+
+        # Replace the dataset and its hash, keeping the old sidecar in place
+        content = json.dumps([{"name": "New recipe", "id": "id-1"}]).encode('utf-8')
+        with open(json_path, 'wb') as f:
+            f.write(content)
+        with open(json_path + ".sha256", 'w') as f:
+            f.write(hashlib.sha256(content).hexdigest() + "\n")
+
+        assert RecipeRepository(json_path).get_recipe_by_id("id-1")["name"] == "New recipe"
+
+    def test_that_dataset_not_matching_its_hash_should_fall_back_to_streaming_test(self, json_path):
+        with open(json_path + ".sha256", 'w') as f:
+            f.write("0" * 64 + "\n")
+        repo = RecipeRepository(json_path)
+
+        assert repo.get_recipe_by_id("id-2")["name"] == "Recipe 2"
+        with pytest.raises(FileNotFoundError):
+            open(id_index_path(json_path))
@@ -0,0 +1,49 @@
+import json
+import pytest
+from lib.recipe_repository import RecipeRepository
+from lib.recipe_indexes import VocabularyIndex
+
+
+pytestmark = pytest.mark.json_backend
+
+
+@pytest.fixture
+def sample_data():
+    return [
+        {"name": "Recipe 1", "dependency": "org.openrewrite.recipe:rewrite-third-party:RELEASE"},
+        {"name": "Recipe 2", "dependency": "org.openrewrite.recipe:rewrite-spring:RELEASE"},
+        {"name": "Recipe 3", "dependency": "org.openrewrite.recipe:rewrite-third-party:RELEASE"},
+        {"name": "Recipe 4", "dependency": "ORG.OPENREWRITE.RECIPE:REWRITE-SPRING:RELEASE"},
+        {"name": "Recipe 5", "dependency": None},
+        {"name": "Recipe 6"},
+        {"name": "Recipe 7", "dependency": ["not", "a", "string"]},
+        {"name": "Recipe 8", "dependency": "org.openrewrite:rewrite-java:RELEASE"}
+    ]
+
+
+@pytest.fixture
+def json_path(tmp_path, sample_data):
+    path = tmp_path / "recipes.json"
+    path.write_text(json.dumps(sample_data))
+    return str(path)
+
+
+class WhenFetchRecipesByDependencyIndexTests:
+    def test_that_index_should_group_positions_by_distinct_value_test(self):
+        index = VocabularyIndex(["a:x", "b:y", "a:x", None, "b:y"])
+
+        assert index.postings == {"a:x": [0, 2], "b:y": [1, 4]}
+
+    def test_that_postings_of_matching_values_should_be_merged_in_file_order_test(self):
+        index = VocabularyIndex(["a:x", "b:y", "a:x", None, "b:y", "c:z"])
+
+        assert index.search(":") == [0, 1, 2, 4, 5]
+        assert index.search("b:") == [1, 4]
+        assert index.search("missing") == []
+
+    def test_that_indexed_dependency_queries_should_match_streaming_queries_test(self, json_path):
+        streaming = RecipeRepository(json_path)
+        resident = RecipeRepository(json_path, resident=True)
+
+        for query in ["rewrite-third-party", "REWRITE-SPRING", "org.openrewrite", "release", "missing", "n"]:
+            assert resident.get_recipes_by_dependency(query) == streaming.get_recipes_by_dependency(query), query
@@ -0,0 +1,87 @@
+import json
+import pytest
+from lib.recipe_repository import RecipeRepository
+from lib.recipe_indexes import FuzzyIndex
+
+
+@pytest.fixture
+def sample_data():
+    return [
+        {"name": "PreferJavaUtilObjectsEquals", "id": "objects-equals"},
+        {"name": "AddSpringJdbc", "id": "jdbc"},
+        {"name": "PreferJavaUtilObjectEquals", "id": "object-equals"},
+        {"name": "PreferJavaUtilObjectsEqual", "id": "objects-equal"},
+        {"name": None, "id": "none"},
+        {"name": 42, "id": "number"},
+        {"description": "no name", "id": "missing"},
+        {"name": "ＡｄｄＳｐｒｉｎｇＪｄｂｃ", "id": "fullwidth-jdbc"}
+    ]
+
+
+@pytest.fixture
+def json_path(tmp_path, sample_data):
+    path = tmp_path / "recipes.json"
+    path.write_text(json.dumps(sample_data))
+    return str(path)
+
+
+def levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(current[-1] + 1, previous[j] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+class WhenFetchRecipesByFuzzyNameTests:
+    def test_that_index_search_should_match_brute_force_distances_test(self):
+        keys = ["preferjavautilobjectsequals", None, "kitten", "sitting", "", "ab", "kitten"]
+        index = FuzzyIndex(keys)
+
+        for query in ["kitten", "sittin", "preferjavautilobjectequals", "a", "", "xyz", "kitchen"]:
+            for max_distance in range(4):
+                expected = sorted(((i, levenshtein(query, key)) for i, key in enumerate(keys)
+                                   if key is not None and levenshtein(query, key) <= max_distance),
+                                  key=lambda match: (match[1], match[0]))
+                assert index.search(query, max_distance) == expected, (query, max_distance)
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_misspelled_name_should_find_closest_recipes_first_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        result = repo.get_recipes_by_name("PreferJavaUtilObjectEquals", max_distance=2)
+
+        assert [recipe["id"] for recipe in result] == ["object-equals", "objects-equals", "objects-equal"]
+        assert repo.get_recipes_by_name("PreferJavaUtilObjectEquals") == [result[0]]
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_fuzzy_lookup_should_compare_whole_normalized_names_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        assert [r["id"] for r in repo.get_recipes_by_name("addspringjdbc", max_distance=0)] == \
+            ["jdbc", "fullwidth-jdbc"]
+        assert repo.get_recipes_by_name("Equals", max_distance=2) == []
+        assert repo.get_recipes_by_name("PreferJavaUtilObjectsEqul", max_distance=1, fields=["id"]) == \
+            [{"id": "objects-equal"}]
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_fuzzy_results_should_be_paginated_in_rank_order_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        first = repo.get_recipes_by_name("PreferJavaUtilObjectEquals", limit=1, max_distance=2, fields=["id"])
+        second = repo.get_recipes_by_name("PreferJavaUtilObjectEquals", limit=2, cursor=first["next_cursor"],
+                                          max_distance=2, fields=["id"])
+
+        assert first["recipes"] == [{"id": "object-equals"}]
+        assert first["total"] == 3
+        assert second == {"recipes": [{"id": "objects-equals"}, {"id": "objects-equal"}], "total": 3,
+                          "next_cursor": None}
+
+    @pytest.mark.parametrize("max_distance", [-1, 1.5, "2", True])
+    def test_that_invalid_max_distance_should_raise_test(self, json_path, max_distance):
+        repo = RecipeRepository(json_path)
+
+        with pytest.raises(ValueError):
+            repo.get_recipes_by_name("PreferJavaUtilObjectEquals", max_distance=max_distance)
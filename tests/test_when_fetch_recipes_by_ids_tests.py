@@ -0,0 +1,60 @@
+import json
+import hashlib
+import pytest
+from lib.recipe_repository import RecipeRepository
+
+
+@pytest.fixture
+def sample_data():
+    return [
+        {"name": "Recipe 1", "id": "id-1", "package": "org.example.one"},
+        {"name": "Recipe 2", "id": "id-2", "package": "org.example.two"},
+        {"name": "Recipe 3", "id": "id-3", "package": "org.example.three"},
+        {"name": "Recipe 3 duplicate", "id": "id-3"},
+        {"name": "Recipe without id"}
+    ]
+
+
+@pytest.fixture(params=[False, True], ids=["without_hash", "with_hash"])
+def json_path(request, tmp_path, sample_data):
+    path = tmp_path / "recipes.json"
+    content = json.dumps(sample_data, indent=2).encode('utf-8')
+    path.write_bytes(content)
+    if request.param:
+        # The hash lets streaming repositories use the id index sidecar
+        (tmp_path / "recipes.json.sha256").write_text(hashlib.sha256(content).hexdigest() + "\n")
+    return str(path)
+
+
+class WhenFetchRecipesByIdsTests:
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_recipes_should_follow_the_order_of_the_ids_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        result = repo.get_recipes_by_ids(["id-3", "id-1", "id-2"])
+
+        assert [recipe["name"] for recipe in result["recipes"]] == ["Recipe 3", "Recipe 1", "Recipe 2"]
+        assert result["missing"] == []
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_unknown_ids_should_be_reported_missing_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        result = repo.get_recipes_by_ids(["unknown", "id-2", "", "id-2", "also-unknown"], fields=["id"])
+
+        assert result == {"recipes": [{"id": "id-2"}], "missing": ["unknown", "", "also-unknown"]}
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_batch_should_match_single_lookups_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+        ids = ["id-1", "id-2", "id-3"]
+
+        assert repo.get_recipes_by_ids(ids)["recipes"] == [repo.get_recipe_by_id(recipe_id) for recipe_id in ids]
+        assert repo.get_recipes_by_ids([]) == {"recipes": [], "missing": []}
+
+    @pytest.mark.parametrize("recipe_ids", ["id-1", None, ["id-1", 2]])
+    def test_that_invalid_ids_should_raise_test(self, json_path, recipe_ids):
+        repo = RecipeRepository(json_path)
+
+        with pytest.raises(ValueError):
+            repo.get_recipes_by_ids(recipe_ids)
@@ -0,0 +1,56 @@
+import json
+import pytest
+from lib.recipe_repository import RecipeRepository
+from lib.recipe_indexes import TrigramIndex
+
+
+pytestmark = pytest.mark.json_backend
+
+
+@pytest.fixture
+def sample_data():
+    return [
+        {"name": "PreferJavaUtilObjectsEquals"},
+        {"name": "PreferJavaUtilObjectEquals"},
+        {"name": "AddSpringJdbc"},
+        {"name": "aaaa"},
+        {"name": "abcxbcd"},
+        {"name": None},
+        {"name": 42},
+        {"description": "no name"},
+        {"name": ""}
+    ]
+
+
+@pytest.fixture
+def json_path(tmp_path, sample_data):
+    path = tmp_path / "recipes.json"
+    path.write_text(json.dumps(sample_data))
+    return str(path)
+
+
+QUERIES = ["objectsequals", "ObjectEquals", "equals", "jdbc", "aaa", "aaaa", "aaaaa", "bcd", "abcd",
+           "xbc", "a", "ab", "q", "missing", "preferjavautilobjectsequals"]
+
+
+class WhenFetchRecipesByNameIndexTests:
+    def test_that_index_search_should_match_substring_scan_test(self):
+        keys = ["preferjavautilobjectsequals", None, "aaaa", "abcxbcd", "", "ab"]
+        index = TrigramIndex(keys)
+
+        for query in [q.lower() for q in QUERIES]:
+            expected = [i for i, key in enumerate(keys) if key is not None and query in key]
+            assert index.search(query) == expected, query
+
+    def test_that_indexed_name_queries_should_match_streaming_queries_test(self, json_path):
+        streaming = RecipeRepository(json_path)
+        resident = RecipeRepository(json_path, resident=True)
+
+        for query in QUERIES:
+            assert resident.get_recipes_by_name(query) == streaming.get_recipes_by_name(query), query
+
+    def test_that_trigrams_in_wrong_order_should_not_match_test(self):
+        index = TrigramIndex(["abcxbcd"])
+
+        # Both "abc" and "bcd" are indexed, but "abcd" is not a substring
+        assert index.search("abcd") == []
@@ -0,0 +1,73 @@
+import json
+import pytest
+from unittest.mock import patch
+from lib.recipe_repository import RecipeRepository
+from lib.recipe_indexes import build_tag_index
+
+
+pytestmark = pytest.mark.json_backend
+
+
+@pytest.fixture
+def sample_data():
+    return [
+        {"name": "Recipe 1", "tags": ["spring", "web"]},
+        {"name": "Recipe 2", "tags": ["Spring", "jdbc", "SPRING"]},
+        {"name": "Recipe 3", "tags": ["testing", 123]},
+        {"name": "Recipe 4"},
+        {"name": "Recipe 5", "tags": "spring"},
+        {"name": "Recipe 6", "tags": ["", "web"]}
+    ]
+
+
+@pytest.fixture
+def json_path(tmp_path, sample_data):
+    path = tmp_path / "recipes.json"
+    path.write_text(json.dumps(sample_data))
+    return str(path)
+
+
+class WhenFetchRecipesByTagIndexTests:
+    def test_that_index_should_map_casefolded_tags_to_sorted_positions_test(self, sample_data):
+        index = build_tag_index(sample_data)
+
+        assert index == {
+            "spring": [0, 1],
+            "web": [0, 5],
+            "jdbc": [1],
+            "testing": [2],
+            "": [5]
+        }
+
+    def test_that_indexed_tag_queries_should_match_streaming_queries_test(self, json_path):
+        streaming = RecipeRepository(json_path)
+        resident = RecipeRepository(json_path, resident=True)
+
+        for tag in ["spring", "SPRING", "web", "testing", "123", "missing"]:
+            assert resident.get_recipes_by_tag(tag) == streaming.get_recipes_by_tag(tag)
+
+    def test_that_indexed_tag_queries_should_not_scan_records_test(self, json_path):
+        repo = RecipeRepository(json_path, resident=True)
+        repo.get_recipes_by_tag("spring")
+
+        with patch.object(repo, '_recipes') as recipes:
+            result = repo.get_recipes_by_tag("jdbc")
+
+        recipes.assert_not_called()
+        assert [r["name"] for r in result] == ["Recipe 2"]
+
+    def test_that_all_tags_should_be_returned_with_counts_test(self, json_path):
+        expected = [
+            {"tag": "jdbc", "count": 1},
+            {"tag": "spring", "count": 2},
+            {"tag": "testing", "count": 1},
+            {"tag": "web", "count": 2}
+        ]
+
+        assert RecipeRepository(json_path).get_all_tags() == expected
+        assert RecipeRepository(json_path, resident=True).get_all_tags() == expected
+
+    def test_that_all_tags_should_be_empty_for_missing_dataset_test(self, tmp_path):
+        repo = RecipeRepository(str(tmp_path / "missing.json"))
+
+        assert repo.get_all_tags() == []
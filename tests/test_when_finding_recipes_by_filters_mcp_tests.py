@@ -0,0 +1,45 @@
+import pytest
+from unittest.mock import MagicMock
+from lib.mcp_service import RecipeMcpService
+
+
+class WhenFindingRecipesByFiltersFromMcpTests:
+    @pytest.fixture
+    def repo_mock(self):
+        return MagicMock()
+
+    @pytest.fixture
+    def service(self, repo_mock):
+        return RecipeMcpService(repo_mock)
+
+    def test_that_given_filters_are_passed_to_repository(self, service, repo_mock):
+        sample_recipes = [{"name": "JUnit4to5Migration", "id": "1"}]
+        repo_mock.find_recipes.return_value = sample_recipes
+
+        result = service.find_recipes(category=" java ", tag="junit", subcategory="  ", exclude_name="Assert")
+
+        assert result == sample_recipes, "Matching recipes should be returned unchanged"
+        repo_mock.find_recipes.assert_called_once_with(category="java", tag="junit", exclude_name="Assert")
+
+    def test_that_pagination_and_fields_are_passed_to_repository(self, service, repo_mock):
+        repo_mock.find_recipes.return_value = {"recipes": [], "total": 0, "next_cursor": None}
+
+        service.find_recipes(dependency="rewrite-spring", limit=5, fields="id,name")
+
+        repo_mock.find_recipes.assert_called_once_with(dependency="rewrite-spring", limit=5, offset=0, cursor=None,
+                                                       fields=["id", "name"])
+
+    def test_that_invalid_arguments_return_error_page(self, service, repo_mock):
+        repo_mock.find_recipes.side_effect = ValueError("limit must be a positive integer")
+
+        result = service.find_recipes(tag="junit", limit=0)
+
+        assert result["recipes"] == []
+        assert result["error"] == "limit must be a positive integer"
+
+    def test_that_repo_exception_returns_empty_list(self, service, repo_mock):
+        repo_mock.find_recipes.side_effect = Exception("Database error")
+
+        result = service.find_recipes(tag="junit")
+
+        assert result == [], "Should return empty list when repository throws exception"
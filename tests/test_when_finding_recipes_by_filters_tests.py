@@ -0,0 +1,102 @@
+import json
+import pytest
+from lib.recipe_repository import RecipeRepository
+from lib.recipe_indexes import intersect_postings
+
+
+@pytest.fixture
+def sample_data():
+    return [
+        {"name": "JUnit4to5Migration", "category": "java", "sub-category": "testing/junit5",
+         "dependency": "org.openrewrite.recipe:rewrite-testing-frameworks:RELEASE", "tags": ["junit", "testing"],
+         "id": "junit-migration"},
+        {"name": "AssertJBestPractices", "category": "java", "sub-category": "testing/assertj",
+         "dependency": "org.openrewrite.recipe:rewrite-testing-frameworks:RELEASE", "tags": ["testing", "assertj"],
+         "id": "assertj"},
+        {"name": "SpringBootJUnit", "category": "Spring", "sub-category": "boot3",
+         "dependency": "org.openrewrite.recipe:rewrite-spring:RELEASE", "tags": ["JUnit", "spring"],
+         "id": "spring-junit"},
+        {"name": "SpringBoot3Upgrade", "category": "spring", "sub-category": "boot3",
+         "dependency": "org.openrewrite.recipe:rewrite-spring:RELEASE", "tags": ["spring"],
+         "id": "spring-upgrade"},
+        {"name": "Uncategorized", "id": "bare"},
+        {"name": None, "category": "java", "sub-category": None, "tags": "junit", "dependency": 7,
+         "id": "malformed"}
+    ]
+
+
+@pytest.fixture
+def json_path(tmp_path, sample_data):
+    path = tmp_path / "recipes.json"
+    path.write_text(json.dumps(sample_data))
+    return str(path)
+
+
+def ids(recipes):
+    return [recipe["id"] for recipe in recipes]
+
+
+class WhenFindingRecipesByFiltersTests:
+    def test_that_posting_lists_should_be_intersected_test(self):
+        assert intersect_postings([[1, 3, 5, 7, 9], [3, 4, 5, 9], [0, 5, 9, 11]]) == [5, 9]
+        assert intersect_postings([[1, 2, 3], []]) == []
+        assert intersect_postings([[2, 4]]) == [2, 4]
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_every_filter_should_apply_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        assert ids(repo.find_recipes(category="java", tag="JUNIT", dependency="testing-frameworks")) == \
+            ["junit-migration"]
+        assert ids(repo.find_recipes(tag="junit")) == ["junit-migration", "spring-junit"]
+        assert ids(repo.find_recipes(subcategory="boot3", name="junit")) == ["spring-junit"]
+        assert ids(repo.find_recipes(category="spring", tag="assertj")) == []
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_exclusions_should_keep_recipes_without_the_field_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        assert ids(repo.find_recipes(category="java", exclude_tag="junit")) == ["assertj", "malformed"]
+        assert ids(repo.find_recipes(exclude_category="java", exclude_name="upgrade")) == ["spring-junit", "bare"]
+        assert ids(repo.find_recipes(exclude_dependency="rewrite-", exclude_subcategory="testing/junit5")) == \
+            ["bare", "malformed"]
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_subcategory_filter_should_match_recipes_without_category_test(self, tmp_path, resident):
+        path = tmp_path / "uncategorized.json"
+        path.write_text(json.dumps([
+            {"name": "A", "sub-category": "testing", "id": "a"},
+            {"name": "B", "category": "java", "sub-category": "testing", "id": "b"},
+            {"name": "C", "category": "", "sub-category": "Testing", "id": "c"},
+            {"name": "D", "category": "java", "sub-category": "other", "id": "d"}
+        ]))
+        repo = RecipeRepository(str(path), resident=resident)
+
+        assert ids(repo.find_recipes(subcategory="testing")) == ["a", "b", "c"]
+        assert ids(repo.find_recipes(exclude_subcategory="testing")) == ["d"]
+        assert ids(repo.find_recipes(category="java", subcategory="testing")) == ["b"]
+        assert ids(repo.iter_recipes_matching(subcategory="testing")) == ["a", "b", "c"]
+        assert ids(repo.iter_recipes_matching(exclude_subcategory="testing")) == ["d"]
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_no_filters_should_return_every_recipe_test(self, json_path, resident, sample_data):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        assert ids(repo.find_recipes(category="", tag=None)) == [recipe["id"] for recipe in sample_data]
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_filtered_results_should_be_paginated_and_projected_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        first = repo.find_recipes(exclude_category="spring", limit=2, fields=["id"])
+        second = repo.find_recipes(exclude_category="spring", limit=2, cursor=first["next_cursor"], fields=["id"])
+
+        assert first["recipes"] == [{"id": "junit-migration"}, {"id": "assertj"}]
+        assert second["recipes"] == [{"id": "bare"}, {"id": "malformed"}]
+        assert second["next_cursor"] is None
+
+    def test_that_non_string_filter_should_raise_test(self, json_path):
+        repo = RecipeRepository(json_path)
+
+        with pytest.raises(ValueError):
+            repo.find_recipes(tag=["junit"])
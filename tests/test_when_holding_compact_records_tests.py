@@ -0,0 +1,99 @@
+import json
+import pytest
+from lib.recipe_repository import RecipeRepository
+from lib.recipe_records import CompactRecipe, RecordCompactor, make_template
+from lib.recipe_snapshot import RecipeSnapshot, dataset_fingerprint
+from lib.recipe_snapshot_file import decode_snapshot, encode_snapshot
+
+
+pytestmark = pytest.mark.json_backend
+
+
+def _recipe(name, package, dependency, tags):
+    return {
+        "name": name,
+        "package": package,
+        "dependency": dependency,
+        "mvn-command-line": "mvn -U org.openrewrite.maven:rewrite-maven-plugin:run "
+                            f"-Drewrite.recipeArtifactCoordinates={dependency} "
+                            f"-Drewrite.activeRecipes={package} -Drewrite.exportDatatables=true",
+        "category": "spring",
+        "id": package,
+        "tags": tags
+    }
+
+
+@pytest.fixture
+def sample_data():
+    return [
+        _recipe("Add Spring JDBC", "org.openrewrite.java.spring.AddSpringJdbc",
+                "org.openrewrite.recipe:rewrite-spring:RELEASE", ["spring", "jdbc"]),
+        _recipe("Add Spring Web", "org.openrewrite.java.spring.AddSpringWeb",
+                "org.openrewrite.recipe:rewrite-spring:RELEASE", ["spring", "jdbc"]),
+        _recipe("Odd {braces}", "org.example.{Odd}", "org:{dep}:1", ["{x}"]),
+    ]
+
+
+@pytest.fixture
+def json_path(tmp_path, sample_data):
+    path = tmp_path / "recipes.json"
+    path.write_text(json.dumps(sample_data))
+    return str(path)
+
+
+class WhenHoldingCompactRecordsTests:
+    def test_that_snapshot_records_should_be_compact_and_equal_to_the_source_test(self, json_path, sample_data):
+        snapshot = RecipeSnapshot(sample_data, dataset_fingerprint(json_path))
+
+        assert all(isinstance(record, CompactRecipe) for record in snapshot.records)
+        assert [record.to_dict() for record in snapshot.records] == sample_data
+        assert list(snapshot.records) == sample_data
+
+    def test_that_repeated_values_and_layouts_should_be_shared_test(self, json_path, sample_data):
+        first, second, _ = RecipeSnapshot(sample_data, dataset_fingerprint(json_path)).records
+
+        assert first.layout is second.layout
+        assert first["dependency"] is second["dependency"]
+        assert first["tags"] is second["tags"]
+
+    def test_that_command_line_should_be_stored_as_a_shared_template_test(self, json_path, sample_data):
+        first, second, odd = RecipeSnapshot(sample_data, dataset_fingerprint(json_path)).records
+        position = first.layout.positions["mvn-command-line"]
+
+        assert first.raw_values[position] is second.raw_values[position]
+        assert "{package}" in first.raw_values[position]
+        assert first["mvn-command-line"] == sample_data[0]["mvn-command-line"]
+        assert odd.get("mvn-command-line") == sample_data[2]["mvn-command-line"]
+
+    def test_that_value_without_embedded_fields_should_not_become_a_template_test(self):
+        assert make_template("mvn -U run", {"dependency": "org:dep:1", "package": "org.example"}) is None
+        assert make_template("a org:dep:1 b", {"dependency": "org:dep:1"}) == "a {dependency} b"
+
+    def test_that_lists_of_other_values_should_not_be_shared_test(self):
+        compactor = RecordCompactor()
+
+        first = compactor.compact({"values": [1]})
+        second = compactor.compact({"values": [True]})
+
+        assert second["values"] == [True]
+        assert second["values"][0] is True
+        assert first["values"] is not second["values"]
+
+    def test_that_resident_queries_should_return_plain_dicts_test(self, json_path, sample_data):
+        repo = RecipeRepository(json_path, resident=True)
+
+        recipe = repo.get_recipe_by_id("org.openrewrite.java.spring.AddSpringWeb")
+
+        assert type(recipe) is dict
+        assert recipe == sample_data[1]
+        assert recipe["tags"] is not repo.get_recipe_by_id("org.openrewrite.java.spring.AddSpringJdbc")["tags"]
+
+    def test_that_binary_snapshot_should_keep_compact_records_test(self, json_path, sample_data):
+        fingerprint = dataset_fingerprint(json_path)
+        snapshot = RecipeSnapshot(sample_data, fingerprint, "0" * 64)
+
+        decoded = decode_snapshot(encode_snapshot(snapshot, 0), fingerprint)
+
+        assert list(decoded.records) == sample_data
+        assert decoded.records[0].layout.templated == snapshot.records[0].layout.templated
+        assert decoded.records[0]["dependency"] is decoded.records[1]["dependency"]
@@ -0,0 +1,88 @@
+import builtins
+import json
+from contextlib import closing
+import pytest
+import lib.recipe_repository
+from lib.recipe_repository import RecipeRepository
+
+
+@pytest.fixture
+def sample_data():
+    return [
+        {"name": "JUnit4to5Migration", "category": "java", "sub-category": "testing",
+         "dependency": "org.openrewrite.recipe:rewrite-testing-frameworks:RELEASE", "tags": ["junit", "testing"],
+         "id": "junit-migration"},
+        {"name": "AssertJBestPractices", "category": "java", "sub-category": "testing",
+         "dependency": "org.openrewrite.recipe:rewrite-testing-frameworks:RELEASE", "tags": ["testing"],
+         "id": "assertj"},
+        {"name": "SpringBootJUnit", "category": "spring", "sub-category": "boot3",
+         "dependency": "org.openrewrite.recipe:rewrite-spring:RELEASE", "tags": ["JUnit", "spring"],
+         "id": "spring-junit"},
+        {"name": "JavaUpgrade", "category": "Java", "id": "java-upgrade"},
+        {"name": "Uncategorized", "id": "bare"}
+    ]
+
+
+@pytest.fixture
+def json_path(tmp_path, sample_data):
+    path = tmp_path / "recipes.json"
+    path.write_text(json.dumps(sample_data))
+    return str(path)
+
+
+class WhenIteratingRecipesLazilyTests:
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_iterators_should_yield_the_query_results_test(self, json_path, resident, monkeypatch):
+        # Small batches make the SQLite iterator resume several times
+        monkeypatch.setattr('lib.sqlite_recipe_repository._POSITION_BATCH', 2)
+        repo = RecipeRepository(json_path, resident=resident)
+
+        assert list(repo.iter_recipes_by_category("java")) == repo.get_recipes_by_category("java")
+        assert list(repo.iter_recipes_by_category("java", "testing", fields=["id"])) == \
+            repo.get_recipes_by_category("java", "testing", fields=["id"])
+        assert list(repo.iter_recipes_by_tag("junit")) == repo.get_recipes_by_tag("junit")
+        assert list(repo.iter_recipes_by_name("junit", fields=["name"])) == \
+            repo.get_recipes_by_name("junit", fields=["name"])
+        assert list(repo.iter_recipes_by_dependency("rewrite-testing")) == \
+            repo.get_recipes_by_dependency("rewrite-testing")
+        assert list(repo.iter_recipes_matching(category="java", exclude_tag="junit")) == \
+            repo.find_recipes(category="java", exclude_tag="junit")
+        assert [recipe["id"] for recipe in repo.iter_recipes_matching(fields=["id"])] == \
+            ["junit-migration", "assertj", "spring-junit", "java-upgrade", "bare"]
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_empty_queries_should_yield_nothing_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        assert list(repo.iter_recipes_by_category("")) == []
+        assert list(repo.iter_recipes_by_tag(None)) == []
+        assert list(repo.iter_recipes_by_name("no such recipe")) == []
+
+    def test_that_invalid_arguments_should_raise_on_call_test(self, json_path):
+        repo = RecipeRepository(json_path)
+
+        with pytest.raises(ValueError):
+            repo.iter_recipes_by_tag("junit", fields="id")
+        with pytest.raises(ValueError):
+            repo.iter_recipes_matching(color="red")
+        with pytest.raises(ValueError):
+            repo.iter_recipes_matching(tag=1)
+
+    def test_that_stopping_early_should_close_the_file_test(self, json_path, repository_backend, monkeypatch):
+        if repository_backend != "json":
+            pytest.skip("Only streaming repositories keep the file open")
+        opened = []
+
+        def tracking_open(*args, **kwargs):
+            f = builtins.open(*args, **kwargs)
+            opened.append(f)
+            return f
+
+        monkeypatch.setattr(lib.recipe_repository, 'open', tracking_open, raising=False)
+        repo = RecipeRepository(json_path)
+
+        with closing(repo.iter_recipes_by_category("java")) as recipes:
+            assert next(recipes)["id"] == "junit-migration"
+            assert not opened[-1].closed
+
+        assert opened[-1].closed
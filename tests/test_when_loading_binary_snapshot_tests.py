@@ -0,0 +1,138 @@
+import json
+import hashlib
+import pytest
+from decimal import Decimal
+from unittest.mock import patch
+from lib.recipe_repository import RecipeRepository
+from lib.recipe_snapshot import RecipeSnapshot
+from lib.recipe_snapshot_file import decode_snapshot, encode_snapshot, generate_snapshot_file, snapshot_file_path
+
+
+pytestmark = pytest.mark.json_backend
+
+
+@pytest.fixture
+def sample_data():
+    return [
+        {
+            "name": "Add Spring JDBC",
+            "description": "Add spring-boot-starter-jdbc",
+            "package": "org.openrewrite.java.spring",
+            "dependency": "org.springframework.boot:spring-boot-starter-jdbc",
+            "category": "spring",
+            "sub-category": "jdbc",
+            "id": "id-1",
+            "tags": ["spring", "jdbc", "database"]
+        },
+        {
+            "id": "id-2",
+            "name": "Ünïcödé \u0000 with NUL",
+            "category": "Spring",
+            "sub-category": None,
+            "tags": ["spring"],
+            "score": 1.5,
+            "count": 3,
+            "flags": {"enabled": True, "hidden": False}
+        },
+        {"name": "", "category": "testing", "tags": "not a list", "dependency": None}
+    ]
+
+
+@pytest.fixture
+def json_path(tmp_path, sample_data):
+    path = tmp_path / "recipes.json"
+    content = json.dumps(sample_data).encode('utf-8')
+    path.write_bytes(content)
+    (tmp_path / "recipes.json.sha256").write_text(hashlib.sha256(content).hexdigest() + "\n")
+    return str(path)
+
+
+class WhenLoadingBinarySnapshotTests:
+    def test_that_decoded_snapshot_should_equal_the_encoded_one_test(self, sample_data):
+        snapshot = RecipeSnapshot(sample_data, None, "ab" * 32)
+
+        decoded = decode_snapshot(encode_snapshot(snapshot, 123), None)
+
+        assert decoded.records == snapshot.records
+        assert [list(r) for r in decoded.records] == [list(r) for r in snapshot.records]
+        assert decoded.records[1]["score"] == Decimal("1.5")
+        assert decoded.sha256 == "ab" * 32
+        assert decoded.category_index == snapshot.category_index
+        assert decoded.category_tree.nodes == snapshot.category_tree.nodes
+        assert decoded.tag_index == snapshot.tag_index
+        assert decoded.id_positions == snapshot.id_positions
+        assert decoded.name_index.keys == snapshot.name_index.keys
+        assert decoded.name_index.postings == snapshot.name_index.postings
+        assert decoded.dependency_index.postings == snapshot.dependency_index.postings
+        assert {term: (list(positions), list(scores))
+                for term, (positions, scores) in decoded.text_index.postings.items()} == \
+            {term: (list(positions), list(scores))
+             for term, (positions, scores) in snapshot.text_index.postings.items()}
+
+    def test_that_resident_repository_should_write_and_prefer_the_snapshot_file_test(self, json_path):
+        first = RecipeRepository(json_path, resident=True)
+        first.get_all_categories()
+
+        second = RecipeRepository(json_path, resident=True)
+        with patch.object(second, '_stream_recipes') as stream:
+            assert second.get_all_categories() == ["spring", "testing"]
+            assert second.get_recipes_by_tag("spring") == RecipeRepository(json_path).get_recipes_by_tag("spring")
+            assert second.get_recipe_by_id("id-2")["flags"] == {"enabled": True, "hidden": False}
+
+        stream.assert_not_called()
+
+    def test_that_snapshot_file_load_should_count_the_decoded_records_test(self, json_path, sample_data):
+        RecipeRepository(json_path, resident=True).get_all_categories()
+
+        from_file = RecipeRepository(json_path, resident=True).explain("get_all_categories")["plan"]
+        from_json = RecipeRepository(json_path, resident=True)
+        with patch('lib.recipe_repository.load_snapshot_file', return_value=None):
+            parsed = from_json.explain("get_all_categories")["plan"]
+
+        assert "snapshot file" in from_file["access_paths"]
+        assert "snapshot file" not in parsed["access_paths"]
+        assert from_file["records_decoded"] == parsed["records_decoded"] == len(sample_data)
+        assert from_file["bytes_read"] > 0
+
+    def test_that_snapshot_file_of_another_dataset_should_be_ignored_test(self, json_path):
+        assert generate_snapshot_file(json_path)
+
+        content = json.dumps([{"name": "New recipe", "category": "new"}]).encode('utf-8')
+        with open(json_path, 'wb') as f:
+            f.write(content)
+        with open(json_path + ".sha256", 'w') as f:
+            f.write(hashlib.sha256(content).hexdigest() + "\n")
+
+        assert RecipeRepository(json_path, resident=True).get_all_categories() == ["new"]
+
+    def test_that_corrupt_snapshot_file_should_fall_back_to_json_test(self, json_path):
+        assert generate_snapshot_file(json_path)
+        with open(snapshot_file_path(json_path), 'r+b') as f:
+            f.seek(60)
+            f.truncate()
+
+        assert RecipeRepository(json_path, resident=True).get_all_categories() == ["spring", "testing"]
+
+    def test_that_snapshot_file_with_bad_checksum_should_fall_back_to_json_test(self, json_path):
+        assert generate_snapshot_file(json_path)
+        with open(snapshot_file_path(json_path), 'r+b') as f:
+            f.seek(-1, 2)
+            last = f.read(1)
+            f.seek(-1, 2)
+            f.write(bytes([last[0] ^ 0xFF]))
+        repo = RecipeRepository(json_path, resident=True)
+
+        with patch.object(repo, '_stream_recipes', wraps=repo._stream_recipes) as stream:
+            result = repo.get_recipes_by_dependency("springframework")
+
+        assert stream.call_count == 1
+        assert [r["id"] for r in result] == ["id-1"]
+
+    def test_that_snapshot_file_should_not_be_generated_without_matching_hash_test(self, json_path):
+        with open(json_path + ".sha256", 'w') as f:
+            f.write("0" * 64 + "\n")
+
+        assert not generate_snapshot_file(json_path)
+        RecipeRepository(json_path, resident=True).get_all_categories()
+        with pytest.raises(FileNotFoundError):
+            open(snapshot_file_path(json_path))
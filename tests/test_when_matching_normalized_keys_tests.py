@@ -0,0 +1,67 @@
+import json
+import pytest
+from lib.recipe_repository import RecipeRepository
+from lib.recipe_indexes import normalize_key
+
+
+@pytest.fixture
+def sample_data():
+    return [
+        {
+            "name": "Rename Straße",
+            "description": "Non-ASCII name",
+            "dependency": "org.example:ÜBER-rewrite",
+            "category": "Ｔｅｓｔｉｎｇ",
+            "sub-category": "Ünit",
+            "id": "org.example.RenameStrasse",
+            "tags": ["ﬁle", "Ärger"]
+        },
+        {
+            "name": "Add Spring Web",
+            "description": "Plain ASCII",
+            "dependency": "org.springframework.boot:spring-boot-starter-web",
+            "category": "spring",
+            "sub-category": "web",
+            "id": "org.openrewrite.java.spring.AddSpringWeb",
+            "tags": ["spring", "web"]
+        }
+    ]
+
+
+@pytest.fixture(params=[False, True], ids=["streaming", "resident"])
+def repo(request, tmp_path, sample_data):
+    path = tmp_path / "recipes.json"
+    path.write_text(json.dumps(sample_data, ensure_ascii=False), encoding='utf-8')
+    return RecipeRepository(str(path), resident=request.param)
+
+
+class WhenMatchingNormalizedKeysTests:
+    def test_that_keys_should_fold_case_and_compatibility_characters_test(self):
+        assert normalize_key("STRASSE") == normalize_key("Straße") == "strasse"
+        assert normalize_key("ｓｐｒｉｎｇ") == "spring"
+        assert normalize_key("ﬁle") == "file"
+        assert normalize_key("Ünit") == normalize_key("Ünit")
+        assert normalize_key("Add Spring") == "add spring"
+
+    def test_that_name_search_should_match_casefolded_text_test(self, repo):
+        results = repo.get_recipes_by_name("STRASSE")
+
+        assert [r["id"] for r in results] == ["org.example.RenameStrasse"]
+        assert results[0]["name"] == "Rename Straße"
+
+    def test_that_fullwidth_query_should_match_ascii_name_test(self, repo):
+        assert [r["id"] for r in repo.get_recipes_by_name("ｓｐｒｉｎｇ")] == ["org.openrewrite.java.spring.AddSpringWeb"]
+
+    def test_that_tag_should_match_its_compatibility_form_test(self, repo):
+        assert [r["id"] for r in repo.get_recipes_by_tag("FILE")] == ["org.example.RenameStrasse"]
+        assert [r["id"] for r in repo.get_recipes_by_tag("ärger")] == ["org.example.RenameStrasse"]
+
+    def test_that_category_should_be_listed_and_matched_by_its_key_test(self, repo):
+        assert repo.get_all_categories() == ["spring", "testing"]
+        assert repo.get_subcategories_by_category("TESTING") == ["ünit"]
+
+        results = repo.get_recipes_by_category("testing", "ÜNIT")
+        assert [r["category"] for r in results] == ["Ｔｅｓｔｉｎｇ"]
+
+    def test_that_dependency_should_match_casefolded_text_test(self, repo):
+        assert [r["id"] for r in repo.get_recipes_by_dependency("über")] == ["org.example.RenameStrasse"]
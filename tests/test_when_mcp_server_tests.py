@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, ANY
 from mcp_server.server import build_server
 
 
@@ -22,5 +22,7 @@ class WhenMcpServerTests:
         assert server.name == "openrewrite-recipes"
 
         # Verify that repository and service were created with the fixed path
-        mock_repo.assert_called_once_with("resource/db/recipes.json")
-        mock_service.assert_called_once_with(mock_repo_instance)
+        mock_repo.assert_called_once_with("resource/db/recipes.json", resident=True)
+        mock_service.assert_called_once_with(mock_repo_instance, cache=ANY)
+        # The long-running server reloads database updates in the background
+        mock_repo_instance.watch.assert_called_once_with()
@@ -0,0 +1,104 @@
+import json
+import os
+import pytest
+from lib.recipe_repository import RecipeRepository
+
+
+@pytest.fixture
+def sample_data():
+    return [
+        {
+            "name": f"Recipe {i}",
+            "id": f"id-{i}",
+            "category": "spring" if i % 2 == 0 else "testing",
+            "sub-category": "jdbc",
+            "dependency": "org.openrewrite.recipe:rewrite-third-party",
+            "tags": ["shared"]
+        }
+        for i in range(7)
+    ]
+
+
+@pytest.fixture
+def json_path(tmp_path, sample_data):
+    path = tmp_path / "recipes.json"
+    path.write_text(json.dumps(sample_data))
+    return str(path)
+
+
+def _names(recipes):
+    return [recipe["name"] for recipe in recipes]
+
+
+class WhenPaginatingRecipeQueriesTests:
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_limit_and_offset_should_select_a_page_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        page = repo.get_recipes_by_dependency("third-party", limit=2, offset=3)
+
+        assert _names(page["recipes"]) == ["Recipe 3", "Recipe 4"]
+        assert page["total"] in (7, None)
+        assert page["next_cursor"] is not None
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_following_cursors_should_visit_every_match_once_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        names = []
+        page = repo.get_recipes_by_tag("SHARED", limit=3)
+        names.extend(_names(page["recipes"]))
+        while page["next_cursor"] is not None:
+            page = repo.get_recipes_by_tag("shared", limit=3, cursor=page["next_cursor"])
+            names.extend(_names(page["recipes"]))
+
+        assert names == [f"Recipe {i}" for i in range(7)]
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_every_recipe_query_should_accept_pagination_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        assert _names(repo.get_recipes_by_category("spring", limit=2)["recipes"]) == ["Recipe 0", "Recipe 2"]
+        assert _names(repo.get_recipes_by_category("spring", "jdbc", offset=3)["recipes"]) == ["Recipe 6"]
+        assert _names(repo.get_recipes_by_name("recipe", limit=1, offset=6)["recipes"]) == ["Recipe 6"]
+        assert repo.get_recipes_by_name("recipe", limit=1, offset=6)["next_cursor"] is None
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_last_page_should_have_no_cursor_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        page = repo.get_recipes_by_category("testing", limit=3)
+
+        assert _names(page["recipes"]) == ["Recipe 1", "Recipe 3", "Recipe 5"]
+        assert page["next_cursor"] is None
+
+    def test_that_unpaginated_queries_should_return_lists_test(self, json_path):
+        repo = RecipeRepository(json_path)
+
+        assert len(repo.get_recipes_by_dependency("third-party")) == 7
+        assert repo.get_recipes_by_tag("") == []
+        assert repo.get_recipes_by_tag("", limit=5) == {"recipes": [], "total": 0, "next_cursor": None}
+
+    def test_that_invalid_pagination_arguments_should_raise_test(self, json_path):
+        repo = RecipeRepository(json_path)
+
+        with pytest.raises(ValueError):
+            repo.get_recipes_by_tag("shared", limit=0)
+        with pytest.raises(ValueError):
+            repo.get_recipes_by_tag("shared", offset=-1)
+        with pytest.raises(ValueError):
+            repo.get_recipes_by_tag("shared", limit=1, offset=1, cursor="abc")
+        with pytest.raises(ValueError):
+            repo.get_recipes_by_tag("shared", cursor="not a cursor")
+
+    def test_that_cursor_of_another_dataset_version_should_be_rejected_test(self, json_path, sample_data):
+        repo = RecipeRepository(json_path)
+        cursor = repo.get_recipes_by_tag("shared", limit=2)["next_cursor"]
+
+        with open(json_path, 'w') as f:
+            json.dump(sample_data[:5], f)
+        st = os.stat(json_path)
+        os.utime(json_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        with pytest.raises(ValueError):
+            repo.get_recipes_by_tag("shared", cursor=cursor)
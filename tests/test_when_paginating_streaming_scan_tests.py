@@ -0,0 +1,40 @@
+import json
+import pytest
+from lib.recipe_repository import RecipeRepository
+
+
+pytestmark = pytest.mark.json_backend
+
+
+@pytest.fixture
+def json_path(tmp_path):
+    path = tmp_path / "recipes.json"
+    path.write_text(json.dumps([{"name": f"Recipe {i}", "tags": ["shared"]} for i in range(100)]))
+    return str(path)
+
+
+class WhenPaginatingStreamingScanTests:
+    def test_that_scan_should_stop_once_the_page_is_full_test(self, json_path):
+        repo = RecipeRepository(json_path)
+        read = []
+
+        def counting_stream(keys=None, original=repo._stream_recipes):
+            for recipe in original(keys):
+                read.append(recipe["name"])
+                yield recipe
+
+        repo._stream_recipes = counting_stream
+        page = repo.get_recipes_by_tag("shared", limit=5, offset=10)
+
+        assert [recipe["name"] for recipe in page["recipes"]] == [f"Recipe {i}" for i in range(10, 15)]
+        assert page["total"] is None
+        # One extra match is read to know whether another page follows
+        assert len(read) == 16
+
+    def test_that_resident_page_should_report_the_total_test(self, json_path):
+        repo = RecipeRepository(json_path, resident=True)
+
+        page = repo.get_recipes_by_name("recipe 9", limit=2)
+
+        assert [recipe["name"] for recipe in page["recipes"]] == ["Recipe 9", "Recipe 90"]
+        assert page["total"] == 11
@@ -0,0 +1,83 @@
+import json
+import pytest
+from lib.recipe_repository import RecipeRepository
+
+
+@pytest.fixture
+def sample_data():
+    return [
+        {
+            "name": "Add Spring JDBC",
+            "description": "Add spring-boot-starter-jdbc",
+            "package": "org.openrewrite.java.spring",
+            "dependency": "org.springframework.boot:spring-boot-starter-jdbc",
+            "mvn-command-line": "mvn -U -P rewrite ...",
+            "category": "spring",
+            "sub-category": "jdbc",
+            "id": "id-1",
+            "tags": ["spring", "jdbc"]
+        },
+        {
+            "name": "Migrate to JUnit 5",
+            "package": "org.openrewrite.testing",
+            "dependency": "org.junit.jupiter:junit-jupiter",
+            "category": "testing",
+            "sub-category": "junit",
+            "id": "id-2",
+            "tags": ["test", "junit"]
+        }
+    ]
+
+
+@pytest.fixture
+def json_path(tmp_path, sample_data):
+    path = tmp_path / "recipes.json"
+    path.write_text(json.dumps(sample_data))
+    return str(path)
+
+
+class WhenProjectingRecipeFieldsTests:
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_queries_should_return_only_the_requested_fields_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+        fields = ["id", "name", "package"]
+
+        assert repo.get_recipes_by_category("spring", fields=fields) == [
+            {"id": "id-1", "name": "Add Spring JDBC", "package": "org.openrewrite.java.spring"}
+        ]
+        assert repo.get_recipes_by_tag("junit", fields=fields) == [
+            {"id": "id-2", "name": "Migrate to JUnit 5", "package": "org.openrewrite.testing"}
+        ]
+        assert [recipe["id"] for recipe in repo.get_recipes_by_name("a", fields=["id"])] == ["id-1", "id-2"]
+        assert repo.get_recipes_by_dependency("jupiter", fields=["name"]) == [{"name": "Migrate to JUnit 5"}]
+        assert repo.get_recipe_by_id("id-1", fields=["tags"]) == {"tags": ["spring", "jdbc"]}
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_missing_fields_should_be_left_out_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        result = repo.get_recipes_by_category("testing", fields=["description", "id", "id"])
+
+        assert result == [{"id": "id-2"}]
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_projection_should_combine_with_pagination_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        page = repo.get_recipes_by_name("a", limit=1, fields=["id"])
+
+        assert page["recipes"] == [{"id": "id-1"}]
+        assert page["next_cursor"] is not None
+
+    def test_that_filter_fields_should_not_leak_into_the_result_test(self, json_path):
+        repo = RecipeRepository(json_path)
+
+        assert repo.get_recipes_by_category("spring", "jdbc", fields=["id"]) == [{"id": "id-1"}]
+
+    def test_that_invalid_fields_should_raise_test(self, json_path):
+        repo = RecipeRepository(json_path)
+
+        with pytest.raises(ValueError):
+            repo.get_recipes_by_tag("spring", fields="id")
+        with pytest.raises(ValueError):
+            repo.get_recipe_by_id("id-1", fields=["id", 42])
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import pytest
+from unittest.mock import Mock, patch
+from lib import recipe_generations, recipe_repository
+from lib.recipe_generations import CURRENT_LINK, GENERATIONS_DIR, collect_generations, current_generation, \
+    dataset_path, publish_generation
+from lib.recipe_repository import RecipeRepository
+
+
+pytestmark = pytest.mark.json_backend
+
+
+def download(names):
+    json_bytes = json.dumps([{"name": name, "id": name.lower(), "tags": ["spring"]} for name in names]).encode('utf-8')
+    sha256_response = Mock(text=hashlib.sha256(json_bytes).hexdigest() + "\n")
+    json_response = Mock(content=json_bytes)
+    return [sha256_response, json_response]
+
+
+def update(db_dir, names, **kwargs):
+    with patch('requests.get') as mock_get:
+        mock_get.side_effect = download(names)
+        return RecipeRepository("dummy.json").update_from_remote("https://example.com/recipes.json",
+                                                                 "https://example.com/recipes.json.sha256",
+                                                                 dest_dir=str(db_dir), **kwargs)
+
+
+class WhenPublishingGenerationsTests:
+    def test_that_update_should_publish_a_complete_generation_test(self, tmp_path):
+        db_dir = tmp_path / "db"
+
+        json_path = update(db_dir, ["First"])
+
+        generation = current_generation(str(db_dir))
+        resolved = dataset_path(json_path)
+        assert os.path.islink(json_path) and os.path.islink(json_path + ".sha256")
+        assert resolved == os.path.realpath(db_dir / GENERATIONS_DIR / generation / "recipes.json")
+        assert dataset_path(json_path + ".sha256") == resolved + ".sha256"
+        assert sorted(os.listdir(os.path.dirname(resolved))) == \
+            ["recipes.json", "recipes.json.idx", "recipes.json.sha256", "recipes.json.snap"]
+
+    def test_that_readers_should_switch_to_the_new_generation_test(self, tmp_path):
+        db_dir = tmp_path / "db"
+        json_path = update(db_dir, ["First"])
+        resident = RecipeRepository(json_path, resident=True)
+        streaming = RecipeRepository(json_path)
+        assert [recipe["name"] for recipe in resident.get_recipes_by_tag("spring")] == ["First"]
+        assert streaming.get_recipe_by_id("first")["name"] == "First"
+
+        update(db_dir, ["Second"])
+
+        assert [recipe["name"] for recipe in resident.get_recipes_by_tag("spring")] == ["Second"]
+        assert streaming.get_recipe_by_id("first") == {}
+        assert streaming.get_recipe_by_id("second")["name"] == "Second"
+
+    def test_that_id_lookups_should_read_the_generation_of_their_offsets_test(self, tmp_path, monkeypatch):
+        db_dir = tmp_path / "db"
+        json_path = update(db_dir, ["First", "Second"])
+        streaming = RecipeRepository(json_path)
+        load_id_index = recipe_repository.load_id_index
+        names = ["First", "Second"]
+
+        def load_then_publish(path, expected_sha256):
+            # A new generation with shifted offsets is published right after the index is loaded
+            offsets = load_id_index(path, expected_sha256)
+            names.insert(0, f"New{len(names)}")
+            update(db_dir, names)
+            return offsets
+
+        monkeypatch.setattr(recipe_repository, 'load_id_index', load_then_publish)
+        plan = streaming.explain("get_recipe_by_id", "second")
+        batch = streaming.explain("get_recipes_by_ids", ["first", "new2"])
+
+        assert plan["result"]["name"] == "Second"
+        assert plan["plan"]["access_paths"] == ["id offset index"], "Offsets should not miss and fall back to a scan"
+        assert [recipe["id"] for recipe in batch["result"]["recipes"]] == ["first", "new2"]
+        assert batch["plan"]["access_paths"] == ["id offset index"]
+
+    def test_that_replaced_generations_should_be_collected_after_grace_period_test(self, tmp_path):
+        db_dir = tmp_path / "db"
+        update(db_dir, ["First"])
+        first = current_generation(str(db_dir))
+        update(db_dir, ["Second"])
+        second = current_generation(str(db_dir))
+
+        assert sorted(os.listdir(db_dir / GENERATIONS_DIR)) == sorted([first, second])
+        assert collect_generations(str(db_dir), grace_period=3600) == []
+
+        update(db_dir, ["Third"], grace_period=0)
+
+        assert os.listdir(db_dir / GENERATIONS_DIR) == [current_generation(str(db_dir))]
+        assert collect_generations(str(db_dir), grace_period=0) == []
+
+    def test_that_failed_generation_should_not_be_published_test(self, tmp_path):
+        db_dir = tmp_path / "db"
+        update(db_dir, ["First"])
+        first = current_generation(str(db_dir))
+
+        def failing_prepare(directory):
+            raise OSError("disk full")
+
+        with pytest.raises(OSError):
+            publish_generation(str(db_dir), {"recipes.json": b"[]"}, failing_prepare)
+
+        assert current_generation(str(db_dir)) == first
+        assert os.listdir(db_dir / GENERATIONS_DIR) == [first]
+
+    def test_that_plain_files_should_be_migrated_to_links_test(self, tmp_path):
+        db_dir = tmp_path / "db"
+        db_dir.mkdir()
+        (db_dir / "recipes.json").write_text("[]")
+        (db_dir / "recipes.json.sha256").write_text("0" * 64)
+        (db_dir / "recipes.json.snap").write_bytes(b"stale")
+
+        json_path = update(db_dir, ["First"])
+
+        assert os.readlink(json_path) == os.path.join(CURRENT_LINK, "recipes.json")
+        assert not (db_dir / "recipes.json.snap").exists()
+        assert RecipeRepository(json_path).get_recipe_by_id("first")["name"] == "First"
+
+    def test_that_files_should_be_replaced_in_place_without_symlinks_test(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(recipe_generations, '_supports_symlinks', lambda directory: False)
+        db_dir = tmp_path / "db"
+
+        json_path = update(db_dir, ["First"])
+
+        assert not os.path.islink(json_path)
+        assert current_generation(str(db_dir)) is None
+        assert (db_dir / "recipes.json.snap").exists()
+        assert RecipeRepository(json_path).get_recipe_by_id("first")["name"] == "First"
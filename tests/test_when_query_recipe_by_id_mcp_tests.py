@@ -55,3 +55,11 @@ class WhenQueryRecipeByIdFromMcpTests:
         result = service.get_recipe_by_id("some.id")
 
         assert result == {}, "Should return empty dict when repository throws exception"
+
+    def test_that_fields_are_passed_to_repository(self, service, repo_mock):
+        repo_mock.get_recipe_by_id.return_value = {"id": "abc123", "name": "Recipe"}
+
+        result = service.get_recipe_by_id("abc123", fields=" id, name ,")
+
+        assert result == {"id": "abc123", "name": "Recipe"}, "Projected recipe should be returned unchanged"
+        repo_mock.get_recipe_by_id.assert_called_once_with("abc123", fields=["id", "name"])
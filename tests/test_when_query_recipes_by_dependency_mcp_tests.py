@@ -59,3 +59,19 @@ class WhenQueryRecipesByDependencyFromMcpTests:
         result = service.get_recipes_by_dependency("springframework")
 
         assert result == [], "Should return empty list when repository throws exception"
+
+    def test_that_pagination_arguments_are_passed_to_repository(self, service, repo_mock):
+        sample_page = {"recipes": [{"name": "Recipe 1"}], "total": 3, "next_cursor": "cursor"}
+        repo_mock.get_recipes_by_dependency.return_value = sample_page
+
+        result = service.get_recipes_by_dependency("third-party", limit=1)
+
+        assert result == sample_page, "Page should be returned unchanged"
+        repo_mock.get_recipes_by_dependency.assert_called_once_with("third-party", limit=1, offset=0, cursor=None)
+
+    def test_that_invalid_cursor_returns_empty_page_with_error(self, service, repo_mock):
+        repo_mock.get_recipes_by_dependency.side_effect = ValueError("Invalid cursor: 'x'")
+
+        result = service.get_recipes_by_dependency("third-party", cursor="x")
+
+        assert result == {"recipes": [], "total": 0, "next_cursor": None, "error": "Invalid cursor: 'x'"}
@@ -0,0 +1,43 @@
+import pytest
+from unittest.mock import MagicMock
+from lib.mcp_service import RecipeMcpService
+
+
+class WhenQueryRecipesByIdsFromMcpTests:
+    @pytest.fixture
+    def repo_mock(self):
+        return MagicMock()
+
+    @pytest.fixture
+    def service(self, repo_mock):
+        return RecipeMcpService(repo_mock)
+
+    def test_that_ids_are_cleaned_and_passed_to_repository(self, service, repo_mock):
+        expected = {"recipes": [{"id": "a"}], "missing": ["b"]}
+        repo_mock.get_recipes_by_ids.return_value = expected
+
+        result = service.get_recipes_by_ids([" a ", "", "b", None], fields="id")
+
+        assert result == expected, "Repository result should be returned unchanged"
+        repo_mock.get_recipes_by_ids.assert_called_once_with(["a", "b"], fields=["id"])
+
+    def test_that_comma_separated_ids_are_accepted(self, service, repo_mock):
+        repo_mock.get_recipes_by_ids.return_value = {"recipes": [], "missing": ["a", "b"]}
+
+        service.get_recipes_by_ids("a, b")
+
+        repo_mock.get_recipes_by_ids.assert_called_once_with(["a", "b"])
+
+    @pytest.mark.parametrize("recipe_ids", [[], ["", "  "], None, 42])
+    def test_that_no_ids_return_empty_result(self, service, repo_mock, recipe_ids):
+        result = service.get_recipes_by_ids(recipe_ids)
+
+        assert result == {"recipes": [], "missing": []}
+        repo_mock.get_recipes_by_ids.assert_not_called()
+
+    def test_that_repo_exception_returns_empty_result(self, service, repo_mock):
+        repo_mock.get_recipes_by_ids.side_effect = Exception("Database error")
+
+        result = service.get_recipes_by_ids(["a"])
+
+        assert result == {"recipes": [], "missing": []}
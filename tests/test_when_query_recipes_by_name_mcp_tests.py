@@ -59,3 +59,11 @@ class WhenQueryRecipesByNameFromMcpTests:
         result = service.get_recipes_by_name("spring")
 
         assert result == [], "Should return empty list when repository throws exception"
+
+    def test_that_max_distance_is_passed_to_repository(self, service, repo_mock):
+        repo_mock.get_recipes_by_name.return_value = [{"name": "PreferJavaUtilObjectsEquals"}]
+
+        result = service.get_recipes_by_name("PreferJavaUtilObjectEquals", max_distance=2)
+
+        assert result == [{"name": "PreferJavaUtilObjectsEquals"}]
+        repo_mock.get_recipes_by_name.assert_called_once_with("PreferJavaUtilObjectEquals", max_distance=2)
@@ -0,0 +1,87 @@
+import json
+import os
+import pytest
+from unittest.mock import patch
+from lib.recipe_repository import RecipeRepository
+from lib.recipe_indexes import build_category_counts, build_category_index, build_category_positions
+
+
+pytestmark = pytest.mark.json_backend
+
+
+@pytest.fixture
+def sample_data():
+    return [
+        {"name": "Recipe 1", "category": "spring", "sub-category": "jdbc"},
+        {"name": "Recipe 2", "category": "Spring", "sub-category": "Web"},
+        {"name": "Recipe 3", "category": "testing", "sub-category": None},
+        {"name": "Recipe 4", "category": "spring", "sub-category": "jdbc"},
+        {"name": "Recipe 5", "category": "spring", "sub-category": ""},
+        {"name": "Recipe 6", "category": "", "sub-category": "orphan"},
+        {"name": "Recipe 7", "category": 42, "sub-category": "orphan"},
+        {"name": "Recipe 8", "sub-category": "orphan"},
+        {"name": "Recipe 9", "category": "testing", "sub-category": ["not", "a", "string"]}
+    ]
+
+
+@pytest.fixture
+def json_path(tmp_path, sample_data):
+    path = tmp_path / "recipes.json"
+    path.write_text(json.dumps(sample_data))
+    return str(path)
+
+
+class WhenQueryingCategoryIndexTests:
+    def test_that_index_should_group_positions_by_category_and_subcategory_test(self, sample_data):
+        index = build_category_index(sample_data)
+
+        assert index == {
+            "spring": {"jdbc": [0, 3], "web": [1], "": [4]},
+            "testing": {None: [2, 8]}
+        }
+
+    def test_that_category_positions_should_be_in_file_order_test(self, sample_data):
+        positions = build_category_positions(build_category_index(sample_data))
+
+        assert positions == {"spring": [0, 1, 3, 4], "testing": [2, 8]}
+
+    def test_that_indexed_queries_should_match_streaming_queries_test(self, json_path):
+        streaming = RecipeRepository(json_path)
+        resident = RecipeRepository(json_path, resident=True)
+
+        assert resident.get_all_categories() == streaming.get_all_categories()
+        assert resident.get_categories_with_subcategories() == streaming.get_categories_with_subcategories()
+        for category in ["spring", "SPRING", "testing", "missing"]:
+            assert resident.get_subcategories_by_category(category) == \
+                streaming.get_subcategories_by_category(category)
+            assert resident.get_recipes_by_category(category) == streaming.get_recipes_by_category(category)
+            for subcategory in ["jdbc", "WEB", "", None, "missing"]:
+                assert resident.get_recipes_by_category(category, subcategory) == \
+                    streaming.get_recipes_by_category(category, subcategory)
+
+    def test_that_index_should_be_built_once_per_dataset_test(self, json_path, sample_data):
+        repo = RecipeRepository(json_path, resident=True)
+
+        with patch('lib.recipe_snapshot.build_category_index', wraps=build_category_index) as build:
+            repo.get_recipes_by_category("spring")
+            repo.get_subcategories_by_category("spring")
+            repo.get_categories_with_subcategories()
+            assert build.call_count == 1
+
+            with open(json_path, 'w') as f:
+                json.dump(sample_data[:2], f)
+            st = os.stat(json_path)
+            os.utime(json_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+            assert repo.get_recipes_by_category("spring", "web")[0]["name"] == "Recipe 2"
+            assert build.call_count == 2
+
+    def test_that_streaming_category_tree_should_be_built_once_per_dataset_test(self, json_path):
+        repo = RecipeRepository(json_path)
+
+        with patch('lib.recipe_repository.build_category_counts', wraps=build_category_counts) as build:
+            repo.get_all_categories()
+            repo.get_categories_with_subcategories()
+            repo.get_subcategories_by_category("spring")
+            repo.get_category_tree()
+            assert build.call_count == 1
@@ -0,0 +1,131 @@
+import json
+import os
+import pytest
+from unittest.mock import patch
+from lib.recipe_repository import RecipeRepository
+
+
+pytestmark = pytest.mark.json_backend
+
+
+@pytest.fixture
+def sample_data():
+    return [
+        {
+            "name": "Add Spring JDBC",
+            "description": "Add spring-boot-starter-jdbc",
+            "package": "org.openrewrite.java.spring",
+            "dependency": "org.springframework.boot:spring-boot-starter-jdbc",
+            "mvn-command-line": "mvn -U -P rewrite ...",
+            "category": "spring",
+            "sub-category": "jdbc",
+            "id": "org.openrewrite.java.spring.AddSpringJdbc",
+            "tags": ["spring", "jdbc", "database"],
+            "link": "https://docs.openrewrite.org/..."
+        },
+        {
+            "name": "Add Spring Web",
+            "description": "Add spring-boot-starter-web",
+            "package": "org.openrewrite.java.spring",
+            "dependency": "org.springframework.boot:spring-boot-starter-web",
+            "mvn-command-line": "mvn -U -P rewrite ...",
+            "category": "Spring",
+            "sub-category": "web",
+            "id": "org.openrewrite.java.spring.AddSpringWeb",
+            "tags": ["spring", "web"],
+            "link": "https://docs.openrewrite.org/..."
+        },
+        {
+            "name": "Migrate to JUnit 5",
+            "description": "Rewrite tests to use JUnit Jupiter",
+            "package": "org.openrewrite.testing",
+            "dependency": "org.junit.jupiter:junit-jupiter",
+            "mvn-command-line": "mvn -U -P rewrite ...",
+            "category": "testing",
+            "sub-category": None,
+            "id": "org.openrewrite.testing.JUnit5Migration",
+            "tags": ["test", "junit", "migration"],
+            "link": "https://docs.openrewrite.org/..."
+        }
+    ]
+
+
+@pytest.fixture
+def json_path(tmp_path, sample_data):
+    path = tmp_path / "recipes.json"
+    path.write_text(json.dumps(sample_data))
+    return str(path)
+
+
+def _bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class WhenQueryingResidentRepositoryTests:
+    def test_that_resident_queries_should_match_streaming_queries_test(self, json_path):
+        streaming = RecipeRepository(json_path)
+        resident = RecipeRepository(json_path, resident=True)
+
+        assert resident.get_all_categories() == streaming.get_all_categories()
+        assert resident.get_categories_with_subcategories() == streaming.get_categories_with_subcategories()
+        assert resident.get_subcategories_by_category("spring") == streaming.get_subcategories_by_category("spring")
+        assert resident.get_recipes_by_category("SPRING") == streaming.get_recipes_by_category("SPRING")
+        assert resident.get_recipes_by_category("spring", "web") == streaming.get_recipes_by_category("spring", "web")
+        assert resident.get_recipes_by_tag("spring") == streaming.get_recipes_by_tag("spring")
+        assert resident.get_recipes_by_name("add") == streaming.get_recipes_by_name("add")
+        assert resident.get_recipe_by_id("org.openrewrite.testing.JUnit5Migration") == \
+            streaming.get_recipe_by_id("org.openrewrite.testing.JUnit5Migration")
+        assert resident.get_recipes_by_dependency("springframework") == \
+            streaming.get_recipes_by_dependency("springframework")
+
+    def test_that_unchanged_dataset_should_be_parsed_only_once_test(self, json_path):
+        repo = RecipeRepository(json_path, resident=True)
+
+        with patch.object(repo, '_stream_recipes', wraps=repo._stream_recipes) as stream:
+            repo.get_all_categories()
+            repo.get_recipes_by_tag("spring")
+            repo.get_recipe_by_id("org.openrewrite.java.spring.AddSpringWeb")
+
+        assert stream.call_count == 1
+
+    def test_that_changed_dataset_should_be_reloaded_test(self, json_path, sample_data):
+        repo = RecipeRepository(json_path, resident=True)
+        assert len(repo.get_recipes_by_tag("spring")) == 2
+
+        with open(json_path, 'w') as f:
+            json.dump(sample_data[:1], f)
+        _bump_mtime(json_path)
+
+        assert len(repo.get_recipes_by_tag("spring")) == 1
+
+    def test_that_changed_sha256_file_should_trigger_reload_test(self, json_path):
+        repo = RecipeRepository(json_path, resident=True)
+        repo.get_all_categories()
+
+        with patch.object(repo, '_stream_recipes', wraps=repo._stream_recipes) as stream:
+            with open(json_path + ".sha256", 'w') as f:
+                f.write("0" * 64 + "\n")
+            repo.get_all_categories()
+
+        assert stream.call_count == 1
+
+    def test_that_removed_dataset_should_result_in_empty_responses_test(self, json_path):
+        repo = RecipeRepository(json_path, resident=True)
+        assert repo.get_all_categories() == ["spring", "testing"]
+
+        os.unlink(json_path)
+
+        assert repo.get_all_categories() == []
+        assert repo.get_recipe_by_id("org.openrewrite.java.spring.AddSpringJdbc") == {}
+
+    def test_that_modifying_returned_recipes_should_not_change_the_snapshot_test(self, json_path):
+        repo = RecipeRepository(json_path, resident=True)
+
+        recipe = repo.get_recipe_by_id("org.openrewrite.java.spring.AddSpringJdbc")
+        recipe["name"] = "Changed"
+        recipe["tags"].append("changed")
+
+        again = repo.get_recipe_by_id("org.openrewrite.java.spring.AddSpringJdbc")
+        assert again["name"] == "Add Spring JDBC"
+        assert again["tags"] == ["spring", "jdbc", "database"]
@@ -0,0 +1,132 @@
+import json
+import os
+import sqlite3
+import pytest
+from decimal import Decimal
+from unittest.mock import patch
+from lib.recipe_repository import RecipeRepository as JsonRecipeRepository
+from lib.sqlite_recipe_repository import SqliteRecipeRepository
+from lib.mcp_service import RecipeMcpService
+
+
+@pytest.fixture
+def sample_data():
+    return [
+        {
+            "name": "Add Spring JDBC",
+            "description": "Add spring-boot-starter-jdbc",
+            "package": "org.openrewrite.java.spring",
+            "dependency": "org.springframework.boot:spring-boot-starter-jdbc",
+            "category": "spring",
+            "sub-category": "jdbc",
+            "id": "org.openrewrite.java.spring.AddSpringJdbc",
+            "tags": ["spring", "jdbc", "database"],
+            "version": 1.5
+        },
+        {
+            "name": "Add Spring Web",
+            "description": "Add spring-boot-starter-web",
+            "package": "org.openrewrite.java.spring",
+            "dependency": "org.springframework.boot:spring-boot-starter-web",
+            "category": "Spring",
+            "sub-category": "web",
+            "id": "org.openrewrite.java.spring.AddSpringWeb",
+            "tags": ["Spring", "web", "web"]
+        },
+        {
+            "name": "Migrate to JUnit 5",
+            "description": "Rewrite tests to use JUnit Jupiter",
+            "package": "org.openrewrite.testing",
+            "dependency": "org.junit.jupiter:junit-jupiter",
+            "category": "testing",
+            "sub-category": None,
+            "id": "org.openrewrite.testing.JUnit5Migration",
+            "tags": ["test", "junit", "migration"]
+        }
+    ]
+
+
+@pytest.fixture
+def json_path(tmp_path, sample_data):
+    path = tmp_path / "recipes.json"
+    path.write_text(json.dumps(sample_data))
+    return str(path)
+
+
+def _bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class WhenQueryingSqliteRepositoryTests:
+    def test_that_sqlite_queries_should_match_json_queries_test(self, json_path):
+        json_repo = JsonRecipeRepository(json_path)
+        sqlite_repo = SqliteRecipeRepository(json_path)
+
+        assert sqlite_repo.get_all_categories() == json_repo.get_all_categories()
+        assert sqlite_repo.get_categories_with_subcategories() == json_repo.get_categories_with_subcategories()
+        assert sqlite_repo.get_subcategories_by_category("spring") == json_repo.get_subcategories_by_category("spring")
+        assert sqlite_repo.get_recipes_by_category("spring", "web") == json_repo.get_recipes_by_category("spring", "web")
+        assert sqlite_repo.get_recipes_by_tag("SPRING") == json_repo.get_recipes_by_tag("SPRING")
+        assert sqlite_repo.get_all_tags() == json_repo.get_all_tags()
+        assert sqlite_repo.get_recipes_by_name("spring") == json_repo.get_recipes_by_name("spring")
+        assert sqlite_repo.get_recipes_by_name("5") == json_repo.get_recipes_by_name("5")
+        assert sqlite_repo.get_recipe_by_id("org.openrewrite.testing.JUnit5Migration") == \
+            json_repo.get_recipe_by_id("org.openrewrite.testing.JUnit5Migration")
+        assert sqlite_repo.get_recipes_by_dependency("JUNIT") == json_repo.get_recipes_by_dependency("JUNIT")
+
+    def test_that_decimal_values_should_round_trip_test(self, json_path):
+        repo = SqliteRecipeRepository(json_path)
+
+        recipe = repo.get_recipe_by_id("org.openrewrite.java.spring.AddSpringJdbc")
+
+        assert recipe["version"] == Decimal("1.5")
+
+    def test_that_database_file_should_be_created_next_to_the_json_file_test(self, json_path):
+        repo = SqliteRecipeRepository(json_path)
+        repo.get_all_categories()
+
+        assert os.path.exists(json_path + ".sqlite")
+
+    def test_that_unchanged_database_file_should_be_reused_test(self, json_path):
+        SqliteRecipeRepository(json_path).get_all_categories()
+
+        repo = SqliteRecipeRepository(json_path)
+        with patch.object(repo, '_stream_recipes', wraps=repo._stream_recipes) as stream:
+            assert repo.get_all_categories() == ["spring", "testing"]
+
+        assert stream.call_count == 0
+
+    def test_that_changed_dataset_should_rebuild_the_database_test(self, json_path, sample_data):
+        repo = SqliteRecipeRepository(json_path)
+        assert len(repo.get_recipes_by_tag("spring")) == 2
+
+        with open(json_path, 'w') as f:
+            json.dump(sample_data[:1], f)
+        _bump_mtime(json_path)
+
+        assert len(repo.get_recipes_by_tag("spring")) == 1
+        assert repo.get_recipe_by_id("org.openrewrite.java.spring.AddSpringWeb") == {}
+
+    def test_that_name_search_should_work_without_fts5_test(self, json_path):
+        with patch('lib.sqlite_recipe_repository._FTS_SCHEMA', "CREATE VIRTUAL TABLE recipes_fts USING missing()"):
+            repo = SqliteRecipeRepository(json_path, db_path=':memory:')
+
+            assert [r["id"] for r in repo.get_recipes_by_name("spring w")] == \
+                ["org.openrewrite.java.spring.AddSpringWeb"]
+
+    def test_that_name_and_description_should_be_indexed_in_fts5_test(self, json_path):
+        repo = SqliteRecipeRepository(json_path)
+        repo.get_all_categories()
+
+        with sqlite3.connect(json_path + ".sqlite") as connection:
+            rows = connection.execute(
+                "SELECT rowid FROM recipes_fts WHERE recipes_fts MATCH ? ORDER BY rowid", ('"jupiter"',)).fetchall()
+
+        assert rows == [(2,)]
+
+    def test_that_service_should_work_with_sqlite_repository_test(self, json_path):
+        service = RecipeMcpService(SqliteRecipeRepository(json_path))
+
+        assert service.get_all_categories() == ["spring", "testing"]
+        assert service.get_recipe_by_id("org.openrewrite.java.spring.AddSpringWeb")["name"] == "Add Spring Web"
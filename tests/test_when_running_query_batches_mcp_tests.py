@@ -0,0 +1,39 @@
+import pytest
+from unittest.mock import MagicMock
+from lib.mcp_service import RecipeMcpService
+
+
+class WhenRunningQueryBatchesFromMcpTests:
+    @pytest.fixture
+    def repo_mock(self):
+        return MagicMock()
+
+    @pytest.fixture
+    def service(self, repo_mock):
+        return RecipeMcpService(repo_mock)
+
+    def test_that_queries_are_passed_to_repository(self, service, repo_mock):
+        queries = [{"method": "get_recipes_by_tag", "tag": "junit"}, {"method": "get_recipe_by_id", "recipe_id": "a"}]
+        repo_mock.run_queries.return_value = [[{"id": "b"}], {"id": "a"}]
+
+        result = service.run_queries(queries)
+
+        assert result == {"results": [[{"id": "b"}], {"id": "a"}]}
+        repo_mock.run_queries.assert_called_once_with(queries)
+
+    @pytest.mark.parametrize("queries", [[], None, "get_recipes_by_tag"])
+    def test_that_empty_or_invalid_input_returns_no_results(self, service, repo_mock, queries):
+        assert service.run_queries(queries) == {"results": []}
+        repo_mock.run_queries.assert_not_called()
+
+    def test_that_rejected_queries_return_the_error(self, service, repo_mock):
+        repo_mock.run_queries.side_effect = ValueError("Unsupported query method: 'nope'")
+
+        result = service.run_queries([{"method": "nope"}])
+
+        assert result == {"results": [], "error": "Unsupported query method: 'nope'"}
+
+    def test_that_repository_failures_return_no_results(self, service, repo_mock):
+        repo_mock.run_queries.side_effect = OSError("unreadable")
+
+        assert service.run_queries([{"method": "get_recipes_by_tag", "tag": "junit"}]) == {"results": []}
@@ -0,0 +1,120 @@
+import json
+import pytest
+from lib.recipe_repository import RecipeRepository
+
+
+@pytest.fixture
+def sample_data():
+    return [
+        {"name": "JUnit4to5Migration", "category": "java", "sub-category": "testing",
+         "dependency": "org.openrewrite.recipe:rewrite-testing-frameworks:RELEASE", "tags": ["junit", "testing"],
+         "id": "junit-migration"},
+        {"name": "AssertJBestPractices", "category": "java", "sub-category": "testing",
+         "dependency": "org.openrewrite.recipe:rewrite-testing-frameworks:RELEASE", "tags": ["testing"],
+         "id": "assertj"},
+        {"name": "SpringBootJUnit", "category": "spring", "sub-category": "boot3",
+         "dependency": "org.openrewrite.recipe:rewrite-spring:RELEASE", "tags": ["JUnit", "spring"],
+         "id": "spring-junit"},
+        {"name": "Uncategorized", "id": "bare"}
+    ]
+
+
+@pytest.fixture
+def json_path(tmp_path, sample_data):
+    path = tmp_path / "recipes.json"
+    path.write_text(json.dumps(sample_data))
+    return str(path)
+
+
+QUERIES = [
+    {"method": "get_recipes_by_tag", "tag": "junit"},
+    {"method": "get_recipes_by_category", "category": "java", "subcategory": "testing", "fields": ["id"]},
+    {"method": "get_recipes_by_name", "name_query": "junit", "fields": ["id", "name"]},
+    {"method": "get_recipes_by_dependency", "dependency": "rewrite-testing"},
+    {"method": "get_recipe_by_id", "recipe_id": "spring-junit"},
+    {"method": "get_recipe_by_id", "recipe_id": "unknown"},
+    {"method": "find_recipes", "tag": "testing", "exclude_name": "assert"},
+    {"method": "get_recipes_by_tag", "tag": ""},
+]
+
+
+class WhenRunningQueryBatchesTests:
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_results_should_match_the_single_queries_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        results = repo.run_queries(QUERIES)
+
+        assert results == [getattr(repo, query["method"])(**{key: value for key, value in query.items()
+                                                              if key != "method"}) for query in QUERIES]
+        assert [recipe["id"] for recipe in results[0]] == ["junit-migration", "spring-junit"]
+        assert results[4]["name"] == "SpringBootJUnit"
+        assert results[5] == {}
+        assert results[7] == []
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_typo_tolerant_lookup_should_match_the_single_query_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        results = repo.run_queries([
+            {"method": "get_recipes_by_name", "name_query": "SpringBootJunt", "max_distance": 1, "fields": ["id"]},
+            {"method": "get_recipes_by_name", "name_query": "junit", "max_distance": 0},
+            {"method": "get_recipes_by_tag", "tag": "testing", "fields": ["id"]}])
+
+        assert results == [repo.get_recipes_by_name("SpringBootJunt", max_distance=1, fields=["id"]),
+                           repo.get_recipes_by_name("junit", max_distance=0),
+                           repo.get_recipes_by_tag("testing", fields=["id"])]
+        assert results[0] == [{"id": "spring-junit"}]
+        assert results[1] == []
+
+    def test_that_streaming_batch_should_read_the_file_once_test(self, json_path, sample_data):
+        repo = RecipeRepository(json_path)
+
+        plan = repo.explain("run_queries", QUERIES)["plan"]
+
+        assert plan["access_paths"] == ["batch scan", "stream"]
+        assert plan["records_decoded"] == len(sample_data)
+
+    def test_that_typo_tolerant_lookup_should_use_the_fuzzy_index_test(self, json_path):
+        repo = RecipeRepository(json_path)
+
+        explained = repo.explain("run_queries", [
+            {"method": "get_recipes_by_name", "name_query": "AssertJBestPractice", "max_distance": 1, "fields": ["id"]},
+            {"method": "get_recipes_by_tag", "tag": "junit", "fields": ["id"]}])
+
+        assert explained["result"] == [[{"id": "assertj"}], [{"id": "junit-migration"}, {"id": "spring-junit"}]]
+        # The name lookup builds the fuzzy name index instead of testing each recipe
+        assert "build" in explained["plan"]["phases_ms"]
+
+    def test_that_id_lookups_should_stop_once_found_test(self, json_path):
+        repo = RecipeRepository(json_path)
+
+        plan = repo.explain("run_queries", [{"method": "get_recipe_by_id", "recipe_id": "assertj"}])["plan"]
+
+        assert plan["records_examined"] == 2
+
+    def test_that_shared_matches_should_not_alias_test(self, json_path):
+        repo = RecipeRepository(json_path)
+
+        first, second = repo.run_queries([{"method": "get_recipes_by_tag", "tag": "spring"},
+                                          {"method": "get_recipes_by_category", "category": "spring"}])
+        first[0]["tags"].append("changed")
+
+        assert second[0]["tags"] == ["JUnit", "spring"]
+
+    @pytest.mark.parametrize("queries", [
+        "get_recipes_by_tag",
+        [{"tag": "junit"}],
+        [{"method": "update_from_remote"}],
+        [{"method": "get_recipes_by_tag", "tag": "junit", "limit": 1}],
+        [{"method": "find_recipes", "tag": 1}],
+        [{"method": "get_recipes_by_name", "name_query": "junit", "max_distance": -1}],
+        [{"method": "get_recipes_by_tag", "tag": "junit", "max_distance": 1}],
+        [{"method": "get_recipes_by_tag", "tag": "junit"}, {"method": "get_recipe_by_id", "recipe_id": "a",
+                                                             "fields": "id"}],
+    ])
+    def test_that_invalid_queries_should_raise_test(self, json_path, queries):
+        repo = RecipeRepository(json_path)
+
+        with pytest.raises(ValueError):
+            repo.run_queries(queries)
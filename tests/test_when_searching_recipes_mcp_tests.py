@@ -0,0 +1,44 @@
+import pytest
+from unittest.mock import MagicMock
+from lib.mcp_service import RecipeMcpService
+
+
+class WhenSearchingRecipesFromMcpTests:
+    @pytest.fixture
+    def repo_mock(self):
+        return MagicMock()
+
+    @pytest.fixture
+    def service(self, repo_mock):
+        return RecipeMcpService(repo_mock)
+
+    def test_that_returns_ranked_recipes(self, service, repo_mock):
+        sample_recipes = [{"name": "JUnit4to5Migration", "id": "1"}, {"name": "AssertJ", "id": "2"}]
+        repo_mock.search_recipes.return_value = sample_recipes
+
+        result = service.search_recipes("  junit migration ", 5)
+
+        assert result == sample_recipes, "Ranked recipes should be returned unchanged"
+        repo_mock.search_recipes.assert_called_once_with("junit migration", 5)
+
+    def test_that_fields_are_passed_to_repository(self, service, repo_mock):
+        repo_mock.search_recipes.return_value = [{"id": "1"}]
+
+        result = service.search_recipes("junit", fields="id, name")
+
+        assert result == [{"id": "1"}]
+        repo_mock.search_recipes.assert_called_once_with("junit", 10, fields=["id", "name"])
+
+    @pytest.mark.parametrize("query", ["", "   ", None])
+    def test_that_blank_query_returns_empty_list(self, service, repo_mock, query):
+        result = service.search_recipes(query)
+
+        assert result == [], "Blank query should return empty list"
+        repo_mock.search_recipes.assert_not_called()
+
+    def test_that_repo_exception_returns_empty_list(self, service, repo_mock):
+        repo_mock.search_recipes.side_effect = ValueError("limit must be a positive integer")
+
+        result = service.search_recipes("junit", 0)
+
+        assert result == [], "Should return empty list when repository throws exception"
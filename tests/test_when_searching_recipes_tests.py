@@ -0,0 +1,83 @@
+import json
+import pytest
+from lib.recipe_repository import RecipeRepository
+from lib.recipe_text_index import TextIndex, tokenize
+
+
+@pytest.fixture
+def sample_data():
+    return [
+        {
+            "name": "Add Spring JDBC",
+            "description": "Add spring-boot-starter-jdbc",
+            "package": "org.openrewrite.java.spring",
+            "id": "spring-jdbc"
+        },
+        {
+            "name": "JUnit4to5Migration",
+            "description": "Migrates JUnit 4.x tests to JUnit Jupiter",
+            "package": "org.openrewrite.java.testing.junit5",
+            "id": "junit-migration"
+        },
+        {
+            "name": "AssertJ best practices",
+            "description": "Use JUnit assertions sparingly",
+            "package": "org.openrewrite.java.testing.assertj",
+            "id": "assertj"
+        },
+        {"name": 42, "description": None, "id": "no-text"}
+    ]
+
+
+@pytest.fixture
+def json_path(tmp_path, sample_data):
+    path = tmp_path / "recipes.json"
+    path.write_text(json.dumps(sample_data))
+    return str(path)
+
+
+class WhenSearchingRecipesTests:
+    def test_that_identifiers_should_be_split_into_terms_test(self):
+        assert tokenize("JUnit4to5Migration") == ["j", "unit", "junit", "4", "to", "5", "migration"]
+        assert tokenize("org.openrewrite.java") == ["org", "openrewrite", "java"]
+        assert tokenize("spring-boot_starter") == ["spring", "boot", "starter"]
+        assert tokenize("PreferJavaUtil") == ["prefer", "java", "util", "preferjavautil"]
+
+    def test_that_index_should_rank_by_relevance_test(self, sample_data):
+        index = TextIndex.build(sample_data)
+
+        ranked = index.search("junit migration", 10)
+
+        assert [position for position, _ in ranked] == [1, 2]
+        assert ranked[0][1] > ranked[1][1]
+        assert [position for position, _ in index.search("junit", 1)] == [1]
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_search_should_return_best_matches_first_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        result = repo.search_recipes("JUnit migration")
+
+        assert [recipe["id"] for recipe in result] == ["junit-migration", "assertj"]
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_search_should_cover_description_and_package_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        assert [recipe["id"] for recipe in repo.search_recipes("jupiter")] == ["junit-migration"]
+        assert [recipe["id"] for recipe in repo.search_recipes("assertj", fields=["id"])] == ["assertj"]
+        assert repo.search_recipes("spring jdbc", limit=1, fields=["id"]) == [{"id": "spring-jdbc"}]
+
+    @pytest.mark.parametrize("resident", [False, True])
+    def test_that_search_without_matches_should_return_empty_list_test(self, json_path, resident):
+        repo = RecipeRepository(json_path, resident=resident)
+
+        assert repo.search_recipes("kotlin") == []
+        assert repo.search_recipes("...") == []
+        assert repo.search_recipes("") == []
+
+    def test_that_invalid_limit_should_raise_test(self, json_path):
+        repo = RecipeRepository(json_path)
+
+        with pytest.raises(ValueError):
+            repo.search_recipes("junit", limit=0)
@@ -0,0 +1,67 @@
+import json
+import pytest
+from lib import recipe_json_backend
+from lib.recipe_json_backend import JSON_BACKEND_ENV, available_json_backends, json_backend_name, set_json_backend
+from lib.recipe_repository import RecipeRepository
+
+
+pytestmark = pytest.mark.json_backend
+
+
+@pytest.fixture(autouse=True)
+def unselected_backend(monkeypatch):
+    # Every test starts before the first selection and leaves the process backend untouched
+    monkeypatch.delenv(JSON_BACKEND_ENV, raising=False)
+    monkeypatch.setattr(recipe_json_backend, '_active', None)
+
+
+@pytest.fixture
+def json_path(tmp_path):
+    path = tmp_path / "recipes.json"
+    path.write_text(json.dumps([
+        {"name": "A", "id": "a", "tags": ["spring"], "score": 1.5},
+        {"name": "B", "id": "b", "tags": ["junit"]}
+    ]))
+    return str(path)
+
+
+class WhenSelectingJsonBackendTests:
+    def test_that_fastest_available_backend_should_be_preferred_test(self, monkeypatch):
+        assert json_backend_name() == available_json_backends()[0]
+
+        monkeypatch.setitem(recipe_json_backend._loaded, 'yajl2_c', None)
+        monkeypatch.setitem(recipe_json_backend._loaded, 'yajl2_cffi', None)
+
+        assert set_json_backend() == 'python'
+
+    def test_that_environment_should_select_the_backend_test(self, monkeypatch, json_path):
+        monkeypatch.setenv(JSON_BACKEND_ENV, 'python')
+
+        repo = RecipeRepository(json_path)
+
+        assert repo.json_backend == 'python'
+        assert [recipe["id"] for recipe in repo.get_recipes_by_tag("spring")] == ["a"]
+
+    @pytest.mark.parametrize("skips_values", [None, False, True])
+    def test_that_every_backend_should_decode_the_same_records_test(self, json_path, monkeypatch, skips_values):
+        monkeypatch.setattr('lib.recipe_snapshot._SKIPS_UNREQUESTED_VALUES', skips_values)
+        repo = RecipeRepository(json_path)
+        results = []
+        for backend in available_json_backends():
+            set_json_backend(backend)
+            results.append((list(repo._stream_recipes()), repo.get_recipes_by_name("b", fields=["id"])))
+
+        assert results[0][1] == [{"id": "b"}]
+        assert all(result == results[0] for result in results)
+
+    def test_that_unknown_or_missing_backend_should_raise_test(self, monkeypatch, json_path):
+        with pytest.raises(ValueError):
+            set_json_backend('simdjson')
+
+        monkeypatch.setitem(recipe_json_backend._loaded, 'yajl2_cffi', None)
+        with pytest.raises(ValueError):
+            set_json_backend('yajl2_cffi')
+
+        monkeypatch.setenv(JSON_BACKEND_ENV, 'simdjson')
+        with pytest.raises(ValueError):
+            RecipeRepository(json_path)
@@ -0,0 +1,72 @@
+import io
+import json
+import pytest
+from unittest.mock import patch
+from lib import recipe_snapshot
+from lib.recipe_snapshot import iter_recipes
+from lib.recipe_repository import RecipeRepository
+
+
+pytestmark = pytest.mark.json_backend
+
+
+@pytest.fixture
+def data():
+    return [
+        {"id": "a", "name": "A", "tags": ["x", {"nested": [1, 2.5, None]}], "description": "long text"},
+        "not a recipe",
+        ["not", {"a": "recipe"}],
+        {"name": "B", "meta": {"id": "inner", "list": [[], {}]}, "id": "b"},
+        {}
+    ]
+
+
+class WhenStreamingSelectedKeysTests:
+    @pytest.mark.parametrize("skips_values", [False, True])
+    def test_that_selected_keys_should_match_full_records_test(self, data, skips_values):
+        content = json.dumps(data).encode('utf-8')
+        keys = {"id", "tags"}
+
+        with patch.object(recipe_snapshot, '_SKIPS_UNREQUESTED_VALUES', skips_values):
+            selected = list(iter_recipes(io.BytesIO(content), keys))
+        full = list(iter_recipes(io.BytesIO(content)))
+
+        assert len(selected) == len(full) == 3
+        for partial, recipe in zip(selected, full):
+            assert {key: recipe[key] for key in keys if key in recipe} == \
+                {key: partial[key] for key in keys if key in partial}
+
+    def test_that_unrequested_values_should_be_skipped_test(self, data):
+        with patch.object(recipe_snapshot, '_SKIPS_UNREQUESTED_VALUES', True):
+            selected = list(iter_recipes(io.BytesIO(json.dumps(data).encode('utf-8')), {"name"}))
+
+        assert selected == [{"name": "A"}, {"name": "B"}, {}]
+
+    @pytest.mark.parametrize("content", ['"not a list"', 'null', '[]', '{"recipes": {"name": "Foo", "tags": ["spring"]}}',
+                                         '{"name": "Foo", "tags": ["spring"]}'])
+    @pytest.mark.parametrize("skips_values", [False, True])
+    def test_that_non_list_dataset_should_yield_no_records_test(self, content, skips_values):
+        with patch.object(recipe_snapshot, '_SKIPS_UNREQUESTED_VALUES', skips_values):
+            assert list(iter_recipes(io.BytesIO(content.encode('utf-8')), {"name", "tags"})) == []
+
+    @pytest.mark.parametrize("content", ['"not a list"', 'null', '{"recipes": {"name": "Foo", "tags": ["spring"]}}'])
+    def test_that_non_list_dataset_should_give_empty_projected_responses_test(self, tmp_path, content):
+        path = tmp_path / "recipes.json"
+        path.write_text(content)
+        repo = RecipeRepository(str(path))
+
+        with patch.object(recipe_snapshot, '_SKIPS_UNREQUESTED_VALUES', True):
+            assert repo.get_recipes_by_tag("spring") == []
+            assert repo.get_recipes_by_tag("spring", fields=["name"]) == []
+            assert repo.get_recipes_by_name("foo", fields=["name"]) == []
+            assert repo.get_recipes_by_name("foo", max_distance=1) == []
+            assert repo.search_recipes("foo") == []
+            assert repo.complete("foo") == []
+
+    def test_that_truncated_file_should_yield_preceding_records_test(self, data):
+        content = json.dumps(data).encode('utf-8')
+
+        with patch.object(recipe_snapshot, '_SKIPS_UNREQUESTED_VALUES', True):
+            selected = list(iter_recipes(io.BytesIO(content[:content.index(b'"B"')]), {"id"}))
+
+        assert selected == [{"id": "a"}]
@@ -0,0 +1,107 @@
+import json
+import time
+import pytest
+from lib.recipe_repository import RecipeRepository
+from lib.recipe_watcher import DatasetWatcher
+
+
+pytestmark = pytest.mark.json_backend
+
+
+def write_recipes(path, names):
+    path.write_text(json.dumps([{"name": name, "id": name.lower(), "tags": ["spring"]} for name in names]))
+
+
+@pytest.fixture
+def json_path(tmp_path):
+    path = tmp_path / "recipes.json"
+    write_recipes(path, ["First"])
+    return path
+
+
+def names(repo):
+    return [recipe["name"] for recipe in repo.get_recipes_by_tag("spring")]
+
+
+class WhenWatchingDatasetTests:
+    def test_that_new_dataset_should_be_swapped_in_by_the_watcher_test(self, json_path):
+        repo = RecipeRepository(str(json_path), resident=True)
+        # A long interval leaves the polls to the test
+        watcher = repo.watch(interval=60)
+        try:
+            assert names(repo) == ["First"]
+            write_recipes(json_path, ["First", "Second"])
+
+            assert names(repo) == ["First"], "Queries should not reload the dataset themselves"
+            assert watcher.check() is True
+            assert names(repo) == ["First", "Second"]
+            assert watcher.check() is False
+            assert watcher.reloads == 1
+        finally:
+            watcher.stop()
+
+    def test_that_running_queries_should_keep_their_generation_test(self, json_path):
+        repo = RecipeRepository(str(json_path), resident=True)
+        watcher = repo.watch(interval=60)
+        try:
+            old = repo._current_snapshot()
+            write_recipes(json_path, ["Second"])
+            watcher.check()
+            new = repo._current_snapshot()
+
+            assert new is not old
+            assert [record["name"] for record in old.records] == ["First"]
+            assert old.tag_index == {"spring": [0]}
+            # Indexes are built before the swap, off the request path
+            assert all(name in vars(new) for name in ("tag_index", "id_positions", "text_index", "fuzzy_name_index"))
+        finally:
+            watcher.stop()
+
+    def test_that_background_thread_should_reload_test(self, json_path):
+        repo = RecipeRepository(str(json_path), resident=True)
+        with repo.watch(interval=0.01) as watcher:
+            write_recipes(json_path, ["Second", "Third"])
+            deadline = time.monotonic() + 5
+            while names(repo) != ["Second", "Third"] and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            assert names(repo) == ["Second", "Third"]
+            assert watcher.running
+        assert not watcher.running
+
+    def test_that_failed_reload_should_keep_the_old_generation_test(self, json_path, monkeypatch):
+        repo = RecipeRepository(str(json_path), resident=True)
+        watcher = repo.watch(interval=60)
+        try:
+            write_recipes(json_path, ["Second"])
+
+            def failing_load(fingerprint):
+                raise OSError("disk error")
+
+            monkeypatch.setattr(repo, '_load_snapshot', failing_load)
+            assert watcher.check() is False
+            assert isinstance(watcher.last_error, OSError)
+            assert names(repo) == ["First"]
+
+            monkeypatch.undo()
+            assert watcher.check() is True
+            assert watcher.last_error is None
+            assert names(repo) == ["Second"]
+        finally:
+            watcher.stop()
+
+    def test_that_stopped_watcher_should_leave_reloads_to_queries_test(self, json_path):
+        repo = RecipeRepository(str(json_path), resident=True)
+        repo.watch(interval=60).stop()
+
+        write_recipes(json_path, ["Second"])
+
+        assert names(repo) == ["Second"]
+
+    def test_that_invalid_watch_arguments_should_raise_test(self, json_path):
+        with pytest.raises(ValueError):
+            RecipeRepository(str(json_path)).watch()
+        with pytest.raises(ValueError):
+            RecipeRepository(str(json_path), resident=True).watch(interval=0)
+        with pytest.raises(ValueError):
+            DatasetWatcher(lambda: False, interval="1")